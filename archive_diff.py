@@ -0,0 +1,328 @@
+import argparse
+import heapq
+import importlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from panchang_columnar import parse_time
+from panchang_io import iter_records
+
+# ---------------- ARCHIVE DIFF ----------------
+# Differential check of an engine against the generated archive
+# (frontend/public/data/<year>.json), the reference output of
+# panchang_engine_swiss. Each field of each day is split into its text
+# with the clock times taken out, which must match exactly, and the
+# times, which must agree within the field's tolerance in minutes:
+#
+#   python archive_diff.py 1940 2126                      # full archive
+#   python archive_diff.py --sample 12 --tolerance Moonrise=2
+#   python archive_diff.py --engine test_panchang_drik --out diff.json
+#   python archive_diff.py --skip Karanam --skip Sankranti
+#
+# Whole years run through the engine's iter_year(year); --sample runs
+# generate_day(date) on that many seeded dates per year instead. Years
+# are spread over a process pool. The report has, per field, how many
+# values matched, differ in text, or differ in time (within tolerance
+# or beyond it), a histogram of the time differences, and the worst
+# offenders. Days are paired by date; a day only one side has counts as
+# a failure, as does anything out of tolerance, and the run then exits
+# non-zero.
+
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "public", "data")
+
+TIME_RE = re.compile(r"\d\d:\d\d [AP]M")
+NEXT_DAY = " (next day)"  # follows from the time, which is checked on its own
+
+TIME_TOLERANCE = 1  # minutes, for every field not given its own
+TOP = 20
+SEED = 1940
+
+
+def split_value(value):
+    """
+    "Navami upto 01:10 AM" -> ("Navami upto #", [70]); lists are joined
+    """
+    if value is None:
+        return None, []
+    text = " | ".join(map(str, value)) if isinstance(value, list) else str(value)
+    times = [parse_time(t) for t in TIME_RE.findall(text)]
+    return TIME_RE.sub("#", text).replace(NEXT_DAY, ""), times
+
+
+def day_key(text):
+    """
+    Sort key of a record's "dd/mm/YYYY" date; unparsable ones first
+    """
+    try:
+        return datetime.strptime(text, "%d/%m/%Y")
+    except (TypeError, ValueError):
+        return datetime.min
+
+
+def minute_diff(a, b):
+    """
+    b - a in minutes on the clock, -720..719
+    """
+    return (b - a + 720) % 1440 - 720
+
+
+def compare_value(golden, candidate):
+    """
+    None when the text apart from times differs, else the largest time
+    difference in minutes (0 with no times)
+    """
+    g_text, g_times = split_value(golden)
+    c_text, c_times = split_value(candidate)
+    if g_text != c_text or len(g_times) != len(c_times):
+        return None
+    return max((abs(minute_diff(a, b)) for a, b in zip(g_times, c_times)), default=0)
+
+
+class DiffReport:
+    """
+    Per-field mismatch counts and the worst offenders, mergeable across
+    workers
+    """
+
+    def __init__(self, tolerances=None, top=TOP, skip=()):
+        self.tolerances = tolerances or {}
+        self.top = top
+        self.skip = set(skip)
+        self.days = 0
+        self.fields = {}     # field -> counts
+        self.worst = []      # min-heap of (minutes, date, field, golden, candidate)
+        self.text = []       # first text mismatches, (date, field, golden, candidate)
+        self.missing = 0     # archive days the candidate didn't produce
+        self.extra = 0       # candidate days the archive doesn't have
+        self.unpaired = []   # first of those, (date, "missing" / "extra")
+
+    def tolerance(self, field):
+        return self.tolerances.get(field, TIME_TOLERANCE)
+
+    def _field(self, field):
+        if field not in self.fields:
+            self.fields[field] = {"compared": 0, "text": 0, "shifted": 0,
+                                  "over": 0, "max": 0, "histogram": {}}
+        return self.fields[field]
+
+    def add_day(self, golden, candidate):
+        self.days += 1
+        date = golden.get("date")
+        for field in list(golden) + [k for k in candidate if k not in golden]:
+            if field in self.skip:
+                continue
+            g, c = golden.get(field), candidate.get(field)
+            stats = self._field(field)
+            stats["compared"] += 1
+            diff = compare_value(g, c)
+            if diff is None:
+                stats["text"] += 1
+                if len(self.text) < self.top:
+                    self.text.append((date, field, g, c))
+                continue
+            if not diff:
+                continue
+            stats["shifted"] += 1
+            stats["histogram"][diff] = stats["histogram"].get(diff, 0) + 1
+            stats["max"] = max(stats["max"], diff)
+            if diff > self.tolerance(field):
+                stats["over"] += 1
+            self._offender((diff, date, field, g, c))
+
+    def add_unpaired(self, date, kind):
+        if kind == "missing":
+            self.missing += 1
+        else:
+            self.extra += 1
+        if len(self.unpaired) < self.top:
+            self.unpaired.append((date, kind))
+
+    def _offender(self, item):
+        if len(self.worst) < self.top:
+            heapq.heappush(self.worst, item)
+        elif item[0] > self.worst[0][0]:
+            heapq.heapreplace(self.worst, item)
+
+    def merge(self, other):
+        self.days += other.days
+        for field, theirs in other.fields.items():
+            ours = self._field(field)
+            for k in ("compared", "text", "shifted", "over"):
+                ours[k] += theirs[k]
+            ours["max"] = max(ours["max"], theirs["max"])
+            for diff, n in theirs["histogram"].items():
+                ours["histogram"][diff] = ours["histogram"].get(diff, 0) + n
+        for item in other.worst:
+            self._offender(item)
+        self.text = sorted(self.text + other.text, key=lambda t: day_key(t[0]))[:self.top]
+        self.missing += other.missing
+        self.extra += other.extra
+        self.unpaired = sorted(self.unpaired + other.unpaired,
+                               key=lambda u: day_key(u[0]))[:self.top]
+
+    def failures(self):
+        return self.missing + self.extra + sum(s["text"] + s["over"] for s in self.fields.values())
+
+    def to_dict(self):
+        return {
+            "days": self.days,
+            "missing": self.missing,
+            "extra": self.extra,
+            "tolerances": {f: self.tolerance(f) for f in self.fields},
+            "fields": {f: dict(s, histogram={str(k): v for k, v in sorted(s["histogram"].items())})
+                       for f, s in self.fields.items()},
+            "worst": [dict(zip(("minutes", "date", "field", "archive", "candidate"), w))
+                      for w in sorted(self.worst, reverse=True)],
+            "text_mismatches": [dict(zip(("date", "field", "archive", "candidate"), t))
+                                for t in self.text],
+            "unpaired": [dict(zip(("date", "kind"), u)) for u in self.unpaired],
+        }
+
+    def print(self):
+        print(f"📊 {self.days} days compared")
+        if self.missing or self.extra:
+            print(f"❌ {self.missing} archive day(s) not produced, "
+                  f"{self.extra} produced day(s) not in the archive")
+        print(f"   {'field':22s} {'text':>7s} {'shifted':>8s} {'over tol':>9s} {'max':>5s}")
+        for field, s in self.fields.items():
+            mark = "❌" if s["text"] or s["over"] else "✅"
+            print(f"{mark} {field:22s} {s['text']:7d} {s['shifted']:8d} "
+                  f"{s['over']:9d} {s['max']:5d}  (±{self.tolerance(field)})")
+        for diff, date, field, g, c in sorted(self.worst, reverse=True):
+            print(f"   ⏱️  {date} {field}: {g!r} vs {c!r} ({diff} min)")
+        for date, field, g, c in self.text:
+            print(f"   🔤 {date} {field}: {g!r} vs {c!r}")
+        for date, kind in self.unpaired:
+            print(f"   🕳️  {date}: {kind}")
+
+# ---------------- WORKERS ----------------
+
+_ENGINE = None
+
+
+def _init(engine_name):
+    global _ENGINE
+    _ENGINE = importlib.import_module(engine_name)
+    init = getattr(_ENGINE, "init_swisseph", None)
+    if init:
+        init()
+
+
+def sample_dates(year, n, seed=SEED):
+    """
+    The same n dates of a year on every run
+    """
+    rng = random.Random(seed * 10000 + year)
+    first = datetime(year, 1, 1)
+    days = (datetime(year + 1, 1, 1) - first).days
+    return sorted(first + timedelta(days=i) for i in rng.sample(range(days), min(n, days)))
+
+
+def diff_year(year, base, sample, tolerances, top, skip):
+    """
+    DiffReport of one year: every day through iter_year, or `sample`
+    seeded days through generate_day
+    """
+    report = DiffReport(tolerances, top, skip)
+    golden = iter_records(os.path.join(base, f"{year}.json"))
+    # both sides keyed by date, so a day missing on one side is reported
+    # instead of shifting every later pair
+    if sample:
+        dates = sample_dates(year, sample)
+        wanted = {d.strftime("%d/%m/%Y") for d in dates}
+        candidate = {}
+        for d in dates:
+            day = _ENGINE.generate_day(d)
+            candidate[day.get("date")] = day
+        golden = (r for r in golden if r.get("date") in wanted)
+    else:
+        candidate = {day.get("date"): day for day in _ENGINE.iter_year(year)}
+    for record in golden:
+        day = candidate.pop(record.get("date"), None)
+        if day is None:
+            report.add_unpaired(record.get("date"), "missing")
+        else:
+            report.add_day(record, day)
+    for date in sorted(candidate, key=day_key):
+        report.add_unpaired(date, "extra")
+    return year, report
+
+
+def archive_diff(years, engine_name="panchang_engine_swiss", base=BASE, sample=None,
+                 tolerances=None, top=TOP, skip=(), workers=None):
+    """
+    DiffReport of an engine module against the archive years given;
+    fields in `skip` aren't compared
+    """
+    report = DiffReport(tolerances, top, skip)
+    years = [y for y in years if os.path.exists(os.path.join(base, f"{y}.json"))]
+    workers = min(workers or os.cpu_count() or 1, max(len(years), 1))
+    args = [[base] * len(years), [sample] * len(years),
+            [tolerances] * len(years), [top] * len(years), [tuple(skip)] * len(years)]
+    if workers == 1:
+        _init(engine_name)
+        results = map(diff_year, years, *args)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                                   initargs=(engine_name,))
+        results = pool.map(diff_year, years, *args)
+    try:
+        for year, part in results:
+            report.merge(part)
+            status = "✅" if not part.failures() else f"⚠️  {part.failures()} out of tolerance"
+            print(f"{status} {year}: {part.days} days")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
+
+# ---------------- RUN ----------------
+
+def parse_tolerances(items):
+    """
+    ["Moonrise=2", "Sunrise=0"] -> {"Moonrise": 2, "Sunrise": 0}
+    """
+    out = {}
+    for item in items:
+        field, _, minutes = item.rpartition("=")
+        out[field] = int(minutes)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare an engine against the archive")
+    parser.add_argument("start_year", type=int, nargs="?", default=1940)
+    parser.add_argument("end_year", type=int, nargs="?", default=2126, help="exclusive")
+    parser.add_argument("--engine", default="panchang_engine_swiss",
+                        help="module with iter_year(year) and generate_day(date)")
+    parser.add_argument("--base", default=BASE)
+    parser.add_argument("--sample", type=int, default=None,
+                        help="days per year to compare (default: all)")
+    parser.add_argument("--tolerance", action="append", default=[],
+                        metavar="FIELD=MINUTES", help=f"default ±{TIME_TOLERANCE} min")
+    parser.add_argument("--skip", action="append", default=[], metavar="FIELD",
+                        help="field not to compare, e.g. one the archive predates")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=TOP)
+    parser.add_argument("--out", help="write the report as JSON")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    report = archive_diff(range(args.start_year, args.end_year), args.engine, args.base,
+                          args.sample, parse_tolerances(args.tolerance), args.top,
+                          args.skip, args.workers)
+    report.print()
+    print(f"🕒 {time.perf_counter() - t:.1f} s")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"💾 Report written to {args.out}")
+    if report.failures():
+        sys.exit(1)
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytz
+import swisseph as swe
+
+import panchang_engine_swiss as engine
+from ephemeris import cache_stats, clear_cache
+
+# ---------------- BENCHMARK SUITE ----------------
+# Times the engine hot paths on a fixed, seeded sample of dates and counts
+# the swisseph calls behind them. Results go to a JSON file; given a
+# previous results file, any timing or call count that grew by more than
+# the threshold is reported and the run exits non-zero.
+#
+#   python bench_panchang.py --out bench.json
+#   python bench_panchang.py --compare bench.json --threshold 0.15
+
+SEED = 1940
+SAMPLE_DAYS = 40
+REPEAT = 5
+YEAR = 2026
+TEN_YEARS = (2026, 2036)
+ARCHIVE_YEARS = 186
+
+# swisseph entry points whose calls are counted
+COUNTED = ("calc_ut", "get_ayanamsa_ut", "rise_trans")
+
+
+def sample_dates(n=SAMPLE_DAYS, seed=SEED):
+    """
+    Same dates on every run: spread over the 1940-2125 archive
+    """
+    rng = random.Random(seed)
+    start = datetime(1940, 1, 1)
+    span = (datetime(2126, 1, 1) - start).days
+    return [start + timedelta(days=rng.randrange(span)) for _ in range(n)]
+
+
+def fresh_state():
+    """
+    Cold ephemeris caches, as a new worker process would see them.
+    The lunation index and year metadata stay loaded: they are on disk.
+    """
+    clear_cache()
+
+
+@contextmanager
+def count_swe_calls():
+    """
+    Counts calls that reach swisseph (cache hits in ephemeris.py don't)
+    """
+    counts = dict.fromkeys(COUNTED, 0)
+    originals = {name: getattr(swe, name) for name in COUNTED}
+
+    def wrap(name, fn):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return fn(*args, **kwargs)
+        return counted
+
+    for name, fn in originals.items():
+        setattr(swe, name, wrap(name, fn))
+    try:
+        yield counts
+    finally:
+        for name, fn in originals.items():
+            setattr(swe, name, fn)
+
+
+def timed(fn, repeat=REPEAT):
+    """
+    Best and median wall time (seconds) of fn() over `repeat` cold runs
+    """
+    runs = []
+    for _ in range(repeat):
+        fresh_state()
+        t = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t)
+    return {"best": min(runs), "median": statistics.median(runs)}
+
+# ---------------- MICROBENCHMARKS ----------------
+
+def micro_benchmarks(dates):
+    """
+    Per-call times in microseconds, averaged over the sample dates
+    """
+    jds = [engine.sunrise_jd(d) for d in dates]
+    years = sorted({d.year for d in dates})[:8]
+
+    cases = {
+        "generate_day": lambda: [engine.generate_day(d) for d in dates],
+        "solve_transition": lambda: [
+            engine.solve_transition(jd, engine.tithi_index, engine.tithi_index(jd))
+            for jd in jds
+        ],
+        "sunrise_sunset": lambda: [engine.sunrise_sunset(d) for d in dates],
+        "moonrise_moonset": lambda: [engine.moonrise_moonset(d) for d in dates],
+        "get_lunar_month": lambda: [engine.get_lunar_month(jd) for jd in jds],
+        "calculate_ugadi": lambda: [engine.calculate_ugadi(y) for y in years],
+    }
+    calls = {name: len(years) if name == "calculate_ugadi" else len(dates)
+             for name in cases}
+
+    results = {}
+    for name, fn in cases.items():
+        t = timed(fn)
+        results[name] = {k: v / calls[name] * 1e6 for k, v in t.items()}
+        print(f"⏱️  {name:18s} {results[name]['best']:10.1f} µs/call")
+    return results
+
+# ---------------- END TO END ----------------
+
+def end_to_end():
+    results = {}
+
+    t = timed(lambda: engine.generate_year(YEAR), repeat=3)
+    results["one_year"] = t
+    print(f"📅 {YEAR}: {t['best']:.2f} s")
+
+    years = range(*TEN_YEARS)
+    t = timed(lambda: [engine.generate_year(y) for y in years], repeat=1)
+    results["ten_years"] = t
+    print(f"📆 {TEN_YEARS[0]}-{TEN_YEARS[1] - 1}: {t['best']:.2f} s")
+
+    # the full archive is sharded by year across cores
+    per_year = t["best"] / len(years)
+    cores = os.cpu_count() or 1
+    results["archive_estimate"] = {
+        "single_core": per_year * ARCHIVE_YEARS,
+        "all_cores": per_year * -(-ARCHIVE_YEARS // cores),
+        "cores": cores,
+    }
+    print(f"🧮 {ARCHIVE_YEARS} years ≈ {per_year * ARCHIVE_YEARS:.0f} s on one core, "
+          f"{results['archive_estimate']['all_cores']:.0f} s on {cores}")
+    return results
+
+
+def calls_per_day():
+    """
+    swisseph calls per generated day, for a cold single day and within
+    a whole-year run
+    """
+    d = datetime(YEAR, 6, 15)
+    fresh_state()
+    with count_swe_calls() as single:
+        engine.generate_day(d)
+
+    fresh_state()
+    with count_swe_calls() as year:
+        n = len(engine.generate_year(YEAR))
+
+    results = {
+        "single_day": dict(single),
+        "in_year": {k: v / n for k, v in year.items()},
+    }
+    for label, counts in results.items():
+        desc = ", ".join(f"{k} {v:.1f}" for k, v in counts.items())
+        print(f"🔢 {label:10s} {desc}")
+    return results
+
+# ---------------- COMPARE ----------------
+
+def flatten(results, prefix=""):
+    """
+    {"micro": {"x": {"best": 1}}} -> {"micro.x.best": 1}
+    """
+    out = {}
+    for k, v in results.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(flatten(v, key + "."))
+        elif isinstance(v, (int, float)):
+            out[key] = v
+    return out
+
+
+def regressions(current, baseline, threshold):
+    """
+    [(metric, baseline, current)] for every timing ("best") or call
+    count that grew by more than `threshold` (0.1 = 10%)
+    """
+    cur = flatten({k: current[k] for k in ("micro", "e2e", "calls")})
+    old = flatten({k: baseline.get(k, {}) for k in ("micro", "e2e", "calls")})
+
+    found = []
+    for key, value in cur.items():
+        if key not in old or not old[key]:
+            continue
+        if key.startswith(("micro.", "e2e.")) and not key.endswith(".best"):
+            continue  # medians are noisier; best-of-N is what we compare
+        if value > old[key] * (1 + threshold):
+            found.append((key, old[key], value))
+    return found
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+# ---------------- RUN ----------------
+
+def run(micro=True, e2e=True):
+    engine.init_swisseph()
+    engine.generate_day(datetime(YEAR, 1, 1))  # load index/metadata once
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(pytz.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "swisseph": swe.version,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "micro": micro_benchmarks(sample_dates()) if micro else {},
+        "e2e": end_to_end() if e2e else {},
+        "calls": calls_per_day(),
+    }
+    results["meta"]["cache"] = cache_stats()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Panchang engine benchmarks")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to check against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed growth before a metric counts as a regression")
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the one/ten-year runs")
+    args = parser.parse_args()
+
+    # read before the run: --compare may name the file --out overwrites
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run(e2e=not args.quick)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to {args.out}")
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.threshold)
+        for key, old, new in found:
+            print(f"❌ {key}: {old:.4g} → {new:.4g} (+{(new / old - 1) * 100:.0f}%)")
+        if found:
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.threshold:.0%} "
+              f"against {baseline['meta'].get('commit')}")
@@ -0,0 +1,184 @@
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+import swisseph as swe
+
+# ---------------- SWISSEPH STATE ----------------
+# swisseph keeps its settings in C globals and is not thread-safe. Raw
+# calls made here hold SWE_LOCK; code that needs one configuration to
+# hold across many calls (an engine computing a day) holds it for the
+# whole span through swe_settings(). Cache hits never take the lock.
+
+SWE_LOCK = threading.RLock()
+
+# (sid_mode, ephe_path) last applied through apply_settings
+_SETTINGS = None
+_FINGERPRINTS = {}
+
+
+def apply_settings(sid_mode, ephe_path):
+    """
+    Makes swisseph use this sidereal mode and ephemeris path. Cached
+    results are keyed by the settings, so switching back and forth
+    between configurations keeps both sets of cached positions valid.
+    """
+    global _SETTINGS
+    with SWE_LOCK:
+        if _SETTINGS != (sid_mode, ephe_path):
+            swe.set_ephe_path(ephe_path)
+            swe.set_sid_mode(sid_mode)
+            _SETTINGS = (sid_mode, ephe_path)
+
+
+@contextmanager
+def swe_settings(sid_mode, ephe_path):
+    """
+    Holds the swisseph lock with these settings applied
+    """
+    with SWE_LOCK:
+        apply_settings(sid_mode, ephe_path)
+        yield
+
+
+def current_settings():
+    return _SETTINGS
+
+# ---------------- CACHED EPHEMERIS ----------------
+# Every tithi/nakshatra/yoga helper ends up asking swisseph for the same
+# Sun/Moon positions at the same instants (sunrise, sunset, solver steps).
+# These wrappers memoize the raw calls so each instant is computed once.
+
+CACHE_SIZE = 1 << 16
+
+DEFAULT_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+
+
+def calc_ut(jd, body, flags=DEFAULT_FLAGS):
+    return _calc_ut(jd, body, flags, _SETTINGS)
+
+
+def get_ayanamsa_ut(jd):
+    return _ayanamsa_ut(jd, _SETTINGS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _calc_ut(jd, body, flags, settings):
+    with SWE_LOCK:
+        return swe.calc_ut(jd, body, flags)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _ayanamsa_ut(jd, settings):
+    with SWE_LOCK:
+        return swe.get_ayanamsa_ut(jd)
+
+
+def cache_stats():
+    """
+    Hit/miss counters for both caches, e.g. for benchmarking a run
+    """
+    stats = {}
+    for name, fn in (("calc_ut", _calc_ut), ("ayanamsa", _ayanamsa_ut)):
+        info = fn.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def clear_cache():
+    """
+    Drops every cached result. Settings changed with apply_settings
+    don't need it; settings changed on swisseph directly do.
+    """
+    _calc_ut.cache_clear()
+    _ayanamsa_ut.cache_clear()
+    _FINGERPRINTS.clear()
+
+# ---------------- SUN / MOON ----------------
+
+def sun_moon_lon(jd):
+    sun = calc_ut(jd, swe.SUN)[0][0]
+    moon = calc_ut(jd, swe.MOON)[0][0]
+    ay = get_ayanamsa_ut(jd)
+    return (sun - ay) % 360, (moon - ay) % 360
+
+
+def sun_moon_lon_speed(jd):
+    """
+    Sidereal Sun/Moon longitudes plus their speeds in degrees/day
+    """
+    sun = calc_ut(jd, swe.SUN)[0]
+    moon = calc_ut(jd, swe.MOON)[0]
+    ay = get_ayanamsa_ut(jd)
+    return (sun[0] - ay) % 360, (moon[0] - ay) % 360, sun[3], moon[3]
+
+
+def elongation(jd):
+    """
+    Moon − Sun angle (0 at Amavasya, 180 at Purnima) and its rate
+    """
+    s, m, ds, dm = sun_moon_lon_speed(jd)
+    return (m - s) % 360, dm - ds
+
+def sun_sidereal(jd):
+    """
+    Sidereal solar longitude and its rate (Sankranti at multiples of 30)
+    """
+    s, _, ds, _ = sun_moon_lon_speed(jd)
+    return s, ds
+
+# ---------------- ROOT FINDING ----------------
+
+SOLVER_TOL = 1 / 86400  # one second, in days
+
+
+def solve_angle(angle_fn, target, jd0, tol=SOLVER_TOL):
+    """
+    First JD after jd0 at which an increasing angle reaches `target`.
+    angle_fn(jd) -> (angle in degrees, rate in degrees/day); Newton
+    steps on the wrapped difference converge in 3-4 calls.
+    """
+    ang, rate = angle_fn(jd0)
+    return polish_angle(angle_fn, target, jd0 + ((target - ang) % 360) / rate, tol)
+
+
+def polish_angle(angle_fn, target, jd, tol=SOLVER_TOL):
+    """
+    Newton steps from a guess already close to the root (within a few
+    degrees of angle); an accurate guess converges in a single call
+    """
+    for _ in range(10):
+        ang, rate = angle_fn(jd)
+        step = ((target - ang + 180) % 360 - 180) / rate
+        jd += step
+        if abs(step) < tol:
+            break
+    return jd
+
+
+def settings_fingerprint():
+    """
+    Identifies the swisseph settings in effect: the ayanamsa at J2000
+    changes with the sidereal mode, and the returned flag says which
+    ephemeris (Swiss files or Moshier fallback) actually answered.
+    Memoized per applied settings.
+    """
+    fp = _FINGERPRINTS.get(_SETTINGS)
+    if fp is not None:
+        return fp
+    with SWE_LOCK:
+        key = _SETTINGS
+        if key is None or key not in _FINGERPRINTS:
+            pos, retflag = swe.calc_ut(2451545.0, swe.MOON, DEFAULT_FLAGS)
+            ay = swe.get_ayanamsa_ut(2451545.0)
+            fp = (f"{swe.version}|{ay:.9f}|"
+                  f"{retflag & (swe.FLG_SWIEPH | swe.FLG_MOSEPH | swe.FLG_JPLEPH)}")
+            if key is None:
+                return fp
+            _FINGERPRINTS[key] = fp
+        return _FINGERPRINTS[key]
@@ -0,0 +1,214 @@
+import numpy as np
+from numpy.polynomial import chebyshev as cheb
+import swisseph as swe
+
+from ephemeris import calc_ut, get_ayanamsa_ut
+
+# ---------------- CHEBYSHEV TABLE ----------------
+# Bulk alternative to calling sun_moon_lon once per instant: the range is
+# cut into fixed segments, each body's (unwrapped, tropical) longitude is
+# fitted with a Chebyshev series on swisseph samples, and whole arrays of
+# JDs are then evaluated with a handful of NumPy operations.
+
+# body -> (segment length in days, series degree)
+SEGMENTS = {
+    swe.SUN: (16.0, 8),
+    swe.MOON: (4.0, 14),
+}
+AYANAMSA_DEGREE = 3
+
+MAX_ERROR_ARCSEC = 0.5
+
+
+def _nodes(deg):
+    # Chebyshev points of the first kind on [-1, 1]
+    k = np.arange(deg + 1)
+    return np.cos(np.pi * (k + 0.5) / (deg + 1))
+
+
+def _clenshaw(coefs, x):
+    """
+    Evaluates one series per point: coefs[i] is the series for x[i]
+    """
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    for j in range(coefs.shape[1] - 1, 0, -1):
+        b1, b2 = 2 * x * b1 - b2 + coefs[:, j], b1
+    return x * b1 - b2 + coefs[:, 0]
+
+
+class ChebyshevSeries:
+    """
+    Piecewise Chebyshev fit of fn over [jd_start, jd_end]
+    """
+
+    def __init__(self, fn, jd_start, jd_end, seg_days, deg, unwrap):
+        self.jd_start = jd_start
+        self.seg_days = seg_days
+        n_seg = int(np.ceil((jd_end - jd_start) / seg_days)) or 1
+        x = _nodes(deg)
+
+        self.coefs = np.empty((n_seg, deg + 1))
+        for i in range(n_seg):
+            a = jd_start + i * seg_days
+            jds = a + (x + 1) * seg_days / 2
+            y = np.array([fn(jd) for jd in jds])
+            if unwrap:
+                y = np.unwrap(y, period=360)
+            self.coefs[i] = cheb.chebfit(x, y, deg)
+
+        # d/dx → d/djd: x spans 2 units per segment
+        self.dcoefs = np.array([cheb.chebder(c) for c in self.coefs]) * (2 / seg_days)
+        self.n_seg = n_seg
+
+    def _locate(self, jds):
+        if jds.size == 0:
+            return np.empty(0, dtype=np.int64), jds
+        t = (jds - self.jd_start) / self.seg_days
+        seg = np.floor(t).astype(np.int64)
+        if t.min() < 0 or t.max() > self.n_seg:
+            raise ValueError("JD outside the range covered by this table")
+        seg = np.minimum(seg, self.n_seg - 1)
+        return seg, 2 * (t - seg) - 1
+
+    def value(self, jds):
+        seg, x = self._locate(jds)
+        return _clenshaw(self.coefs[seg], x)
+
+    def value_and_speed(self, jds):
+        seg, x = self._locate(jds)
+        return _clenshaw(self.coefs[seg], x), _clenshaw(self.dcoefs[seg], x)
+
+
+class ChebyshevTable:
+    """
+    Sun/Moon longitudes and ayanamsa for [jd_start, jd_end].
+
+    The fit is checked against calc_ut at off-node points in every
+    segment; max_error holds the worst deviation per body in arcseconds
+    and construction fails if it exceeds max_error_arcsec.
+    """
+
+    def __init__(self, jd_start, jd_end, max_error_arcsec=MAX_ERROR_ARCSEC):
+        self.jd_start = jd_start
+        self.jd_end = jd_end
+
+        self.series = {}
+        for body, (seg_days, deg) in SEGMENTS.items():
+            self.series[body] = ChebyshevSeries(
+                lambda jd, b=body: calc_ut(jd, b)[0][0],
+                jd_start, jd_end, seg_days, deg, unwrap=True,
+            )
+        sun_days, _ = SEGMENTS[swe.SUN]
+        self.ayanamsa = ChebyshevSeries(
+            get_ayanamsa_ut, jd_start, jd_end, sun_days, AYANAMSA_DEGREE,
+            unwrap=False,
+        )
+
+        self.max_error = self._check()
+        worst = max(self.max_error.values())
+        if worst > max_error_arcsec:
+            raise ValueError(
+                f"Chebyshev fit error {worst:.3f}\" exceeds {max_error_arcsec}\""
+            )
+
+    def _check(self):
+        errors = {}
+        for body, s in self.series.items():
+            # 1/3 and 2/3 of each segment fall between the fit nodes
+            jds = np.concatenate([
+                self.jd_start + (np.arange(s.n_seg) + f) * s.seg_days
+                for f in (1 / 3, 2 / 3)
+            ])
+            jds = jds[jds <= self.jd_end]
+            exact = np.array([calc_ut(jd, body)[0][0] for jd in jds])
+            diff = (s.value(jds) - exact + 180) % 360 - 180
+            errors[body] = float(np.abs(diff).max() * 3600)
+
+        jds = self.jd_start + (np.arange(self.ayanamsa.n_seg) + 0.5) * self.ayanamsa.seg_days
+        jds = jds[jds <= self.jd_end]
+        exact = np.array([get_ayanamsa_ut(jd) for jd in jds])
+        errors["ayanamsa"] = float(np.abs(self.ayanamsa.value(jds) - exact).max() * 3600)
+        return errors
+
+    def sun_moon(self, jds):
+        """
+        Sidereal longitudes (deg), ayanamsa and speeds (deg/day) for an
+        array of JDs, as a dict of equally shaped arrays
+        """
+        jds = np.asarray(jds, dtype=float)
+        sun, sun_speed = self.series[swe.SUN].value_and_speed(jds)
+        moon, moon_speed = self.series[swe.MOON].value_and_speed(jds)
+        ay, ay_speed = self.ayanamsa.value_and_speed(jds)
+        return {
+            "sun": (sun - ay) % 360,
+            "moon": (moon - ay) % 360,
+            "ayanamsa": ay,
+            "sun_speed": sun_speed - ay_speed,
+            "moon_speed": moon_speed - ay_speed,
+        }
+
+# ---------------- ARRAY PANCHANG ----------------
+# Each takes the dict returned by ChebyshevTable.sun_moon, so the series
+# are evaluated once however many indices are derived from them.
+
+def tithi_index_array(pos):
+    return (((pos["moon"] - pos["sun"]) % 360) // 12).astype(np.int64)
+
+
+def nakshatra_index_array(pos):
+    return (pos["moon"] // (360 / 27)).astype(np.int64)
+
+
+def yoga_index_array(pos):
+    return (((pos["sun"] + pos["moon"]) % 360) // (360 / 27)).astype(np.int64)
+
+
+def karana_index_array(pos):
+    return (((pos["moon"] - pos["sun"]) % 360) // 6).astype(np.int64)
+
+
+def panchang_index_arrays(table, jds):
+    """
+    {"tithi", "nakshatra", "yoga", "karana"} -> index array for jds
+    """
+    pos = table.sun_moon(jds)
+    return {
+        "tithi": tithi_index_array(pos),
+        "nakshatra": nakshatra_index_array(pos),
+        "yoga": yoga_index_array(pos),
+        "karana": karana_index_array(pos),
+    }
+
+
+# kind -> (angle from sun_moon output, its rate, degrees per segment)
+KIND_ANGLES = {
+    "tithi": (lambda p: p["moon"] - p["sun"], lambda p: p["moon_speed"] - p["sun_speed"], 12),
+    "nakshatra": (lambda p: p["moon"], lambda p: p["moon_speed"], 360 / 27),
+    "yoga": (lambda p: p["sun"] + p["moon"], lambda p: p["sun_speed"] + p["moon_speed"], 360 / 27),
+    "karana": (lambda p: p["moon"] - p["sun"], lambda p: p["moon_speed"] - p["sun_speed"], 6),
+}
+
+
+def transition_seeds(table, jd_start, step):
+    """
+    kind -> [(approximate JD, index that starts there)] for every
+    boundary in [jd_start, table.jd_end). Boundaries are bracketed on a
+    grid of `step` days, then polished by Newton steps on the series
+    themselves, so they land well within a second of the exact roots.
+    """
+    jds = np.arange(jd_start, table.jd_end, step)
+    arrays = panchang_index_arrays(table, jds)
+
+    seeds = {}
+    for kind, idx in arrays.items():
+        angle, rate, span = KIND_ANGLES[kind]
+        k = np.nonzero(idx[1:] != idx[:-1])[0]
+        new_idx = idx[k + 1]
+        target = new_idx * span
+        est = jds[k]
+        for _ in range(4):
+            p = table.sun_moon(est)
+            est = est + ((target - angle(p) + 180) % 360 - 180) / rate(p)
+        seeds[kind] = list(zip(est.tolist(), new_idx.tolist()))
+    return seeds
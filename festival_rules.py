@@ -0,0 +1,468 @@
+import re
+
+from panchang_columnar import parse_time
+from sankranti import RASHI_NAMES
+
+# ---------------- FESTIVAL RULES ----------------
+# One declarative table shared by both engines and the festival pass.
+# Months are Amanta (Chaitra starts after the Amavasya with the Sun in
+# Meena), so the Krishna paksha of a month precedes the next month's
+# name: Diwali is Ashwin Amavasya, Holi is Phalguna Krishna Pratipada.
+#
+# Rule fields (all but "names" optional):
+#   names      festival names added, in order
+#   month      Amanta month; None = every month, Adhika months included
+#   paksha     "Shukla" / "Krishna"; None = both
+#   tithi      tithi name; "Purnima"/"Amavasya" imply the paksha
+#   nakshatra  nakshatra at sunrise
+#   weekday    "Monday" ... "Sunday"
+#   sankranti  rashi entered, for solar festivals (punya kala day)
+#   kala       when the tithi must prevail: "sunrise" (default, udaya
+#              tithi), "madhyahna", "aparahna", "pradosha" or "nishita"
+#   weekday_prefix  prefix the name with the weekday's deity (Pradosh)
+#
+# Month-specific rules never fire in an Adhika month.
+
+RULES = [
+    # MONTHLY RECURRING
+    {"names": ["Amavasya"], "tithi": "Amavasya"},
+    {"names": ["Purnima"], "tithi": "Purnima"},
+    {"names": ["Ekadashi"], "tithi": "Ekadashi"},
+    {"names": ["Sankashti Chaturthi"], "paksha": "Krishna", "tithi": "Chaturthi"},
+    {"names": ["Masik Shivaratri"], "paksha": "Krishna", "tithi": "Chaturdashi",
+     "kala": "nishita"},
+    {"names": ["Pradosh Vrat"], "tithi": "Trayodashi", "kala": "pradosha",
+     "weekday_prefix": True},
+    {"names": ["Chandra Darshana"], "paksha": "Shukla", "tithi": "Pratipada"},
+
+    # SOLAR
+    {"names": ["Makar Sankranti", "Pongal"], "sankranti": "Makara"},
+    {"names": ["Baisakhi", "Vaisakhi"], "sankranti": "Mesha"},
+
+    # CHAITRA
+    {"names": ["Ugadi", "Gudi Padwa", "Chaitra Navratri Begins"],
+     "month": "Chaitra", "paksha": "Shukla", "tithi": "Pratipada"},
+    {"names": ["Rama Navami"], "month": "Chaitra", "paksha": "Shukla",
+     "tithi": "Navami", "kala": "madhyahna"},
+    {"names": ["Hanuman Jayanti"], "month": "Chaitra", "tithi": "Purnima"},
+
+    # VAISHAKHA
+    {"names": ["Akshaya Tritiya"], "month": "Vaishakha", "paksha": "Shukla",
+     "tithi": "Tritiya"},
+    {"names": ["Buddha Purnima"], "month": "Vaishakha", "tithi": "Purnima"},
+
+    # JYESHTHA
+    {"names": ["Nirjala Ekadashi"], "month": "Jyeshtha", "paksha": "Shukla",
+     "tithi": "Ekadashi"},
+
+    # ASHADHA
+    {"names": ["Ratha Yatra"], "month": "Ashadha", "paksha": "Shukla", "tithi": "Dvitiya"},
+    {"names": ["Devshayani Ekadashi"], "month": "Ashadha", "paksha": "Shukla",
+     "tithi": "Ekadashi"},
+    {"names": ["Guru Purnima"], "month": "Ashadha", "tithi": "Purnima"},
+
+    # SHRAVANA
+    {"names": ["Hariyali Teej"], "month": "Shravana", "paksha": "Shukla", "tithi": "Tritiya"},
+    {"names": ["Nag Panchami"], "month": "Shravana", "paksha": "Shukla", "tithi": "Panchami"},
+    {"names": ["Raksha Bandhan", "Shravana Purnima"], "month": "Shravana",
+     "tithi": "Purnima"},
+    {"names": ["Janmashtami", "Krishna Jayanti"], "month": "Shravana",
+     "paksha": "Krishna", "tithi": "Ashtami", "kala": "nishita"},
+
+    # BHADRAPADA
+    {"names": ["Ganesh Chaturthi", "Vinayaka Chaturthi"], "month": "Bhadrapada",
+     "paksha": "Shukla", "tithi": "Chaturthi", "kala": "madhyahna"},
+    {"names": ["Anant Chaturdashi", "Ganesh Visarjan"], "month": "Bhadrapada",
+     "paksha": "Shukla", "tithi": "Chaturdashi"},
+    {"names": ["Pitru Paksha Begins"], "month": "Bhadrapada", "paksha": "Krishna",
+     "tithi": "Pratipada"},
+    {"names": ["Mahalaya Amavasya"], "month": "Bhadrapada", "tithi": "Amavasya"},
+
+    # ASHWIN
+    {"names": ["Sharad Navratri Begins"], "month": "Ashwin", "paksha": "Shukla",
+     "tithi": "Pratipada"},
+    {"names": ["Maha Saptami"], "month": "Ashwin", "paksha": "Shukla", "tithi": "Saptami"},
+    {"names": ["Durga Ashtami", "Maha Ashtami"], "month": "Ashwin", "paksha": "Shukla",
+     "tithi": "Ashtami"},
+    {"names": ["Maha Navami"], "month": "Ashwin", "paksha": "Shukla", "tithi": "Navami"},
+    {"names": ["Vijayadashami", "Dussehra"], "month": "Ashwin", "paksha": "Shukla",
+     "tithi": "Dashami", "kala": "aparahna"},
+    {"names": ["Sharad Purnima"], "month": "Ashwin", "tithi": "Purnima"},
+    {"names": ["Karwa Chauth"], "month": "Ashwin", "paksha": "Krishna", "tithi": "Chaturthi"},
+    {"names": ["Dhanteras"], "month": "Ashwin", "paksha": "Krishna", "tithi": "Trayodashi",
+     "kala": "pradosha"},
+    {"names": ["Naraka Chaturdashi", "Choti Diwali"], "month": "Ashwin",
+     "paksha": "Krishna", "tithi": "Chaturdashi"},
+    {"names": ["Diwali", "Lakshmi Puja"], "month": "Ashwin", "tithi": "Amavasya",
+     "kala": "pradosha"},
+
+    # KARTIKA
+    {"names": ["Govardhan Puja"], "month": "Kartika", "paksha": "Shukla",
+     "tithi": "Pratipada"},
+    {"names": ["Bhai Dooj", "Yama Dwitiya"], "month": "Kartika", "paksha": "Shukla",
+     "tithi": "Dvitiya"},
+    {"names": ["Chhath Puja"], "month": "Kartika", "paksha": "Shukla", "tithi": "Shashthi"},
+    {"names": ["Devutthana Ekadashi"], "month": "Kartika", "paksha": "Shukla",
+     "tithi": "Ekadashi"},
+    {"names": ["Kartik Purnima", "Dev Deepawali"], "month": "Kartika", "tithi": "Purnima"},
+
+    # MARGASHIRSHA
+    {"names": ["Gita Jayanti"], "month": "Margashirsha", "paksha": "Shukla",
+     "tithi": "Ekadashi"},
+
+    # MAGHA
+    {"names": ["Vasant Panchami", "Saraswati Puja"], "month": "Magha", "paksha": "Shukla",
+     "tithi": "Panchami"},
+    {"names": ["Ratha Saptami"], "month": "Magha", "paksha": "Shukla", "tithi": "Saptami"},
+    {"names": ["Magha Purnima"], "month": "Magha", "tithi": "Purnima"},
+    {"names": ["Maha Shivaratri"], "month": "Magha", "paksha": "Krishna",
+     "tithi": "Chaturdashi", "kala": "nishita"},
+
+    # PHALGUNA
+    {"names": ["Holika Dahan", "Chhoti Holi"], "month": "Phalguna", "tithi": "Purnima",
+     "kala": "pradosha"},
+    {"names": ["Phalguna Purnima"], "month": "Phalguna", "tithi": "Purnima"},
+    {"names": ["Holi", "Dhulandi", "Rangwali Holi"], "month": "Phalguna",
+     "paksha": "Krishna", "tithi": "Pratipada"},
+]
+
+# ---------------- NAMES ----------------
+
+MONTHS = [
+    "Chaitra", "Vaishakha", "Jyeshtha", "Ashadha", "Shravana", "Bhadrapada",
+    "Ashwin", "Kartika", "Margashirsha", "Pausha", "Magha", "Phalguna"
+]
+MONTH_ALIASES = {"Kartik": "Kartika"}
+
+# paksha-less tithi names, index 0-13; 14 = Purnima / Amavasya
+TITHIS = [
+    "Pratipada", "Dvitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi",
+    "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi",
+    "Trayodashi", "Chaturdashi"
+]
+TITHI_ALIASES = {"Padyami": "Pratipada"}
+
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
+    "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta",
+    "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+]
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAY_DEITIES = ["Soma", "Bhauma", "Budha", "Guru", "Shukra", "Shani", "Ravi"]
+
+KALAS = ("sunrise", "madhyahna", "aparahna", "pradosha", "nishita")
+
+# month key for Adhika (or unknown) months: only every-month rules apply
+NO_MONTH = -1
+
+
+def month_index(name):
+    """
+    "Chaitra" -> (0, False); "Adhika Jyeshtha" -> (2, True);
+    unknown / empty -> (NO_MONTH, False)
+    """
+    adhika = name.startswith("Adhika ")
+    name = MONTH_ALIASES.get(name[7:] if adhika else name, name[7:] if adhika else name)
+    if name not in MONTHS:
+        return NO_MONTH, False
+    return MONTHS.index(name), adhika
+
+
+def tithi_index(name, paksha):
+    """
+    ("Navami", "Krishna") -> 23. Purnima/Amavasya ignore the paksha.
+    """
+    name = TITHI_ALIASES.get(name, name)
+    if name == "Purnima":
+        return 14
+    if name == "Amavasya":
+        return 29
+    return TITHIS.index(name) + (15 if paksha.startswith("Krishna") else 0)
+
+
+def kala_window(kala, sunrise, sunset, next_sunrise):
+    """
+    (start, end) of a kala, in whatever unit the instants are given in
+    (JD or minutes). Madhyahna is the middle fifth of the day, aparahna
+    the fourth, pradosha the first fifth of the night (6 ghatis of 30) and nishita the
+    eighth of fifteen night muhurtas.
+    """
+    day = sunset - sunrise
+    night = next_sunrise - sunset
+    if kala == "madhyahna":
+        return sunrise + day * 2 / 5, sunrise + day * 3 / 5
+    if kala == "aparahna":
+        return sunrise + day * 3 / 5, sunrise + day * 4 / 5
+    if kala == "pradosha":
+        return sunset, sunset + night / 5
+    if kala == "nishita":
+        mid = sunset + night / 2
+        return mid - night / 30, mid + night / 30
+    return sunrise, sunrise
+
+
+def overlap(a0, a1, b0, b1):
+    return max(0, min(a1, b1) - max(a0, b0))
+
+# ---------------- OBSERVANCE DAY ----------------
+# A tithi (19-27 hours) touches two or three civil days, sunrise to
+# sunrise. Which one observes a festival on it, given the tithi's exact
+# [start, end) span and each day's (sunrise, sunset, next sunrise):
+#
+#   sunrise kala   the day whose sunrise falls in the span; a vriddhi
+#                  tithi (two sunrises) takes the first, a kshaya tithi
+#                  (no sunrise) the day it begins and ends in
+#   other kalas    the day whose kala window the tithi covers most, as a
+#                  fraction of the window; covered fully on both days, the
+#                  first (purva-viddha); covered on neither, as for sunrise
+#
+# Pure interval arithmetic: no ephemeris calls once the spans are known.
+
+def observance_day(kala, start, end, frames):
+    """
+    Index into frames of the day observing a tithi spanning [start, end)
+    """
+    touched = [k for k, f in enumerate(frames) if start < f[2] and end > f[0]]
+    if not touched:
+        return None
+
+    if kala != "sunrise":
+        cover = {}
+        for k in touched:
+            w0, w1 = kala_window(kala, *frames[k])
+            cover[k] = overlap(w0, w1, start, end) / (w1 - w0)
+        best = max(cover.values())
+        if best > 0:
+            return next(k for k in touched if cover[k] == best)
+
+    for k in touched:
+        if start <= frames[k][0] < end:
+            return k
+    return touched[0]  # kshaya
+
+
+def spans_from_sunrises(rows):
+    """
+    Tithi spans [(tithi, start, end, month)] from per-day sunrise facts
+    [(sunrise, tithi at sunrise, its end, month key)] of consecutive
+    days, all on one time axis. The first tithi's start is unknown and
+    taken as its first sunrise. A kshaya tithi, which no sunrise records,
+    gets half the time between the two recorded ends: only its bounds
+    are approximate.
+    """
+    spans = []
+    for sunrise, ti, end, month in rows:
+        if spans and spans[-1][0] == ti:
+            continue  # vriddhi: the same tithi at two sunrises
+        start = spans[-1][2] if spans else sunrise
+        if spans and (spans[-1][0] + 1) % 30 != ti:
+            skipped = (spans[-1][0] + 1) % 30
+            mid = (start + end) / 2
+            # a skipped Amavasya still closes the previous month
+            spans.append((skipped, start, mid, spans[-1][3] if skipped == 29 else month))
+            start = mid
+        spans.append((ti, start, end, month))
+    return spans
+
+# ---------------- COMPILED INDEX ----------------
+
+class FestivalIndex:
+    """
+    Rules compiled into {(month key, tithi index): [rules]} plus
+    {rashi: [rules]} for Sankrantis. A day costs one dict lookup per
+    tithi it touches and only the kala checks of the rules found there.
+    """
+
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self.lunar = {}
+        self.solar = {}
+        for pos, rule in enumerate(rules):
+            compiled = dict(rule, pos=pos, kala=rule.get("kala", "sunrise"))
+            if compiled["kala"] not in KALAS:
+                raise ValueError(f"{rule['names'][0]}: unknown kala {compiled['kala']!r}")
+            if "nakshatra" in rule:
+                compiled["nakshatra_idx"] = NAKSHATRAS.index(rule["nakshatra"])
+            if "weekday" in rule:
+                compiled["weekday_idx"] = WEEKDAYS.index(rule["weekday"])
+
+            if "sankranti" in rule:
+                self.solar.setdefault(RASHI_NAMES.index(rule["sankranti"]), []).append(compiled)
+                continue
+
+            if rule.get("month"):
+                months = [MONTHS.index(MONTH_ALIASES.get(rule["month"], rule["month"]))]
+            else:
+                months = [NO_MONTH] + list(range(12))
+            pakshas = [rule["paksha"]] if rule.get("paksha") else ["Shukla", "Krishna"]
+            tithis = sorted({tithi_index(rule["tithi"], p) for p in pakshas})
+            for m in months:
+                for t in tithis:
+                    self.lunar.setdefault((m, t), []).append(compiled)
+
+    def match(self, day):
+        """
+        Festival names for one day. `day` holds:
+          frames    (sunrise, sunset, next sunrise) of the previous day,
+                    this day and the next, all on one time axis
+          spans     [(tithi, start, end, month key)] covering at least
+                    this day's sunrise to the next day's
+          weekday (0 = Monday), nakshatra (sunrise index or None),
+          sankrantis (rashis whose punya kala falls on this day)
+        """
+        frames = day["frames"]
+        sunrise, _, next_sunrise = frames[1]
+
+        found = []
+        for ti, start, end, month in day["spans"]:
+            if not (start < next_sunrise and end > sunrise):
+                continue
+            for rule in self.lunar.get((month, ti), ()):
+                if observance_day(rule["kala"], start, end, frames) == 1:
+                    found.append(rule)
+
+        for rashi in day.get("sankrantis", ()):
+            found += self.solar.get(rashi, ())
+
+        names = []
+        for rule in sorted(found, key=lambda r: r["pos"]):
+            if "nakshatra_idx" in rule and rule["nakshatra_idx"] != day.get("nakshatra"):
+                continue
+            if "weekday_idx" in rule and rule["weekday_idx"] != day["weekday"]:
+                continue
+            for name in rule["names"]:
+                if rule.get("weekday_prefix"):
+                    name = f"{WEEKDAY_DEITIES[day['weekday']]} {name}"
+                if name not in names:
+                    names.append(name)
+        return names
+
+
+FESTIVALS = FestivalIndex()
+
+# ---------------- DAY RECORDS ----------------
+# For callers that only have generated day dicts (the festival pass):
+# the facts match() needs, recovered from the formatted strings. Times
+# are clock minutes from the day's local midnight, neighbours offset by
+# whole days.
+
+UPTO_RE = re.compile(r"^(.*) upto (\d\d:\d\d [AP]M)( \(next day\))?$")
+
+
+def _upto(text, sunrise):
+    """
+    "Navami upto 01:10 AM" -> ("Navami", minutes from this midnight)
+    """
+    m = UPTO_RE.match(text or "")
+    if not m:
+        return None, None
+    t = parse_time(m.group(2))
+    if m.group(3) or t < sunrise:
+        t += 1440
+    return m.group(1), t
+
+
+def _sunrise_facts(day):
+    """
+    (sunrise, sunset, tithi, tithi end, month key) of one record, or None
+    """
+    if not isinstance(day, dict):  # a typed day: exact values, no parsing
+        m = day.minutes
+        return m(day.sunrise), m(day.sunset), day.tithi, m(day.tithi_end), \
+            NO_MONTH if day.adhika else day.month
+    try:
+        sunrise = parse_time(day["Sunrise"])
+        sunset = parse_time(day["Sunset"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    name, end = _upto(day.get("Tithi"), sunrise)
+    if name is None:
+        return None
+    month, adhika = month_index(day.get("Lunar Month") or day.get("LunarMonth") or "")
+    return sunrise, sunset, tithi_index(name, day.get("Paksha", "")), end, \
+        NO_MONTH if adhika else month
+
+
+def record_facts(days, i):
+    """
+    match() input for days[i] of a list of consecutive day dicts (or
+    engine DayPanchang objects, read without formatting). The records
+    either side supply the neighbouring frames, the tithi spans
+    and the rashi of a Sankranti observed a day off its ingress; past
+    the ends of the list, this day's sunrise and sunset stand in.
+    None if the record lacks what the rules need.
+    """
+    day = days[i]
+    here = _sunrise_facts(day)
+    if here is None:
+        return None
+
+    rows = {}
+    for k in range(-2, 3):
+        f = _sunrise_facts(days[i + k]) if 0 <= i + k < len(days) else None
+        if f is not None:
+            sunrise, sunset, ti, end, month = f
+            rows[k] = (sunrise + k * 1440, sunset + k * 1440, ti, end + k * 1440, month)
+
+    def frame_edges(k):
+        if k in rows:
+            return rows[k][:2]
+        return here[0] + k * 1440, here[1] + k * 1440  # past the list's ends
+
+    frames = [frame_edges(k) + (frame_edges(k + 1)[0],) for k in (-1, 0, 1)]
+    spans = spans_from_sunrises([(r[0],) + r[2:] for _, r in sorted(rows.items())])
+
+    if not isinstance(day, dict):
+        return {
+            "frames": frames,
+            "spans": spans,
+            "weekday": day.weekday,
+            "nakshatra": day.nakshatra,
+            "sankrantis": [rashi for rashi, _, _, _ in day.punya],
+        }
+
+    nak, _ = _upto(day.get("Nakshatra"), here[0])
+
+    # the punya kala day takes the rashi of the nearest ingress; records
+    # without punya kala fields mark the ingress day itself
+    prev = days[i - 1] if i else None
+    nxt = days[i + 1] if i + 1 < len(days) else None
+    sankrantis = []
+    if "Sankranti Punya Kala" not in day:
+        sources = (day,)
+    else:
+        sources = (day, nxt, prev) if day["Sankranti Punya Kala"] else ()
+    for rec in sources:
+        text = rec and rec.get("Sankranti")
+        if text:
+            sankrantis.append(RASHI_NAMES.index(text.split(" Sankranti")[0]))
+            break
+
+    return {
+        "frames": frames,
+        "spans": spans,
+        "weekday": WEEKDAYS.index(day["Weekday"]) if day.get("Weekday") in WEEKDAYS else None,
+        "nakshatra": NAKSHATRAS.index(nak) if nak in NAKSHATRAS else None,
+        "sankrantis": sankrantis,
+    }
+
+
+def iter_facts(days):
+    """
+    Yields (day, record_facts) for a stream of consecutive day dicts,
+    holding only the two records either side of the current one
+    """
+    window, i = [], 0
+    for day in days:
+        window.append(day)
+        if len(window) - i > 2:
+            yield window[i], record_facts(window, i)
+            if i < 2:
+                i += 1
+            else:
+                window.pop(0)
+    for i in range(i, len(window)):
+        yield window[i], record_facts(window, i)
@@ -0,0 +1,196 @@
+import time
+from datetime import datetime, timedelta
+
+from ephemeris import solve_angle, sun_sidereal
+from festival_rules import (
+    FESTIVALS, MONTH_ALIASES, MONTHS, WEEKDAY_DEITIES, observance_day, tithi_index,
+)
+from lunation_index import SYNODIC_MONTH, get_index
+import panchang_engine_swiss as engine
+from sankranti import RASHI_NAMES, local_date, punya_kala
+
+# ---------------- FESTIVAL SOLVER ----------------
+# A festival's dates straight from its rule, without generating the
+# days of the year:
+#
+#   festival_dates("Diwali", 1940, 2125)   # -> [date, ...]
+#
+# Lunar rules take each Amavasya of the year from the lunation index,
+# keep the lunations of the rule's month (Adhika months never qualify),
+# solve the tithi's exact [start, end) from the new moon and apply the
+# kala rule to the two or three civil days it touches; solar rules
+# solve the ingress into their rashi and take its punya kala day. A
+# festival-year costs a couple of transition solves and a handful of
+# sunrise/sunset searches instead of a year of days.
+#
+# The chosen day is the one FESTIVALS.match() picks when scanning
+# generated days, with each day judged against its neighbours only.
+# Spans are exact here, where the scan approximates a kshaya tithi's by
+# halves, so a festival on a skipped tithi can land a day apart: the
+# solver's is the right one.
+
+
+def find_rules(name):
+    """
+    Compiled rules (as FESTIVALS holds them) naming a festival,
+    case-insensitively; a Sankranti rule for a rashi's name too
+    """
+    key = name.strip().lower()
+    found = {}
+    for rules in list(FESTIVALS.lunar.values()) + list(FESTIVALS.solar.values()):
+        for rule in rules:
+            names = [n.lower() for n in rule["names"]]
+            if key in names or key == rule.get("sankranti", "").lower():
+                found[rule["pos"]] = rule
+    if not found:
+        raise KeyError(f"no festival rule names {name!r}")
+    return [found[pos] for pos in sorted(found)]
+
+
+class _Days:
+    """
+    (sunrise, sunset, next sunrise) frames of civil dates at one
+    location, each searched once
+    """
+
+    def __init__(self, loc):
+        self.loc = loc
+        self._daylight = {}
+
+    def daylight(self, d):
+        if d not in self._daylight:
+            self._daylight[d] = engine.daylight_jd(d, self.loc)
+        return self._daylight[d]
+
+    def frame(self, d):
+        return self.daylight(d) + (self.daylight(d + timedelta(days=1))[0],)
+
+
+def _names(rule, d):
+    if not rule.get("weekday_prefix"):
+        return list(rule["names"])
+    return [f"{WEEKDAY_DEITIES[d.weekday()]} {n}" for n in rule["names"]]
+
+
+def _allowed(rule, d, days):
+    if "weekday_idx" in rule and rule["weekday_idx"] != d.weekday():
+        return False
+    if "nakshatra_idx" in rule:
+        return rule["nakshatra_idx"] == engine.nakshatra_index(days.daylight(d)[0])
+    return True
+
+# ---------------- LUNAR ----------------
+
+def tithi_span(new_moon, ti):
+    """
+    Exact [start, end) JDs of tithi ti (0-29) of the lunation starting
+    at new_moon
+    """
+    index = get_index()
+    start = new_moon if ti == 0 else engine.solve_transition(new_moon, engine.tithi_index, ti - 1)
+    if ti == 29:
+        end = index.new_moon_after(new_moon + 1)[0]
+    else:
+        end = engine.solve_transition(start, engine.tithi_index, ti)
+    return start, end
+
+
+def observing_days(kala, start, end, days):
+    """
+    Civil dates observing a tithi spanning [start, end): those for which
+    observance_day() picks the middle of (yesterday, today, tomorrow),
+    as the day-by-day scan asks it
+    """
+    tz = days.loc.tz
+    first = local_date(start, tz) - timedelta(days=1)
+    last = local_date(end, tz)
+    out = []
+    d = first
+    while d <= last:
+        frames = [days.frame(d + timedelta(days=k)) for k in (-1, 0, 1)]
+        if start < frames[1][2] and end > frames[1][0] \
+                and observance_day(kala, start, end, frames) == 1:
+            out.append(d)
+        d += timedelta(days=1)
+    return out
+
+
+def _lunar_dates(rule, year, days):
+    if rule.get("month"):
+        months = {MONTHS.index(MONTH_ALIASES.get(rule["month"], rule["month"]))}
+    else:
+        months = None
+    pakshas = [rule["paksha"]] if rule.get("paksha") else ["Shukla", "Krishna"]
+    tithis = sorted({tithi_index(rule["tithi"], p) for p in pakshas})
+
+    index = get_index()
+    # lunations whose tithis can be observed within the year, any timezone
+    jd0 = engine.jd_from_utc(datetime(year, 1, 1)) - SYNODIC_MONTH - 2
+    jd1 = engine.jd_from_utc(datetime(year + 1, 1, 1)) + 2
+    out = []
+    for row in index.new_moons_between(jd0, jd1):
+        new_moon = row[0]
+        month, adhika = index.amanta_month(new_moon + 1)
+        if months is not None and (adhika or month not in months):
+            continue
+        for ti in tithis:
+            start, end = tithi_span(new_moon, ti)
+            for d in observing_days(rule["kala"], start, end, days):
+                if d.year == year and _allowed(rule, d, days):
+                    out.append((d, _names(rule, d)))
+    return out
+
+# ---------------- SOLAR ----------------
+
+def _solar_dates(rule, year, days):
+    rashi = RASHI_NAMES.index(rule["sankranti"])
+    jd = engine.jd_from_utc(datetime(year, 1, 1)) - 3
+    jd1 = engine.jd_from_utc(datetime(year + 1, 1, 1)) + 3
+    out = []
+    while True:
+        jd = solve_angle(sun_sidereal, rashi * 30, jd)
+        if jd >= jd1:
+            return out
+        d, _, _ = punya_kala(rashi, jd, days.daylight, days.loc.tz)
+        if d.year == year and _allowed(rule, d, days):
+            out.append((d, _names(rule, d)))
+        jd += 1
+
+# ---------------- QUERIES ----------------
+
+def solve_rule(rule, year, loc=engine.HOME, days=None):
+    """
+    Sorted [(date, names)] on which a compiled rule is observed in a
+    Gregorian year at loc
+    """
+    days = days or _Days(loc)
+    if "sankranti" in rule:
+        found = _solar_dates(rule, year, days)
+    else:
+        found = _lunar_dates(rule, year, days)
+    return sorted(found)
+
+
+def festival_dates(name, first_year, last_year, loc=engine.HOME):
+    """
+    Sorted dates of a festival for first_year..last_year (inclusive) at
+    loc, e.g. festival_dates("Diwali", 1940, 2125). The caller applies
+    the swisseph settings, as for the engine's generators.
+    """
+    rules = find_rules(name)
+    days = _Days(loc)
+    found = set()
+    for year in range(first_year, last_year + 1):
+        for rule in rules:
+            found.update(d for d, _ in solve_rule(rule, year, loc, days))
+    return sorted(found)
+
+
+# ---------------- RUN ----------------
+
+if __name__ == "__main__":
+    engine.init_swisseph()
+    t = time.perf_counter()
+    dates = festival_dates("Diwali", 1940, 2125)
+    print(f"🪔 {len(dates)} Diwali dates 1940-2125 in {time.perf_counter() - t:.2f} s: "
+          f"{dates[0]} ... {dates[-1]}")
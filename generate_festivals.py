@@ -1,131 +1,157 @@
+import argparse
+import hashlib
 import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-BASE = Path("panchang-calendar/public/data")
-FEST_DIR = BASE / "festivals"
-FEST_DIR.mkdir(exist_ok=True)
+from festival_rules import FESTIVALS, RULES, iter_facts
+from panchang_io import iter_records, write_json_atomic
 
+BASE = Path(__file__).resolve().parent / "frontend" / "public" / "data"
 
+# Bump when the way the pass applies the rules changes; edits to
+# festival_rules.RULES are picked up by rules_hash on their own.
+FESTIVAL_PASS_VERSION = 2
 
 
-LUNAR_FESTIVALS = [
-    # 🌸 New Year & Major
-    ("Ugadi", "Chaitra", "Shukla", "Padyami"),
-    ("Gudi Padwa", "Chaitra", "Shukla", "Padyami"),
-
-    # 🔱 Vaishnava / Shaiva
-    ("Rama Navami", "Chaitra", "Shukla", "Navami"),
-    ("Hanuman Jayanti", "Chaitra", None, "Purnima"),
-    ("Maha Shivaratri", "Magha", "Krishna", "Chaturdashi"),
-
-    # 🌕 Full / New Moon festivals
-    ("Holi", "Phalguna", None, "Purnima"),
-    ("Diwali", "Kartika", None, "Amavasya"),
-    ("Lakshmi Puja", "Kartika", None, "Amavasya"),
-
-    # 🐘 Ganapati
-    ("Ganesh Chaturthi", "Bhadrapada", "Shukla", "Chaturthi"),
-
-    # 🪔 Krishna
-    ("Krishna Janmashtami", "Shravana", "Krishna", "Ashtami"),
-
-    # 🌼 Shakti
-    ("Vasant Panchami", "Magha", "Shukla", "Panchami"),
-    ("Akshaya Tritiya", "Vaishakha", "Shukla", "Tritiya"),
-    ("Navratri Begins", "Ashwin", "Shukla", "Padyami"),
-    ("Dussehra", "Ashwin", "Shukla", "Dashami"),
-
-    # 📿 Vishnu
-    ("Devshayani Ekadashi", "Ashadha", "Shukla", "Ekadashi"),
-    ("Devutthana Ekadashi", "Kartika", "Shukla", "Ekadashi"),
-
-    # 🔥 Others
-    ("Gita Jayanti", "Margashirsha", "Shukla", "Ekadashi"),
-    ("Buddha Purnima", "Vaishakha", None, "Purnima"),
-]
+def rules_hash():
+    """
+    Identifies the festival rules in effect, for the build manifest
+    """
+    blob = json.dumps([FESTIVAL_PASS_VERSION, RULES])
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
 
 
 def iso(date_str):
     return datetime.strptime(date_str, "%d/%m/%Y").strftime("%Y-%m-%d")
 
-def extract_tithi_name(tithi_str):
-    # "Saptami upto 11:20 PM" -> "Saptami"
-    return tithi_str.split(" upto ")[0].strip()
-
-def extract_paksha(paksha_str):
-    # "Krishna Paksha" -> "Krishna"
-    # "Shukla Paksha"  -> "Shukla"
-    return paksha_str.replace(" Paksha", "").strip()
-
-def pradosh_prefix(weekday):
-    return {
-        "Monday": "Soma",
-        "Tuesday": "Bhauma",
-        "Wednesday": "Budha",
-        "Thursday": "Guru",
-        "Friday": "Shukra",
-        "Saturday": "Shani",
-        "Sunday": "Ravi"
-    }.get(weekday, "")
-
-def generate_year(year):
-    with open(BASE / f"{year}.json", "r", encoding="utf-8") as f:
-        days = json.load(f)
+def generate_year(year, days=None, base=BASE):
+    """
+    Writes <base>/festivals/<year>.json. `days` is the year's panchang
+    when the caller has it in memory; otherwise <base>/<year>.json is
+    streamed, a few records at a time.
+    """
+    if days is None:
+        days = iter_records(Path(base) / f"{year}.json")
 
     festivals = {}
 
-    for d in days:
-        date_iso = iso(d["date"])
-        month = d.get("Lunar Month", "")
-        tithi = extract_tithi_name(d.get("Tithi", ""))
-        paksha = extract_paksha(d.get("Paksha", ""))
-        weekday = d.get("Weekday", "")
-
-        for fest, f_month, f_paksha, f_tithi in LUNAR_FESTIVALS:
-            if month != f_month:
-                continue
-            if f_paksha and paksha != f_paksha:
-                continue
-            if tithi == f_tithi:
-                fests.append(fest)
-
-
-        day_fests = []
-
-        # EKADASHI
-        if tithi == "Ekadashi":
-            day_fests.append("Ekadashi")
-
-        # PRADOSH VRAT (Trayodashi)
-        if tithi == "Trayodashi":
-            pref = pradosh_prefix(weekday)
-            name = f"{pref} Pradosh Vrat" if pref else "Pradosh Vrat"
-            day_fests.append(name)
-
-        # SANKASHTI CHATURTHI (Krishna Paksha Chaturthi)
-        if tithi == "Chaturthi" and paksha == "Krishna":
-            day_fests.append("Sankashti Chaturthi")
-
-        # PURNIMA
-        if tithi == "Purnima":
-            day_fests.append("Purnima")
-
-        # AMAVASYA
-        if tithi == "Amavasya":
-            day_fests.append("Amavasya")
-
-        # CHANDRA DARSHANA (Shukla Paksha Padyami/Pratipada)
-        if tithi in ("Padyami", "Pratipada") and paksha == "Shukla":
-            day_fests.append("Chandra Darshana")
-
+    for d, facts in iter_facts(days):
+        day_fests = FESTIVALS.match(facts) if facts else []
         if day_fests:
-            festivals[date_iso] = day_fests
-
-    with open(FEST_DIR / f"{year}.json", "w", encoding="utf-8") as f:
-        json.dump(festivals, f, indent=2)
-
-    print(f"✅ Tithi-based festivals generated for {year}")
+            festivals[iso(d["date"])] = day_fests
+
+    write_json_atomic(Path(base) / "festivals" / f"{year}.json", festivals)
+
+    print(f"✅ Festivals generated for {year}")
+    return festivals
+
+# ---------------- BULK PASS ----------------
+# Every generated year at once, years in parallel (the pass only parses
+# records, so no swisseph setup), followed by festivals/index.json: each
+# festival name -> its sorted ISO dates across all years, so a query over
+# the whole archive reads one file instead of one per year.
+
+YEAR_FILE_RE = re.compile(r"^(\d{4})\.json$")
+INDEX_NAME = "index.json"
+
+
+def archive_years(base=BASE):
+    """
+    Sorted years with a <base>/<year>.json
+    """
+    return sorted(int(m.group(1)) for m in map(YEAR_FILE_RE.match, os.listdir(base)) if m)
+
+
+def _pass_year(year, base):
+    generate_year(year, None, base)
+    return year
+
+
+def generate_all(years=None, base=BASE, workers=None):
+    """
+    Festival files for the given years (default: every year file in
+    base), then the cross-year index. Returns the index.
+    """
+    years = archive_years(base) if years is None else sorted(years)
+    workers = min(workers or os.cpu_count() or 1, max(len(years), 1))
+    if workers == 1:
+        for year in years:
+            _pass_year(year, base)
+    elif years:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_pass_year, years, [base] * len(years)))
+    return write_index(base)
+
+
+def write_index(base=BASE):
+    """
+    Rebuilds <base>/festivals/index.json from the per-year festival files
+    """
+    folder = Path(base) / "festivals"
+    index = {}
+    for year in archive_years(folder):
+        with open(folder / f"{year}.json", encoding="utf-8") as f:
+            for d, names in json.load(f).items():
+                for name in names:
+                    index.setdefault(name, []).append(d)
+    index = {name: sorted(index[name]) for name in sorted(index)}
+    write_json_atomic(folder / INDEX_NAME, index, indent=None)
+    print(f"📇 Festival index: {len(index)} festivals, "
+          f"{sum(map(len, index.values()))} dates")
+    return index
+
+
+class FestivalCalendar:
+    """
+    Queries over festivals/index.json, loaded once:
+
+      cal = FestivalCalendar()
+      cal.next("Ekadashi", date(2026, 1, 1), 10)
+      cal.dates("Maha Shivaratri")
+    """
+
+    def __init__(self, base=BASE):
+        with open(Path(base) / "festivals" / INDEX_NAME, encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._names = {name.lower(): name for name in self.index}
+
+    def _dates(self, name):
+        key = self._names.get(name.strip().lower())
+        if key is None:
+            raise KeyError(f"no festival named {name!r} in the index")
+        return self.index[key]
+
+    def dates(self, name, start=None, end=None):
+        """
+        Sorted dates of a festival, optionally start <= d <= end
+        """
+        dates = self._dates(name)
+        lo = 0 if start is None else bisect_left(dates, start.isoformat())
+        hi = len(dates) if end is None else bisect_right(dates, end.isoformat())
+        return [datetime.strptime(d, "%Y-%m-%d").date() for d in dates[lo:hi]]
+
+    def next(self, name, after, count=1):
+        """
+        The first `count` dates of a festival on or after a date
+        """
+        dates = self._dates(name)
+        lo = bisect_left(dates, after.isoformat())
+        return [datetime.strptime(d, "%Y-%m-%d").date() for d in dates[lo:lo + count]]
+
+# ---------------- RUN ----------------
 
 if __name__ == "__main__":
-    generate_year(2026)
+    parser = argparse.ArgumentParser(
+        description="Festival pass over the generated years, plus the cross-year index")
+    parser.add_argument("years", type=int, nargs="*",
+                        help="years to redo (default: every year file)")
+    parser.add_argument("--base", default=str(BASE))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    generate_all(args.years or None, args.base, args.workers)
@@ -0,0 +1,71 @@
+from bisect import bisect_right
+from datetime import datetime
+
+from panchang_columnar import format_time
+
+# ---------------- LOCAL TIME ----------------
+# Float JD (UT) -> local clock text without building datetimes. Each
+# timezone's UTC offsets are read once from pytz's transition table
+# (DST and historical changes, such as IST's +6:30 of 1942-45,
+# included), so a conversion is a bisection and a little arithmetic,
+# and the text comes from a table of the day's 1440 minutes.
+#
+# Times are rounded to the nearest minute; converting through datetime
+# and strftime used to drop the seconds instead.
+
+J2000 = 2451545.0
+J2000_DATETIME = datetime(2000, 1, 1, 12)
+
+CLOCK_TEXT = [format_time(m) for m in range(1440)]  # "12:00 AM" ... "11:59 PM"
+
+
+def jd_from_naive_utc(dt):
+    return J2000 + (dt - J2000_DATETIME).total_seconds() / 86400
+
+
+class LocalClock:
+    """
+    JD -> local time of day for one pytz timezone
+    """
+
+    def __init__(self, tz):
+        self.tz = tz
+        transitions = getattr(tz, "_utc_transition_times", None)
+        if transitions:
+            # the first transition is datetime.min: "since forever"
+            self._starts = [float("-inf")] + [jd_from_naive_utc(t) for t in transitions[1:]]
+            self._offsets = [info[0].total_seconds() / 60 for info in tz._transition_info]
+        else:  # fixed offset (UTC, StaticTzInfo)
+            self._starts = [float("-inf")]
+            self._offsets = [tz.utcoffset(J2000_DATETIME).total_seconds() / 60]
+
+    def offset(self, jd):
+        """
+        UTC offset in minutes in effect at jd
+        """
+        return self._offsets[bisect_right(self._starts, jd) - 1]
+
+    def minutes(self, jd):
+        """
+        Local minutes since midnight (0-1439), rounded
+        """
+        return int((jd + 0.5) * 1440 + self.offset(jd) + 0.5) % 1440
+
+    def text(self, jd):
+        """
+        "HH:MM AM" for jd, or None for None
+        """
+        return None if jd is None else CLOCK_TEXT[self.minutes(jd)]
+
+
+_CLOCKS = {}
+
+
+def local_clock(tz):
+    """
+    Shared LocalClock per timezone
+    """
+    clock = _CLOCKS.get(tz.zone)
+    if clock is None:
+        clock = _CLOCKS[tz.zone] = LocalClock(tz)
+    return clock
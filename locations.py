@@ -0,0 +1,70 @@
+from collections import namedtuple
+
+import pytz
+
+# ---------------- LOCATIONS ----------------
+# Everything sunrise-dependent (the panchang day, kaalams, rise/set
+# times, festival days) is computed per location; tithi, nakshatra,
+# yoga and karana boundaries are geocentric and shared by all of them.
+
+Location = namedtuple("Location", "name lat lon alt tz")
+
+
+def make_location(name, lat, lon, alt=0, tz="Asia/Kolkata"):
+    return Location(name, lat, lon, alt, pytz.timezone(tz))
+
+
+def geopos(loc):
+    """
+    (lon, lat, alt) as swisseph's rise_trans takes it
+    """
+    return loc.lon, loc.lat, loc.alt
+
+
+def slug(name):
+    """
+    "New Delhi" -> "new-delhi", for output folders
+    """
+    return "-".join(name.lower().split())
+
+
+HYDERABAD = make_location("Hyderabad", 17.3850, 78.4867)
+
+CITIES = {slug(c.name): c for c in [
+    HYDERABAD,
+    make_location("New Delhi", 28.6139, 77.2090),
+    make_location("Mumbai", 19.0760, 72.8777),
+    make_location("Chennai", 13.0827, 80.2707),
+    make_location("Kolkata", 22.5726, 88.3639),
+    make_location("Bengaluru", 12.9716, 77.5946),
+    make_location("Pune", 18.5204, 73.8567),
+    make_location("Ahmedabad", 23.0225, 72.5714),
+    make_location("Jaipur", 26.9124, 75.7873),
+    make_location("Lucknow", 26.8467, 80.9462),
+    make_location("Varanasi", 25.3176, 82.9739),
+    make_location("Ujjain", 23.1765, 75.7885),
+    make_location("Visakhapatnam", 17.6868, 83.2185),
+    make_location("Vijayawada", 16.5062, 80.6480),
+    make_location("Tirupati", 13.6288, 79.4192),
+    make_location("Thiruvananthapuram", 8.5241, 76.9366),
+    make_location("Guwahati", 26.1445, 91.7362),
+    make_location("Kathmandu", 27.7172, 85.3240, tz="Asia/Kathmandu"),
+    make_location("Colombo", 6.9271, 79.8612, tz="Asia/Colombo"),
+    make_location("Singapore", 1.3521, 103.8198, tz="Asia/Singapore"),
+    make_location("Dubai", 25.2048, 55.2708, tz="Asia/Dubai"),
+    make_location("London", 51.5074, -0.1278, tz="Europe/London"),
+    make_location("New York", 40.7128, -74.0060, tz="America/New_York"),
+    make_location("San Francisco", 37.7749, -122.4194, tz="America/Los_Angeles"),
+    make_location("Toronto", 43.6532, -79.3832, tz="America/Toronto"),
+    make_location("Sydney", -33.8688, 151.2093, tz="Australia/Sydney"),
+]}
+
+
+def get_location(name):
+    """
+    CITIES entry by name or slug, case-insensitive
+    """
+    key = slug(name)
+    if key not in CITIES:
+        raise KeyError(f"unknown location {name!r}; known: {', '.join(CITIES)}")
+    return CITIES[key]
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+import swisseph as swe
+
+from ephemeris import (
+    SWE_LOCK, calc_ut, elongation, get_ayanamsa_ut, settings_fingerprint, solve_angle,
+)
+from panchang_io import CACHE_DIR, write_json_atomic
+
+# ---------------- LUNATION INDEX ----------------
+# Exact Amavasya / Purnima instants for 1900-2200, with the Sun's rashi
+# at each, solved once and kept on disk. Lunar-month, Adhika-masa and
+# Ugadi lookups become bisections into these sorted lists instead of
+# day-by-day scans of the elongation.
+
+INDEX_VERSION = 1
+START_YEAR = 1900
+END_YEAR = 2200
+SYNODIC_MONTH = 29.530588
+
+# settings fingerprint -> loaded index, one per swisseph configuration
+_INDEXES = {}
+
+
+def _phase_row(jd):
+    """
+    [jd, sidereal rashi of the Sun, tropical sign of the Sun]
+    """
+    trop = calc_ut(jd, swe.SUN)[0][0]
+    sid = (trop - get_ayanamsa_ut(jd)) % 360
+    return [jd, int(sid // 30), int(trop // 30)]
+
+
+def build_index(start_year=START_YEAR, end_year=END_YEAR):
+    jd = swe.julday(start_year, 1, 1, 0) - SYNODIC_MONTH
+    jd_end = swe.julday(end_year + 1, 1, 1, 0) + SYNODIC_MONTH
+
+    new_moons, full_moons = [], []
+    jd = solve_angle(elongation, 0, jd)
+    while jd < jd_end:
+        new_moons.append(_phase_row(jd))
+        fm = solve_angle(elongation, 180, jd)
+        full_moons.append(_phase_row(fm))
+        jd = solve_angle(elongation, 0, fm)
+
+    return {
+        "version": f"{INDEX_VERSION}|{settings_fingerprint()}",
+        "start_year": start_year,
+        "end_year": end_year,
+        "new_moons": new_moons,
+        "full_moons": full_moons,
+    }
+
+
+class LunationIndex:
+
+    def __init__(self, data):
+        self.version = data["version"]
+        self.new_moons = data["new_moons"]
+        self.full_moons = data["full_moons"]
+        self._nm_jds = [r[0] for r in self.new_moons]
+        self._fm_jds = [r[0] for r in self.full_moons]
+
+    @staticmethod
+    def _before(jds, rows, jd):
+        i = bisect_right(jds, jd) - 1
+        if i < 0 or i >= len(rows) - 1:
+            raise ValueError(f"JD {jd} outside the lunation index")
+        return rows[i]
+
+    @staticmethod
+    def _after(jds, rows, jd):
+        i = bisect_right(jds, jd)
+        if i == 0 or i >= len(rows):
+            raise ValueError(f"JD {jd} outside the lunation index")
+        return rows[i]
+
+    def new_moon_before(self, jd):
+        return self._before(self._nm_jds, self.new_moons, jd)
+
+    def new_moon_after(self, jd):
+        return self._after(self._nm_jds, self.new_moons, jd)
+
+    def full_moon_before(self, jd):
+        return self._before(self._fm_jds, self.full_moons, jd)
+
+    def full_moon_after(self, jd):
+        return self._after(self._fm_jds, self.full_moons, jd)
+
+    def new_moons_between(self, jd_start, jd_end):
+        """
+        Index rows of every Amavasya in [jd_start, jd_end)
+        """
+        i = bisect_left(self._nm_jds, jd_start)
+        j = bisect_left(self._nm_jds, jd_end)
+        return self.new_moons[i:j]
+
+    def is_adhika(self, jd):
+        """
+        Adhika masa: no Sankranti between the Amavasyas bounding jd,
+        i.e. the Sun is in the same sidereal rashi at both
+        """
+        return self.new_moon_before(jd)[1] == self.new_moon_after(jd)[1]
+
+    def amanta_month(self, jd):
+        """
+        (month index with 0 = Chaitra, is_adhika). The month that starts
+        with the Sun in Meena (rashi 11) is Chaitra.
+        """
+        return (self.new_moon_before(jd)[1] + 1) % 12, self.is_adhika(jd)
+
+
+def index_path(version):
+    """
+    One file per swisseph configuration, so two configurations used in
+    one process (or machine) don't keep rebuilding each other's index
+    """
+    digest = hashlib.sha1(version.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"lunation_index_{digest}.json")
+
+
+def get_index():
+    """
+    Index for the swisseph settings in effect: loaded from disk, or
+    rebuilt when missing or built under different settings
+    """
+    fp = settings_fingerprint()
+    index = _INDEXES.get(fp)
+    if index is not None:
+        return index
+
+    with SWE_LOCK:
+        if fp in _INDEXES:
+            return _INDEXES[fp]
+        version = f"{INDEX_VERSION}|{fp}"
+        path = index_path(version)
+        data = None
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except ValueError:
+                data = None
+        if data is None or data.get("version") != version:
+            data = build_index()
+            write_json_atomic(path, data, indent=None)
+        _INDEXES[fp] = LunationIndex(data)
+        return _INDEXES[fp]
+
+
+def reset_index():
+    """
+    Forget the loaded indexes (e.g. after changing swisseph settings
+    directly on swisseph)
+    """
+    _INDEXES.clear()
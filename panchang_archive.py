@@ -0,0 +1,233 @@
+import glob
+import hashlib
+import os
+import re
+import time
+from datetime import date as Date
+
+import numpy as np
+
+import panchang_columnar
+from festival_rules import MONTH_ALIASES, TITHI_ALIASES
+from panchang_columnar import YearColumns
+from panchang_io import CACHE_DIR, iter_records
+
+# ---------------- ARCHIVE QUERIES ----------------
+# Random access to a folder of generated year files by date, and
+# attribute search across every year, without parsing year JSON:
+#
+#   archive = PanchangArchive()
+#   archive.get_day(date(2026, 11, 8))
+#   archive.get_range(date(2026, 11, 1), date(2026, 11, 30))
+#   archive.find(tithi="Ekadashi", paksha="Shukla")   # -> [date, ...]
+#
+# Each year is read through its memory-mapped columnar copy
+# (<year>.pcol beside the JSON, as regenerate.py writes it, or one
+# built once under CACHE_DIR when missing or older than the JSON), so a
+# lookup decodes only the records it returns. find() works on an
+# inverted index, attribute value -> sorted date ordinals, built from
+# the columns' codes the first time an attribute is searched.
+
+YEAR_FILE_RE = re.compile(r"^(\d{4})\.json$")
+
+# find() keyword -> day record field
+SEARCH_FIELDS = {
+    "tithi": "Tithi",
+    "nakshatra": "Nakshatra",
+    "yoga": "Yoga",
+    "karana": "Karanam",
+    "paksha": "Paksha",
+    "month": "Lunar Month",
+    "weekday": "Weekday",
+    "festival": "Festivals",
+}
+
+
+def _canonical(field, value):
+    """
+    Search key of a field value: "Padyami"/"Pratipada", "Kartik"/"Kartika"
+    and "Shukla"/"Shukla Paksha" compare equal, case-insensitively
+    """
+    value = value.split(" upto ")[0].strip()
+    if field == "Tithi":
+        value = TITHI_ALIASES.get(value, value)
+    elif field == "Lunar Month":
+        value = MONTH_ALIASES.get(value, value)
+    elif field == "Paksha" and not value.endswith(" Paksha"):
+        value += " Paksha"
+    return value.lower()
+
+
+def _field_values(field, cols, tables, kind):
+    """
+    (day positions, codes, code table) of one field's columns: day
+    positions[k] has value table[codes[k]]; no day is decoded
+    """
+    if kind == "list":
+        counts = np.diff(cols["offsets"])
+        days = np.repeat(np.arange(len(counts)), counts)
+        return days, cols["codes"], tables["values"]
+    if kind in ("upto", "enum"):
+        table = tables["names" if kind == "upto" else "values"]
+        return np.arange(len(cols["code"])), cols["code"], table
+    raise ValueError(f"{field} is stored as {kind!r} and can't be searched")
+
+
+class PanchangArchive:
+    """
+    Date-indexed view of <folder>/<year>.json files (the default is the
+    frontend archive). Years must be whole Gregorian years, as the
+    generators write them.
+    """
+
+    def __init__(self, folder=None):
+        if folder is None:
+            folder = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "frontend", "public", "data")
+        self.folder = folder
+        self.years = {}
+        for path in glob.glob(os.path.join(folder, "*.json")):
+            m = YEAR_FILE_RE.match(os.path.basename(path))
+            if m:
+                self.years[int(m.group(1))] = path
+        if not self.years:
+            raise FileNotFoundError(f"no <year>.json files in {folder}")
+
+        key = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()[:12]
+        self._cache_dir = os.path.join(CACHE_DIR, "archive", key)
+        self._open = {}    # year -> YearColumns
+        self._index = {}   # field -> {canonical value: sorted ordinals}
+
+    # -------- YEAR FILES --------
+
+    def _columnar_path(self, year):
+        """
+        An up-to-date columnar copy of a year file, built if needed
+        """
+        src = self.years[year]
+        name = f"{year}{panchang_columnar.SUFFIX}"
+        for path in (os.path.join(self.folder, name), os.path.join(self._cache_dir, name)):
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(src):
+                return path
+        panchang_columnar.write_year(path, list(iter_records(src)))
+        return path
+
+    def year(self, year):
+        """
+        YearColumns of one year, mapped on first use
+        """
+        if year not in self._open:
+            if year not in self.years:
+                raise KeyError(f"{year} is not in {self.folder}")
+            self._open[year] = YearColumns(self._columnar_path(year))
+        return self._open[year]
+
+    def _position(self, d):
+        """
+        (YearColumns, index of the date in it), or None outside the archive
+        """
+        if d.year not in self.years:
+            return None
+        cols = self.year(d.year)
+        i = d.toordinal() - Date(d.year, 1, 1).toordinal()
+        ords = cols.columns["date"]["ordinal"]
+        if not (0 <= i < len(ords) and ords[i] == d.toordinal()):
+            return None
+        return cols, i
+
+    def close(self):
+        for cols in self._open.values():
+            cols.close()
+        self._open.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------- QUERIES --------
+
+    def get_day(self, d):
+        """
+        Day dict of a date / datetime, or None if the archive lacks it
+        """
+        pos = self._position(d)
+        return None if pos is None else pos[0][pos[1]]
+
+    def get_range(self, start, end):
+        """
+        Day dicts for start <= d <= end, skipping dates not archived
+        """
+        days = []
+        for o in range(start.toordinal(), end.toordinal() + 1):
+            day = self.get_day(Date.fromordinal(o))
+            if day is not None:
+                days.append(day)
+        return days
+
+    def find(self, start=None, end=None, **attrs):
+        """
+        Sorted dates whose records match every attribute given, e.g.
+        find(tithi="Ekadashi", month="Margashirsha"), optionally within
+        start <= d <= end. Keywords are the keys of SEARCH_FIELDS;
+        festival= matches one name in the day's festival list.
+        """
+        hits = None
+        for kw, value in attrs.items():
+            if kw not in SEARCH_FIELDS:
+                raise TypeError(f"find() got an unknown attribute {kw!r}; "
+                                f"use {', '.join(SEARCH_FIELDS)}")
+            field = SEARCH_FIELDS[kw]
+            ords = self.postings(field).get(_canonical(field, value))
+            if ords is None:
+                return []
+            hits = ords if hits is None else np.intersect1d(hits, ords, assume_unique=True)
+        if hits is None:
+            raise TypeError("find() needs at least one attribute")
+
+        lo = 0 if start is None else np.searchsorted(hits, start.toordinal())
+        hi = len(hits) if end is None else np.searchsorted(hits, end.toordinal(), "right")
+        return [Date.fromordinal(int(o)) for o in hits[lo:hi]]
+
+    def find_days(self, start=None, end=None, **attrs):
+        """
+        Day dicts of find(...), decoded one at a time
+        """
+        for d in self.find(start, end, **attrs):
+            yield self.get_day(d)
+
+    def postings(self, field):
+        """
+        {canonical value: sorted int32 date ordinals} for one field
+        """
+        if field not in self._index:
+            parts = {}
+            for year in sorted(self.years):
+                cols = self.year(year)
+                if field not in cols.columns:
+                    continue
+                days, codes, table = _field_values(
+                    field, cols.columns[field], cols.tables[field], cols.kinds[field])
+                ords = cols.columns["date"]["ordinal"][days]
+                order = np.argsort(codes, kind="stable")
+                bounds = np.searchsorted(codes[order], np.arange(len(table) + 1))
+                for c, text in enumerate(table):
+                    if bounds[c] < bounds[c + 1]:
+                        key = _canonical(field, text)
+                        parts.setdefault(key, []).append(ords[order[bounds[c]:bounds[c + 1]]])
+            self._index[field] = {
+                k: np.unique(np.concatenate(v)).astype(np.int32) for k, v in parts.items()}
+        return self._index[field]
+
+# ---------------- RUN ----------------
+
+if __name__ == "__main__":
+    t = time.perf_counter()
+    archive = PanchangArchive()
+    hits = archive.find(tithi="Ekadashi")
+    print(f"📅 {len(hits)} Ekadashis in {len(archive.years)} years, "
+          f"first run {(time.perf_counter() - t) * 1000:.0f} ms")
+    t = time.perf_counter()
+    hits = archive.find(tithi="Ekadashi")
+    print(f"⚡ Again from the index: {(time.perf_counter() - t) * 1000:.2f} ms")
@@ -0,0 +1,340 @@
+import json
+import mmap
+import re
+import struct
+from datetime import date as Date
+
+import numpy as np
+
+from panchang_io import atomic_output
+
+# ---------------- COLUMNAR YEAR FORMAT ----------------
+# A year of day records stored column by column, so the whole archive
+# can be memory-mapped instead of parsed:
+#
+#   MAGIC | uint32 header length | header JSON | pad | column arrays
+#
+# Names (tithi, nakshatra, month, festivals, ...) become small-int codes
+# into per-file tables kept in the header; every clock time becomes a
+# minute offset from the day's local midnight (-1 = none). "upto" end
+# times are true offsets, so 1:30 AM the next night is 1530. Offsets
+# never exceed a few thousand, so they are stored as int16.
+#
+# Decoding reproduces the generator's dicts exactly (same keys, order
+# and strings), so the JSON files are a derived view of this format.
+
+MAGIC = b"PCOL\x00\x00\x00\x01"
+SUFFIX = ".pcol"
+ALIGN = 8
+NONE = -1
+MINUTES = "<i2"
+
+TIME_RE = re.compile(r"^(\d\d):(\d\d) ([AP]M)$")
+UPTO_RE = re.compile(r"^(.*) upto (\d\d:\d\d [AP]M)( \(next day\))?$")
+NEXT_DAY = " (next day)"
+
+# field name -> kind; anything else (or anything that fails to parse
+# as its kind) is stored as an enum of whole values
+FIELD_KINDS = {
+    "date": "date",
+    "Sunrise": "time",
+    "Sunset": "time",
+    "Moonrise": "time",
+    "Moonset": "time",
+    "Tithi": "upto",
+    "Nakshatra": "upto",
+    "Yoga": "upto",
+    "Karanam": "upto",
+    "Rahu Kalam": "spans",
+    "Gulikai Kalam": "spans",
+    "Yamaganda": "spans",
+    "Abhijit": "spans",
+    "Dur Muhurtam": "spans",
+    "Amrit Kalam": "spans",
+    "Varjyam": "spans",
+    "Sankranti Punya Kala": "spans",
+    "Festivals": "list",
+}
+
+# ---------------- TIME TEXT ----------------
+
+def parse_time(text):
+    """
+    "07:05 PM" -> 1145 (minutes after midnight)
+    """
+    m = TIME_RE.match(text)
+    if not m:
+        raise ValueError(f"not a time: {text!r}")
+    h, mi = int(m.group(1)) % 12, int(m.group(2))
+    return (h + (12 if m.group(3) == "PM" else 0)) * 60 + mi
+
+
+def format_time(minutes):
+    """
+    Inverse of parse_time; same text as strftime("%I:%M %p")
+    """
+    h, mi = divmod(minutes % 1440, 60)
+    return f"{(h - 1) % 12 + 1:02d}:{mi:02d} {'PM' if h >= 12 else 'AM'}"
+
+# ---------------- ENCODERS ----------------
+# Each takes the column's values and returns (arrays, tables); each
+# decoder takes those back and returns the value for one day.
+
+def _table(values):
+    table, codes = [], {}
+    for v in values:
+        if v not in codes:
+            codes[v] = len(table)
+            table.append(v)
+    return table, codes
+
+
+def _enc_enum(values, days):
+    table, codes = _table(values)
+    return {"code": np.array([codes[v] for v in values], dtype="<i2")}, {"values": table}
+
+
+def _dec_enum(cols, tables, i):
+    return tables["values"][cols["code"][i]]
+
+
+def _enc_date(values, days):
+    ords = [Date(int(y), int(m), int(d)).toordinal()
+            for d, m, y in (v.split("/") for v in values)]
+    return {"ordinal": np.array(ords, dtype="<i4")}, {}
+
+
+def _dec_date(cols, tables, i):
+    return Date.fromordinal(int(cols["ordinal"][i])).strftime("%d/%m/%Y")
+
+
+def _enc_time(values, days):
+    mins = [NONE if v is None else parse_time(v) for v in values]
+    return {"min": np.array(mins, dtype=MINUTES)}, {}
+
+
+def _dec_time(cols, tables, i):
+    m = int(cols["min"][i])
+    return None if m == NONE else format_time(m)
+
+
+def _enc_upto(values, days):
+    names, mins, flags = [], [], []
+    for v, day in zip(values, days):
+        m = UPTO_RE.match(v)
+        if not m:
+            raise ValueError(f"not an 'upto' value: {v!r}")
+        t = parse_time(m.group(2))
+        next_day = m.group(3) is not None
+        # clock times before sunrise belong to the night after this day
+        sunrise = day.get("Sunrise")
+        if next_day or (sunrise and t < parse_time(sunrise)):
+            t += 1440
+        names.append(m.group(1))
+        mins.append(t)
+        flags.append(next_day)
+    table, codes = _table(names)
+    return {
+        "code": np.array([codes[n] for n in names], dtype="<i2"),
+        "min": np.array(mins, dtype=MINUTES),
+        "next_day": np.array(flags, dtype="u1"),
+    }, {"names": table}
+
+
+def _dec_upto(cols, tables, i):
+    text = f"{tables['names'][cols['code'][i]]} upto {format_time(int(cols['min'][i]))}"
+    return text + NEXT_DAY if cols["next_day"][i] else text
+
+
+def _enc_spans(values, days):
+    """
+    None, "A to B" or "A to B, C to D", ...: columns t0, t1, ... as wide
+    as the most ranges any day has
+    """
+    rows = []
+    for v in values:
+        row = []
+        if v is not None:
+            for part in v.split(", "):
+                a, b = part.split(" to ")
+                row += [parse_time(a), parse_time(b)]
+        rows.append(row)
+    width = max([len(r) for r in rows] + [2])
+    arr = np.array([r + [NONE] * (width - len(r)) for r in rows],
+                   dtype=MINUTES).reshape(len(values), width)
+    return {f"t{k}": np.ascontiguousarray(arr[:, k]) for k in range(width)}, {}
+
+
+def _dec_spans(cols, tables, i):
+    parts = []
+    for k in range(0, len(cols), 2):
+        a, b = int(cols[f"t{k}"][i]), int(cols[f"t{k + 1}"][i])
+        if a != NONE:
+            parts.append(f"{format_time(a)} to {format_time(b)}")
+    return ", ".join(parts) if parts else None
+
+
+def _enc_list(values, days):
+    flat = [x for v in values for x in v]
+    table, codes = _table(flat)
+    offsets = np.cumsum([0] + [len(v) for v in values])
+    return {
+        "offsets": np.asarray(offsets, dtype="<i4"),
+        "codes": np.array([codes[x] for x in flat], dtype="<i2"),
+    }, {"values": table}
+
+
+def _dec_list(cols, tables, i):
+    a, b = cols["offsets"][i], cols["offsets"][i + 1]
+    return [tables["values"][c] for c in cols["codes"][a:b]]
+
+
+CODECS = {
+    "enum": (_enc_enum, _dec_enum),
+    "date": (_enc_date, _dec_date),
+    "time": (_enc_time, _dec_time),
+    "upto": (_enc_upto, _dec_upto),
+    "spans": (_enc_spans, _dec_spans),
+    "list": (_enc_list, _dec_list),
+}
+
+# ---------------- WRITE ----------------
+
+def encode_year(days):
+    """
+    Day dicts (one layout for all) -> bytes of a columnar file
+    """
+    fields = list(days[0]) if days else []
+    for d in days:
+        if list(d) != fields:
+            raise ValueError(f"{d.get('date')}: fields differ from the first day")
+
+    header = {"n_days": len(days), "fields": []}
+    arrays = []
+    for name in fields:
+        values = [d[name] for d in days]
+        kind = FIELD_KINDS.get(name, "enum")
+        try:
+            cols, tables = CODECS[kind][0](values, days)
+        except (ValueError, TypeError):
+            kind = "enum"  # e.g. a hand-edited value in another format
+            cols, tables = _enc_enum(values, days)
+        header["fields"].append({
+            "name": name,
+            "kind": kind,
+            "tables": tables,
+            "columns": [[c, a.dtype.str, a.size] for c, a in cols.items()],
+        })
+        arrays += cols.values()
+
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    out = bytearray(MAGIC + struct.pack("<I", len(head)) + head)
+    for a in arrays:
+        out += b"\0" * (-len(out) % ALIGN)
+        out += a.tobytes()
+    return bytes(out)
+
+
+def write_year(path, days):
+    with atomic_output(path, "wb") as f:
+        f.write(encode_year(days))
+
+# ---------------- READ ----------------
+
+class YearColumns:
+    """
+    Memory-mapped columnar year file. Columns are zero-copy NumPy views;
+    day dicts are only built when indexed or iterated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a columnar year file")
+        (n,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        pos = len(MAGIC) + 4
+        header = json.loads(self._mm[pos:pos + n].decode("utf-8"))
+        pos += n
+
+        self.n_days = header["n_days"]
+        self.fields = []
+        self.columns = {}
+        self.kinds = {}
+        self.tables = {}
+        for field in header["fields"]:
+            cols = {}
+            for name, dtype, size in field["columns"]:
+                pos += -pos % ALIGN
+                cols[name] = np.frombuffer(self._mm, dtype=dtype, count=size, offset=pos)
+                pos += cols[name].nbytes
+            self.fields.append((field["name"], CODECS[field["kind"]][1], cols, field["tables"]))
+            self.columns[field["name"]] = cols
+            self.kinds[field["name"]] = field["kind"]
+            self.tables[field["name"]] = field["tables"]
+
+    def __len__(self):
+        return self.n_days
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n_days
+        if not 0 <= i < self.n_days:
+            raise IndexError(i)
+        return {name: dec(cols, tables, i) for name, dec, cols, tables in self.fields}
+
+    def __iter__(self):
+        for i in range(self.n_days):
+            yield self[i]
+
+    def day(self, d):
+        """
+        Day dict for a datetime.date / datetime, or None if not in the file
+        """
+        ords = self.columns["date"]["ordinal"]
+        o = d.toordinal()
+        i = int(np.searchsorted(ords, o))
+        return self[i] if i < len(ords) and ords[i] == o else None
+
+    def close(self):
+        # drop the views first: an mmap with exported buffers can't close
+        self.fields, self.columns = [], {}
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_year(path):
+    with YearColumns(path) as cols:
+        return list(cols)
+
+# ---------------- RUN ----------------
+
+if __name__ == "__main__":
+    # Encode every <year>.json in a folder and check the round trip
+    import glob
+    import os
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "frontend", "public", "data")
+
+    json_bytes = col_bytes = 0
+    for path in sorted(glob.glob(os.path.join(folder, "[0-9]*.json"))):
+        with open(path, encoding="utf-8") as f:
+            days = json.load(f)
+        out = path[:-len(".json")] + SUFFIX
+        write_year(out, days)
+        if read_year(out) != days:
+            raise SystemExit(f"❌ Round trip mismatch for {path}")
+        json_bytes += os.path.getsize(path)
+        col_bytes += os.path.getsize(out)
+        print(f"✅ {os.path.basename(out)}")
+
+    print(f"🎉 JSON {json_bytes / 1e6:.1f} MB → columnar {col_bytes / 1e6:.1f} MB")
@@ -1,22 +1,68 @@
 import swisseph as swe
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+import os
 import pytz
-import json
+
+from ephemeris import (
+    SOLVER_TOL, apply_settings, clear_cache, current_settings, elongation,
+    polish_angle, solve_angle, sun_moon_lon, sun_moon_lon_speed, swe_settings,
+)
+from ephemeris_table import ChebyshevTable, transition_seeds
+from festival_rules import FESTIVALS, NO_MONTH
+from rise_set import EquatorialTable, Horizon, rise_set_days
+from local_time import J2000, local_clock
+from locations import HYDERABAD, geopos, slug
+from lunation_index import get_index, reset_index
+import panchang_columnar
+from panchang_io import write_records
+from sankranti import RASHI_NAMES, day_events, year_sankrantis, year_table
+from year_meta import YearMetaStore
 
 # ---------------- CONFIG ----------------
 
-IST = pytz.timezone("Asia/Kolkata")
+# default location; everything sunrise-dependent takes a `loc`
+HOME = HYDERABAD
+IST = HOME.tz
+LAT, LON, ALT = HOME.lat, HOME.lon, HOME.alt
+
+EPHE_PATH = "."
+
+# Bump whenever a change alters generated output: the build manifest
+# (regenerate.py) rebuilds every year file written by another version.
+ENGINE_VERSION = 6
+
+SID_MODE = swe.SIDM_LAHIRI
 
-LAT = 17.3850
-LON = 78.4867
-ALT = 0
+J2000_UTC = datetime(2000, 1, 1, 12, tzinfo=pytz.utc)
+MINUTE = 1 / 1440  # days
 
-UGADI_CACHE = {}
+# (year, location, swisseph settings) -> metadata dict; in-process memo
+# in front of the on-disk store
+YEAR_META = {}
+_META_STORE = None
+
+# (year, location, swisseph settings) -> sankranti.year_table output
+SANKRANTI_TABLES = {}
+
+
+def init_swisseph():
+    """
+    Applies the swisseph settings this engine relies on.
+    Called at import and again in every worker process.
+    """
+    global _META_STORE
+    apply_settings(SID_MODE, EPHE_PATH)
+    clear_cache()
+    reset_index()
+    YEAR_META.clear()
+    SANKRANTI_TABLES.clear()
+    _META_STORE = None
 
 
-swe.set_sid_mode(swe.SIDM_LAHIRI)
-swe.set_topo(LON, LAT, ALT)
-swe.set_ephe_path(".")
+init_swisseph()
 
 # ---------------- CONSTANTS ----------------
 
@@ -46,6 +92,17 @@ YOGA_NAMES = [
     "Indra","Vaidhriti"
 ]
 
+# 60 half-tithis: Kimstughna, 8 rounds of the 7 movable karanas, then the
+# three fixed karanas that close Krishna Chaturdashi/Amavasya
+MOVABLE_KARANAS = [
+    "Bava","Balava","Kaulava","Taitila","Garaja","Vanija","Vishti"
+]
+KARANA_NAMES = (
+    ["Kimstughna"]
+    + [MOVABLE_KARANAS[i % 7] for i in range(56)]
+    + ["Shakuni","Chatushpada","Naga"]
+)
+
 LUNAR_MONTHS = [
     "Chaitra", "Vaishakha", "Jyeshtha", "Ashadha",
     "Shravana", "Bhadrapada", "Ashwin", "Kartika",
@@ -77,58 +134,61 @@ GULIKAI_INDEX = [6,5,4,3,2,1,7]
 
 def jd_from_utc(dt):
     return swe.julday(dt.year, dt.month, dt.day,
-                      dt.hour + dt.minute/60 + dt.second/3600)
+                      dt.hour + dt.minute/60 + (dt.second + dt.microsecond/1e6)/3600)
 
 def utc_from_jd(jd):
-    y,m,d,ut = swe.revjul(jd)
-    h = int(ut)
-    mi = int((ut-h)*60)
-    s = int((((ut-h)*60)-mi)*60)
-    return datetime(y,m,d,h,mi,s,tzinfo=pytz.utc)
+    # to the microsecond; going through revjul's hours dropped the seconds' fraction
+    return J2000_UTC + timedelta(days=jd - J2000)
 
 def ist_from_jd(jd):
     return utc_from_jd(jd).astimezone(IST)
 
-def fmt(dt):
-    return dt.strftime("%I:%M %p") if dt else None 
+def local_from_jd(jd, tz=IST):
+    return utc_from_jd(jd).astimezone(tz)
+
+def day_start_jd(date, loc=HOME):
+    """
+    JD (UT) of local midnight starting a civil date: rise/set searches
+    start here, so every time found belongs to that date
+    """
+    midnight = loc.tz.localize(datetime(date.year, date.month, date.day))
+    return jd_from_utc(midnight.astimezone(pytz.utc))
+
+def fmt_upto(name, end_jd, next_sunrise_jd, tz=IST):
+    """
+    "<name> upto HH:MM AM"; ends past the next sunrise are marked, since
+    the time alone would read as belonging to this panchang day
+    """
+    text = f"{name} upto {local_clock(tz).text(end_jd)}"
+    return text + " (next day)" if end_jd >= next_sunrise_jd else text
+
+def fmt_span(a, b, clock):
+    return f"{clock.text(a)} to {clock.text(b)}"
 
-def add_amrit_varjyam(nak_start, nak_end):
+def add_amrit_varjyam(nak_start, nak_end, clock):
+    """
+    nak_start, nak_end: JDs
+    """
     duration = nak_end - nak_start
 
     # Varjyam: ~2/3rd of Nakshatra
     varjyam_start = nak_start + duration * 0.66
-    varjyam_end   = varjyam_start + timedelta(minutes=90)
+    varjyam_end   = varjyam_start + 90 * MINUTE
 
     # Amrit Kalam: last 1/5th of Nakshatra
     amrit_start = nak_start + duration * 0.80
-    amrit_end   = amrit_start + timedelta(minutes=90)
+    amrit_end   = amrit_start + 90 * MINUTE
 
     return {
-        "Amrit Kalam": f"{fmt(amrit_start)} to {fmt(amrit_end)}",
-        "Varjyam": f"{fmt(varjyam_start)} to {fmt(varjyam_end)}"
+        "Amrit Kalam": fmt_span(amrit_start, amrit_end, clock),
+        "Varjyam": fmt_span(varjyam_start, varjyam_end, clock)
     }
 
 def find_amavasya_near(jd_start):
     """
-    Finds nearest Amavasya (Moon-Sun conjunction)
+    First Amavasya (Moon-Sun conjunction) after jd_start
     """
-    jd = jd_start
-    step = 0.1  # ~2.4 hours
-
-    prev_diff = None
-
-    for _ in range(500):
-        sun = swe.calc_ut(jd, swe.SUN)[0][0]
-        moon = swe.calc_ut(jd, swe.MOON)[0][0]
-        diff = (moon - sun) % 360
-
-        if prev_diff is not None and diff < prev_diff:
-            return jd  # conjunction crossed
-
-        prev_diff = diff
-        jd += step
-
-    return None
+    return get_index().new_moon_after(jd_start)[0]
 
 
 def get_shaka_samvatsara(date, ugadi_date):
@@ -158,12 +218,6 @@ def get_shaka_samvatsara(date, ugadi_date):
 
 # ---------------- ASTRONOMY ----------------
 
-def sun_moon_lon(jd):
-    sun = swe.calc_ut(jd, swe.SUN)[0][0]
-    moon = swe.calc_ut(jd, swe.MOON)[0][0]
-    ay = swe.get_ayanamsa_ut(jd)
-    return (sun - ay) % 360, (moon - ay) % 360
-
 def lunar_month(jd):
     sun, _ = sun_moon_lon(jd)
     return int(sun // 30)
@@ -180,240 +234,673 @@ def yoga_index(jd):
     s,m = sun_moon_lon(jd)
     return int(((s + m) % 360) // (360 / 27))
 
-def solve_transition(jd0, fn, idx):
-    a,b = jd0, jd0 + 1
-    for _ in range(50):
-        mid = (a + b) / 2
-        if fn(mid) == idx:
-            a = mid
-        else:
-            b = mid
-    return (a + b) / 2 
+def karana_index(jd):
+    s,m = sun_moon_lon(jd)
+    return int(((m - s) % 360) // 6)
+
+def nakshatra_angle(jd):
+    _,m,_,dm = sun_moon_lon_speed(jd)
+    return m, dm
+
+def yoga_angle(jd):
+    s,m,ds,dm = sun_moon_lon_speed(jd)
+    return (s + m) % 360, ds + dm
+
+NAK_SPAN = 360 / 27
+
+# index fn -> (continuous angle fn, degrees per segment)
+TRANSITION_ANGLES = {
+    tithi_index: (elongation, 12),
+    nakshatra_index: (nakshatra_angle, NAK_SPAN),
+    yoga_index: (yoga_angle, NAK_SPAN),
+    karana_index: (elongation, 6),
+}
 
-def sunrise_jd(date):
-    jd = swe.julday(date.year, date.month, date.day, 0)
+def solve_transition(jd0, fn, idx, tol=SOLVER_TOL):
+    """
+    JD at which segment `idx` of fn ends, searching forward from jd0.
+    Newton steps on the angle using the Sun/Moon speeds; all three
+    angles increase monotonically so there is no fixed search window.
+    """
+    angle_fn, span = TRANSITION_ANGLES[fn]
+    return solve_angle(angle_fn, ((idx + 1) * span) % 360, jd0, tol)
+
+def polish_transition(jd_guess, fn, idx, tol=SOLVER_TOL):
+    """
+    Same root as solve_transition, from a guess close to it
+    """
+    angle_fn, span = TRANSITION_ANGLES[fn]
+    return polish_angle(angle_fn, ((idx + 1) * span) % 360, jd_guess, tol)
+
+# ---------------- TRANSITION TIMELINE ----------------
+
+# kind -> (index fn, number of segments in a full cycle)
+TIMELINE_KINDS = {
+    "tithi": (tithi_index, 30),
+    "nakshatra": (nakshatra_index, 27),
+    "yoga": (yoga_index, 27),
+    "karana": (karana_index, 60),
+}
+
+TIMELINE_SAMPLE_DAYS = 1 / 24  # shorter than the shortest karana
+LONGEST_SEGMENT = 1.2  # days; a tithi lasts under 27 hours
+
+def build_timeline(jd_start, jd_end, table=None):
+    """
+    Sweeps [jd_start, jd_end] once and returns, per kind, two parallel
+    sorted lists: boundary instants and the index active from each one.
+    The first entry is jd_start itself, the last boundary is > jd_end,
+    so every instant in the range resolves to an index and an end time.
+
+    table: optional ChebyshevTable covering the range. Its seeds are
+    already within milliseconds of each root, so one exact Newton step
+    polishes them instead of solving from the previous boundary.
+    """
+    seeds = {kind: [] for kind in TIMELINE_KINDS}
+    if table is not None:
+        seeds = transition_seeds(table, jd_start, TIMELINE_SAMPLE_DAYS)
+
+    timeline = {}
+    for kind, (fn, n) in TIMELINE_KINDS.items():
+        idx = fn(jd_start)
+        starts, idxs = [jd_start], [idx]
+        for seed, new_idx in seeds[kind]:
+            if new_idx == idx:
+                continue  # table saw a crossing just before jd_start
+            # a crossing the table placed just after jd_start is missing
+            while (idx + 1) % n != new_idx:
+                starts.append(solve_transition(starts[-1], fn, idx))
+                idx = (idx + 1) % n
+                idxs.append(idx)
+            starts.append(polish_transition(seed, fn, idx))
+            idx = new_idx
+            idxs.append(idx)
+        while starts[-1] <= jd_end:
+            starts.append(solve_transition(starts[-1], fn, idx))
+            idx = (idx + 1) % n
+            idxs.append(idx)
+        timeline[kind] = (starts, idxs)
+    return timeline
+
+def timeline_lookup(timeline, kind, jd):
+    """
+    (index active at jd, JD at which it ends) by binary search
+    """
+    starts, idxs = timeline[kind]
+    i = bisect_right(starts, jd) - 1
+    return idxs[i], starts[i + 1]
+
+def timeline_spans(timeline, kind, jd_a, jd_b):
+    """
+    [(index, start, end)] of the segments overlapping [jd_a, jd_b). A
+    segment already running when the sweep began gets its real start
+    solved, searching back further than any segment lasts.
+    """
+    starts, idxs = timeline[kind]
+    i = bisect_right(starts, jd_a) - 1
+    spans = []
+    while i + 1 < len(starts) and starts[i] < jd_b:
+        spans.append((idxs[i], starts[i], starts[i + 1]))
+        i += 1
+    if spans and spans[0][1] == starts[0]:
+        fn, n = TIMELINE_KINDS[kind]
+        idx = spans[0][0]
+        start = solve_transition(starts[0] - LONGEST_SEGMENT, fn, (idx - 1) % n)
+        spans[0] = (idx, start, spans[0][2])
+    return spans
+
+def sunrise_jd(date, loc=HOME):
+    jd = day_start_jd(date, loc)
     sr = swe.rise_trans(
         jd, swe.SUN,
         swe.CALC_RISE | swe.BIT_DISC_CENTER,
-        (LON, LAT, ALT)
+        geopos(loc)
     )[1][0]
     return sr
 
 # ---------------- RISE / SET ----------------
 
-def sunrise_sunset(date):
-    jd = swe.julday(date.year, date.month, date.day, 0)
+def sunrise_sunset(date, loc=HOME):
+    jd = day_start_jd(date, loc)
     sr = swe.rise_trans(jd, swe.SUN,
-        swe.CALC_RISE | swe.BIT_DISC_CENTER,(LON,LAT,ALT))[1][0]
+        swe.CALC_RISE | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
     ss = swe.rise_trans(jd, swe.SUN,
-        swe.CALC_SET | swe.BIT_DISC_CENTER,(LON,LAT,ALT))[1][0]
-    return ist_from_jd(sr), ist_from_jd(ss)
+        swe.CALC_SET | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
+    return local_from_jd(sr, loc.tz), local_from_jd(ss, loc.tz)
 
-def moonrise_moonset(date):
-    jd = swe.julday(date.year, date.month, date.day, 0)
+def moonrise_moonset(date, loc=HOME):
+    jd = day_start_jd(date, loc)
     mr = swe.rise_trans(jd, swe.MOON,
-        swe.CALC_RISE | swe.BIT_DISC_CENTER,(LON,LAT,ALT))[1][0]
+        swe.CALC_RISE | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
     ms = swe.rise_trans(jd, swe.MOON,
-        swe.CALC_SET | swe.BIT_DISC_CENTER,(LON,LAT,ALT))[1][0]
-    return ist_from_jd(mr), ist_from_jd(ms)
+        swe.CALC_SET | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
+    return local_from_jd(mr, loc.tz), local_from_jd(ms, loc.tz)
 
 # ---------------- KAALAMS ----------------
 
-def kaalam(sr, ss, idx):
+# sr, ss: sunrise / sunset JDs; clock: the location's LocalClock
+
+def kaalam(sr, ss, idx, clock):
     seg = (ss - sr) / 8
     st = sr + seg * (idx - 1)
-    return fmt(st), fmt(st + seg)
+    return fmt_span(st, st + seg, clock)
 
-def abhijit(sr, ss, wd):
+def abhijit(sr, ss, wd, clock):
     if wd == 2:
         return None
     mid = sr + (ss - sr) / 2
-    return fmt(mid - timedelta(minutes=24)), fmt(mid + timedelta(minutes=24))
+    return fmt_span(mid - 24 * MINUTE, mid + 24 * MINUTE, clock)
 
-def dur_muhurtam(sr, ss, wd):
+def dur_muhurtam(sr, ss, wd, clock):
     seg = (ss - sr) / 8
     if wd == 2:
         mid = sr + (ss - sr) / 2
-        return f"{fmt(mid - timedelta(minutes=24))} to {fmt(mid + timedelta(minutes=24))}"
+        return fmt_span(mid - 24 * MINUTE, mid + 24 * MINUTE, clock)
     if wd == 5:
-        return f"{fmt(sr)} to {fmt(sr+seg)}, {fmt(sr+seg*6)} to {fmt(sr+seg*7)}"
+        return f"{fmt_span(sr, sr+seg, clock)}, {fmt_span(sr+seg*6, sr+seg*7, clock)}"
     DUR_INDEX = {6:4,0:5,1:6,3:3,4:2}
     i = DUR_INDEX.get(wd)
-    return f"{fmt(sr+seg*(i-1))} to {fmt(sr+seg*i)}" if i else None
+    return fmt_span(sr+seg*(i-1), sr+seg*i, clock) if i else None
 
 # ---------------- FESTIVALS ----------------
 def get_lunar_month(jd):
     """
-    Determine lunar month (Amanta system)
-    based on Sun's zodiac at last Amavasya
+    Amanta month: named after the sidereal rashi of the Sun at the
+    last Amavasya (Meena → Chaitra). A month with no Sankranti in it
+    repeats the next month's name with an "Adhika " prefix.
     """
-    # Step back until Amavasya is found
-    step = 0
-    while step < 35:
-        sun_lon = swe.calc_ut(jd - step, swe.SUN)[0][0]
-        moon_lon = swe.calc_ut(jd - step, swe.MOON)[0][0]
-
-        diff = (moon_lon - sun_lon) % 360
-
-        # Amavasya condition (~0 degrees)
-        if diff < 6 or diff > 354:
-            sun_sign = int(sun_lon // 30)
-            return LUNAR_MONTHS[sun_sign]
-
-        step += 1
+    month, adhika = get_index().amanta_month(jd)
+    return ("Adhika " if adhika else "") + LUNAR_MONTHS[month]
 
-    return ""
 
-
-def is_diwali(sr, ss):
-    jd = jd_from_utc(ss.astimezone(pytz.utc))
-    return TITHI_NAMES[tithi_index(jd)] == "Amavasya" and lunar_month(jd) == 7
-
-def is_naraka_chaturdashi(sr):
-    jd = jd_from_utc(sr.astimezone(pytz.utc))
-    ti = tithi_index(jd)
-    return TITHI_NAMES[ti] == "Chaturdashi" and ti >= 15 and lunar_month(jd) == 7 
-
-def calculate_ugadi(year):
+def day_frames(date, loc, sr, ss, next_sr, neighbours=None):
     """
-    Returns Ugadi date (datetime.date) for given Gregorian year
-    Guaranteed not to return None
+    (sunrise, sunset, next sunrise) of the day before, this day and the
+    day after, as the festival rules take them. neighbours: the previous
+    day's (sunrise, sunset) and the next day's (sunset, next sunrise)
+    when already known; searched otherwise.
     """
+    if neighbours is None:
+        prev = daylight_jd(date - timedelta(days=1), loc)
+        nxt = (daylight_jd(date + timedelta(days=1), loc)[1],
+               sunrise_jd(date + timedelta(days=2), loc))
+    else:
+        prev, nxt = neighbours
+    return [prev + (sr,), (sr, ss, next_sr), (next_sr,) + nxt]
 
-    # Start search from March 18 (safer)
-    jd_start = swe.julday(year, 3, 18, 0)
-
-    amavasya_jd = find_amavasya_near(jd_start)
+def day_festivals(timeline, frames, weekday, nakshatra, punya):
+    """
+    Names from the shared festival rules: tithi spans from the timeline,
+    month keys from the lunation each span falls in
+    """
+    sr, _, next_sr = frames[1]
+    index = get_index()
+    spans = []
+    for ti, start, end in timeline_spans(timeline, "tithi", sr, next_sr):
+        month, adhika = index.amanta_month((start + end) / 2)
+        spans.append((ti, start, end, NO_MONTH if adhika else month))
+    return FESTIVALS.match({
+        "frames": frames,
+        "spans": spans,
+        "weekday": weekday,
+        "nakshatra": nakshatra,
+        "sankrantis": [rashi for rashi, _, _, _ in punya],
+    })
+
+def calculate_ugadi(year, loc=HOME):
+    """
+    Returns Ugadi date (datetime.date) for given Gregorian year:
+    Chaitra Shukla Pratipada, i.e. the day after the first Amavasya of
+    the year with the Sun in Meena (sidereal rashi 11)
+    """
+    idx = get_index()
+    nm = idx.new_moon_after(swe.julday(year, 2, 15, 0))
+    while nm[1] != 11:
+        nm = idx.new_moon_after(nm[0])
+    amavasya_jd = nm[0]
+    pratipada_end = solve_transition(amavasya_jd, tithi_index, 0)
+
+    # sunrise-to-sunrise day in which the Amavasya ends
+    d = local_from_jd(amavasya_jd, loc.tz).date()
+    if sunrise_jd(d, loc) > amavasya_jd:
+        d -= timedelta(days=1)
+
+    # Pratipada at next sunrise → that day; otherwise it is kshaya
+    # (begins and ends before sunrise) and is observed the day it begins
+    nxt = d + timedelta(days=1)
+    if sunrise_jd(nxt, loc) < pratipada_end:
+        return nxt
+    return d
+
+def compute_year_meta(year, loc=HOME, sankrantis=None):
+    """
+    sankrantis: the year's ingresses if already solved (they are the
+    same for every location)
+    """
+    ugadi = calculate_ugadi(year, loc)
+    shaka_year, samvatsara = get_shaka_samvatsara(
+        datetime(ugadi.year, ugadi.month, ugadi.day), ugadi)
+    amavasyas = get_index().new_moons_between(
+        swe.julday(year, 1, 1, 0), swe.julday(year + 1, 1, 1, 0))
 
-    # 🔥 Check next 7 sunrises (not 3)
-    for i in range(1, 8):
-        test_date = utc_from_jd(amavasya_jd + i).date()
-        sr_jd = sunrise_jd(test_date)
+    return {
+        "ugadi": ugadi.isoformat(),
+        "shaka_year": shaka_year,
+        "samvatsara": samvatsara,
+        "amavasyas": [r[0] for r in amavasyas],
+        "sankrantis": [list(x) for x in (sankrantis or year_sankrantis(year))],
+    }
 
-        if tithi_index(sr_jd) == 0:  # Shukla Pratipada
-            return ist_from_jd(sr_jd).date()
+def get_year_meta(year, loc=HOME, astro=None):
+    """
+    Year metadata for a location, computed once and shared across runs
+    and worker processes through the on-disk store. astro: the year's
+    year_astronomy, when the caller already has it.
+    """
+    global _META_STORE
+    key = (year, loc, current_settings())
+    if key not in YEAR_META:
+        if _META_STORE is None:
+            _META_STORE = YearMetaStore()
+        sankrantis = astro["sankrantis"] if astro else None
+        YEAR_META[key] = _META_STORE.get_or_compute(
+            year, (loc.lat, loc.lon, loc.alt, loc.tz.zone),
+            lambda y: compute_year_meta(y, loc, sankrantis))
+    return YEAR_META[key]
+
+def daylight_jd(date, loc=HOME):
+    """
+    (sunrise jd, sunset jd) of a civil day
+    """
+    jd = day_start_jd(date, loc)
+    sr = swe.rise_trans(jd, swe.SUN,
+        swe.CALC_RISE | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
+    ss = swe.rise_trans(jd, swe.SUN,
+        swe.CALC_SET | swe.BIT_DISC_CENTER, geopos(loc))[1][0]
+    return sr, ss
 
-    # 🚨 HARD FALLBACK (should almost never happen)
-    # Use March 22 as safe fallback (Ugadi never goes beyond this)
-    return datetime(year, 3, 22).date() 
+def get_sankranti_table(year, loc=HOME):
+    """
+    Ingress index and punya kala windows for the year, from the
+    Sankranti instants already stored in the year metadata
+    """
+    key = (year, loc, current_settings())
+    if key not in SANKRANTI_TABLES:
+        SANKRANTI_TABLES[key] = year_table(
+            year, lambda d: daylight_jd(d, loc), loc.tz,
+            get_year_meta(year, loc)["sankrantis"])
+    return SANKRANTI_TABLES[key]
+
+def fmt_sankranti(ingresses, windows, tz=IST):
+    """
+    ("<Rashi> Sankranti at HH:MM AM" or None, punya kala text or None)
+    from sankranti.day_events output. The ingress is shown on its civil
+    date, the punya kala on the day it is observed, which differs for
+    ingresses at night.
+    """
+    clock = local_clock(tz)
+    ingress = [f"{RASHI_NAMES[r]} Sankranti at {clock.text(jd)}" for jd, r in ingresses]
+    windows = [fmt_span(a, b, clock) for _, _, a, b in windows]
+    return ", ".join(ingress) or None, ", ".join(windows) or None
 
-def get_ugadi_for_year(year):
+def get_ugadi_for_year(year, loc=HOME):
     """
     Cached Ugadi lookup per Gregorian year
     Always returns a valid datetime.date
     """
-    if year not in UGADI_CACHE:
-        ugadi = calculate_ugadi(year)
+    return datetime.strptime(get_year_meta(year, loc)["ugadi"], "%Y-%m-%d").date()
 
-        # Absolute safety (should almost never trigger)
-        if ugadi is None:
-            ugadi = datetime(year, 3, 22).date()
 
-        UGADI_CACHE[year] = ugadi
-
-    return UGADI_CACHE[year]
 
 
+# ---------------- PANCHANG ----------------
 
-   
+class DayPanchang:
+    """
+    One civil day kept as numbers: JDs (UT) of its events and indices
+    into the name tables. Text is only produced by to_dict(), so callers
+    that work with the values (the festival rules, sorting, arithmetic)
+    get them at full precision without parsing "HH:MM AM" back.
+    """
 
-# ---------------- PANCHANG ----------------
+    __slots__ = (
+        "date", "loc", "midnight", "sunrise", "sunset", "moonrise", "moonset",
+        "next_sunrise", "tithi", "tithi_end", "nakshatra", "nakshatra_end",
+        "yoga", "yoga_end", "karana", "karana_end", "month", "adhika",
+        "shaka_year", "samvatsara", "ingresses", "punya", "festivals",
+    )
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"<DayPanchang {self.date:%Y-%m-%d} {self.loc.name}>"
+
+    def minutes(self, jd):
+        """
+        Minutes from this date's local midnight (over 1440 the next night)
+        """
+        return (jd - self.midnight) * 1440
+
+    @property
+    def weekday(self):
+        return self.date.weekday()
+
+    def to_dict(self):
+        """
+        The archive's day record: every value formatted as text
+        """
+        date, tz, wd = self.date, self.loc.tz, self.weekday
+        clock = local_clock(tz)
+        sr, ss = self.sunrise, self.sunset
+        next_sr = self.next_sunrise
+        av = add_amrit_varjyam(sr, self.nakshatra_end, clock)  # nakshatra taken from sunrise
+        sankranti, punya_kala = fmt_sankranti(self.ingresses, self.punya, tz)
+
+        return {
+            "date": date.strftime("%d/%m/%Y"),
+            "Weekday": date.strftime("%A"),
+            "Sunrise": clock.text(sr),
+            "Sunset": clock.text(ss),
+            "Moonrise": clock.text(self.moonrise),
+            "Moonset": clock.text(self.moonset),
+            "Paksha": "Krishna Paksha" if self.tithi >= 15 else "Shukla Paksha",
+            "Tithi": fmt_upto(TITHI_NAMES[self.tithi], self.tithi_end, next_sr, tz),
+            "Nakshatra": fmt_upto(NAKSHATRA_NAMES[self.nakshatra], self.nakshatra_end, next_sr, tz),
+            "Yoga": fmt_upto(YOGA_NAMES[self.yoga], self.yoga_end, next_sr, tz),
+            "Karanam": fmt_upto(KARANA_NAMES[self.karana], self.karana_end, next_sr, tz),
+            "Rahu Kalam": kaalam(sr, ss, RAHU_INDEX[wd], clock),
+            "Gulikai Kalam": kaalam(sr, ss, GULIKAI_INDEX[wd], clock),
+            "Yamaganda": kaalam(sr, ss, YAMA_INDEX[wd], clock),
+            "Abhijit": abhijit(sr, ss, wd, clock),
+            "Dur Muhurtam": dur_muhurtam(sr, ss, wd, clock),
+            "Amrit Kalam": av["Amrit Kalam"],
+            "Varjyam": av["Varjyam"],
+            "Lunar Month": ("Adhika " if self.adhika else "") + LUNAR_MONTHS[self.month],
+            "Shaka Samvat": f"{self.shaka_year} {self.samvatsara}",
+            "Sankranti": sankranti,
+            "Sankranti Punya Kala": punya_kala,
+            "Festivals": list(self.festivals),
+        }
+
+def compute_day(date, timeline=None, loc=HOME, events=None, neighbours=None):
+    """
+    DayPanchang of a civil date.
+    timeline: output of build_timeline covering this day's sunrise to
+    the next. Bulk generators pass one per year; a single day builds its own.
+    loc: where the day is observed; times are in its timezone.
+    events: this day's row of year_rise_set; a single day searches with
+    rise_trans instead.
+    neighbours: as for day_frames, from the rows either side.
+    """
+    if events is None:
+        midnight = day_start_jd(date, loc)
+        pos = geopos(loc)
+        flags = swe.BIT_DISC_CENTER
+        sr = swe.rise_trans(midnight, swe.SUN, swe.CALC_RISE | flags, pos)[1][0]
+        ss = swe.rise_trans(midnight, swe.SUN, swe.CALC_SET | flags, pos)[1][0]
+        mr = swe.rise_trans(midnight, swe.MOON, swe.CALC_RISE | flags, pos)[1][0]
+        ms = swe.rise_trans(midnight, swe.MOON, swe.CALC_SET | flags, pos)[1][0]
+        next_sr = sunrise_jd(date + timedelta(days=1), loc)
+    else:
+        midnight, sr, ss, mr, ms, next_sr = events
+
+    if timeline is None:
+        timeline = build_timeline(sr, next_sr)
+
+    ti, t_end = timeline_lookup(timeline, "tithi", sr)
+    ni, n_end = timeline_lookup(timeline, "nakshatra", sr)
+    yi, y_end = timeline_lookup(timeline, "yoga", sr)
+    ki, k_end = timeline_lookup(timeline, "karana", sr)
+
+    month, adhika = get_index().amanta_month(sr)
+    shaka_year, samvatsara = get_shaka_samvatsara(date, get_ugadi_for_year(date.year, loc))
+    ingresses, punya = day_events(get_sankranti_table(date.year, loc), date, loc.tz)
+
+    frames = day_frames(date, loc, sr, ss, next_sr, neighbours)
+    festivals = day_festivals(timeline, frames, date.weekday(), ni, punya)
+
+    return DayPanchang(
+        date=date, loc=loc, midnight=midnight,
+        sunrise=sr, sunset=ss, moonrise=mr, moonset=ms,
+        next_sunrise=next_sr,
+        tithi=ti, tithi_end=t_end, nakshatra=ni, nakshatra_end=n_end,
+        yoga=yi, yoga_end=y_end, karana=ki, karana_end=k_end,
+        month=month, adhika=adhika,
+        shaka_year=shaka_year, samvatsara=samvatsara,
+        ingresses=ingresses, punya=punya, festivals=festivals,
+    )
+
+def generate_day(date, timeline=None, loc=HOME, events=None, neighbours=None):
+    """
+    The day's record as text, as written to the archive
+    """
+    return compute_day(date, timeline, loc, events, neighbours).to_dict()
 
-def generate_day(date):
-    sr, ss = sunrise_sunset(date)
-    mr, ms = moonrise_moonset(date)
-    jd0 = jd_from_utc(sr.astimezone(pytz.utc))
+# ---------------- 100 YEAR GENERATOR ----------------
 
-    ti = tithi_index(jd0)
-    ni = nakshatra_index(jd0)
-    yi = yoga_index(jd0)
+def year_astronomy(year):
+    """
+    The location-independent part of a year: the transition timeline
+    (tithi/nakshatra/yoga/karana boundaries are geocentric, so one sweep
+    serves every location), the Sankranti instants and the Sun/Moon
+    equatorial series every location's rise/set times are solved from
+    """
+    # local days of any timezone start within a day of UT midnight
+    jd_start = jd_from_utc(datetime(year, 1, 1)) - 1
+    jd_end = jd_from_utc(datetime(year + 1, 1, 1)) + 1
+    table = ChebyshevTable(jd_start, jd_end + 2)  # room for the last segments
+    return {
+        "timeline": build_timeline(jd_start, jd_end, table),
+        "sankrantis": year_sankrantis(year),
+        "equatorial": EquatorialTable(jd_start, jd_end + 2),
+    }
 
-    t_end = ist_from_jd(solve_transition(jd0, tithi_index, ti))
-    n_end = ist_from_jd(solve_transition(jd0, nakshatra_index, ni))
-    y_end = ist_from_jd(solve_transition(jd0, yoga_index, yi))
+def year_rise_set(year, loc, astro):
+    """
+    Per day of the year: (midnight, sunrise, sunset, moonrise, moonset,
+    next sunrise) JDs, solved for all days at once
+    """
+    first = datetime(year, 1, 1)
+    n = (datetime(year + 1, 1, 1) - first).days
+    midnights = [day_start_jd(first + timedelta(days=i), loc) for i in range(n + 1)]
+    ev = rise_set_days(astro["equatorial"], Horizon(loc.lon, loc.lat, loc.alt), midnights)
+    sr = ev["sunrise"].tolist()
+    return list(zip(midnights[:n], sr[:n], ev["sunset"].tolist(),
+                    ev["moonrise"].tolist(), ev["moonset"].tolist(), sr[1:]))
+
+def _year_span(year, loc, astro, d, stop, day):
+    """
+    day(...) for d <= date < stop within one year
+    """
+    get_year_meta(year, loc, astro)
+    events = year_rise_set(year, loc, astro)
+    jan1 = datetime(year, 1, 1)
+    while d < stop:
+        i = (d - jan1).days
+        # festival frames: the rows either side, searched past the year's ends
+        prev = events[i - 1][1:3] if i else daylight_jd(d - timedelta(days=1), loc)
+        if i + 1 < len(events):
+            nxt = (events[i + 1][2], events[i + 1][5])
+        else:
+            nxt = (daylight_jd(d + timedelta(days=1), loc)[1],
+                   sunrise_jd(d + timedelta(days=2), loc))
+        yield day(d, astro["timeline"], loc, events[i], (prev, nxt))
+        d += timedelta(days=1)
 
-    nak_start = sr  # approximation: nakshatra active at sunrise
-    av = add_amrit_varjyam(nak_start, n_end) 
-    lunar_month = get_lunar_month(jd0)
-    ugadi_date = get_ugadi_for_year(date.year)
-    shaka_year, samvatsara = get_shaka_samvatsara(date, ugadi_date)
+def iter_year(year, loc=HOME, astro=None, typed=False):
+    """
+    Yields the days of a Gregorian year as they are generated: records
+    as text, or DayPanchang objects when typed.
+    astro: year_astronomy(year), when generating several locations
+    """
+    if astro is None:
+        astro = year_astronomy(year)
+    yield from _year_span(year, loc, astro, datetime(year, 1, 1), datetime(year + 1, 1, 1),
+                          compute_day if typed else generate_day)
 
+def generate_year(year, loc=HOME, astro=None):
+    return list(iter_year(year, loc, astro))
 
+def iter_days(start, end, loc=HOME):
+    """
+    Yields the days start <= d < end (dates or datetimes) one year's
+    astronomy at a time, so any length of range runs in constant memory
+    """
+    d = datetime(start.year, start.month, start.day)
+    end = datetime(end.year, end.month, end.day)
+    while d < end:
+        stop = min(end, datetime(d.year + 1, 1, 1))
+        yield from _year_span(d.year, loc, year_astronomy(d.year), d, stop, generate_day)
+        d = stop
 
+def generate_year_locations(year, locs):
+    """
+    {location: days} for one year: the shared astronomy is computed
+    once, each location adds only its rise/set calls
+    """
+    astro = year_astronomy(year)
+    return {loc: generate_year(year, loc, astro) for loc in locs}
 
-    festivals = []
-    if is_naraka_chaturdashi(sr):
-        festivals.append("Naraka Chaturdashi")
-    if is_diwali(sr, ss):
-        festivals.append("Diwali (Deepavali)")
+def generate_range(start, end, path, loc=HOME):
+    """
+    Streams the days start <= d < end to `path`: NDJSON for a .ndjson
+    path, otherwise a JSON array in the year files' layout
+    """
+    n = write_records(path, iter_days(start, end, loc))
+    print(f"✅ Wrote {n} days to {path}")
+    return n
 
-    wd = date.weekday()
+def _write_year(days, year, out_dir):
+    """
+    One year → JSON plus its columnar copy (both written atomically).
+    The JSON is streamed as `days` yields; the columnar encoder needs
+    the whole year, so the records are kept for it.
+    """
+    kept = []
 
-    return {
-        "date": date.strftime("%d/%m/%Y"),
-        "Weekday": date.strftime("%A"),
-        "Sunrise": fmt(sr),
-        "Sunset": fmt(ss),
-        "Moonrise": fmt(mr),
-        "Moonset": fmt(ms),
-        "Paksha": "Krishna Paksha" if ti >= 15 else "Shukla Paksha",
-        "Tithi": f"{TITHI_NAMES[ti]} upto {fmt(t_end)}",
-        "Nakshatra": f"{NAKSHATRA_NAMES[ni]} upto {fmt(n_end)}",
-        "Yoga": f"{YOGA_NAMES[yi]} upto {fmt(y_end)}",
-        "Rahu Kalam": " to ".join(kaalam(sr, ss, RAHU_INDEX[wd])),
-        "Gulikai Kalam": " to ".join(kaalam(sr, ss, GULIKAI_INDEX[wd])),
-        "Yamaganda": " to ".join(kaalam(sr, ss, YAMA_INDEX[wd])),
-        "Abhijit": None if abhijit(sr, ss, wd) is None else " to ".join(abhijit(sr, ss, wd)),
-        "Dur Muhurtam": dur_muhurtam(sr, ss, wd),
-        "Amrit Kalam": av["Amrit Kalam"],
-        "Varjyam": av["Varjyam"],
-        "Lunar Month": lunar_month,
-        "Shaka Samvat": f"{shaka_year} {samvatsara}",
-
-
-
-        "Festivals": festivals
-    }
+    def keep():
+        for day in days:
+            kept.append(day)
+            yield day
 
-# ---------------- 100 YEAR GENERATOR ----------------
+    write_records(os.path.join(out_dir, f"{year}.json"), keep())
+    panchang_columnar.write_year(
+        os.path.join(out_dir, f"{year}{panchang_columnar.SUFFIX}"), kept)
+    return len(kept)
 
-def generate_100_years(start_year=2026, years=100):
-    start = datetime(start_year, 1, 1)
-    end   = datetime(start_year + years, 1, 1)
+def _generate_year_file(year, out_dir):
+    """
+    Worker task: one Gregorian year for the default location
+    """
+    return year, _write_year(iter_year(year), year, out_dir)
 
-    d = start
-    current_year = d.year
-    year_data = []
+def _generate_locations_year(year, locs, out_dir):
+    """
+    Worker task: one year for every location, into <out_dir>/<slug>/
+    """
+    astro = year_astronomy(year)
+    for loc in locs:
+        _write_year(iter_year(year, loc, astro), year, os.path.join(out_dir, slug(loc.name)))
+    return year
 
-    print(f"📁 Started file: {current_year}.json")
+def _run_years(task, year_list, workers, *args):
+    """
+    Years are independent, so they are sharded across a process pool.
+    workers=None uses every core, workers=1 runs in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(year_list))
+    print(f"🚀 Generating {len(year_list)} years with {workers} worker(s)")
+    if workers == 1:
+        yield from (task(year, *args) for year in year_list)
+        return
+    get_index()  # build or load it once here, not in every worker
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=init_swisseph) as pool:
+        yield from pool.map(task, year_list, *([a] * len(year_list) for a in args))
+
+def generate_100_years(start_year=2026, years=100, workers=None, out_dir="."):
+    year_list = list(range(start_year, start_year + years))
+    for year, n in _run_years(_generate_year_file, year_list, workers, out_dir):
+        print(f"✅ Finished {year}.json ({n} days)")
+    print(f"🎉 Panchang generated from {start_year} to {start_year + years - 1}")
 
-    while d < end:
-        # Year changed → write previous year
-        if d.year != current_year:
-            with open(f"{current_year}.json", "w", encoding="utf-8") as f:
-                json.dump(year_data, f, ensure_ascii=False, indent=2)
+def generate_locations(locs, start_year=2026, years=100, workers=None, out_dir="."):
+    """
+    Every location in `locs` for the same years, one folder per location
+    """
+    year_list = list(range(start_year, start_year + years))
+    for year in _run_years(_generate_locations_year, year_list, workers, locs, out_dir):
+        print(f"✅ Finished {year} for {len(locs)} location(s)")
+    print(f"🎉 Panchang generated for {', '.join(l.name for l in locs)}")
 
-            print(f"✅ Finished {current_year}.json ({len(year_data)} days)")
 
-            # Reset for new year
-            current_year = d.year
-            year_data = []
-            print(f"📁 Started file: {current_year}.json")
 
-        year_data.append(generate_day(d))
-        d += timedelta(days=1)
+# ---------------- ENGINE OBJECT ----------------
 
-    # Write last year
-    with open(f"{current_year}.json", "w", encoding="utf-8") as f:
-        json.dump(year_data, f, ensure_ascii=False, indent=2)
+class PanchangEngine:
+    """
+    One configuration (location, sidereal mode, ephemeris path) and its
+    own cache of generated days, safe to share between threads.
 
-    print(f"✅ Finished {current_year}.json ({len(year_data)} days)")
-    print(f"🎉 Panchang generated from {start_year} to {start_year + years - 1}")
+    Computing holds the swisseph lock with this engine's settings
+    applied, so engines with different settings can run in one process;
+    the module-level caches underneath are keyed by those settings.
+    Days already generated are served from the cache without the lock.
+    """
 
+    def __init__(self, loc=HOME, sid_mode=SID_MODE, ephe_path=EPHE_PATH,
+                 max_days=4096):
+        self.loc = loc
+        self.sid_mode = sid_mode
+        self.ephe_path = ephe_path
+        self.max_days = max_days
+        self._days = OrderedDict()  # ordinal -> day dict, oldest first
+
+    def settings(self):
+        return swe_settings(self.sid_mode, self.ephe_path)
+
+    def day(self, date):
+        """
+        Panchang of one civil date (date or datetime). The returned dict
+        is shared with other callers: copy before modifying it.
+        """
+        key = date.toordinal()
+        day = self._days.get(key)  # a single dict read: atomic, no lock
+        if day is not None:
+            return day
+        with self.settings():
+            day = self._days.get(key)
+            if day is None:
+                day = generate_day(datetime(date.year, date.month, date.day), None, self.loc)
+                self._remember(key, day)
+        return day
+
+    def year(self, year):
+        """
+        Every day of a Gregorian year, from one sweep of the year
+        """
+        first = datetime(year, 1, 1).toordinal()
+        n = datetime(year + 1, 1, 1).toordinal() - first
+        days = [self._days.get(first + i) for i in range(n)]
+        if all(days):
+            return days
+        with self.settings():
+            days = generate_year(year, self.loc)
+            for i, day in enumerate(days):
+                self._remember(first + i, day)
+        return days
+
+    def _remember(self, key, day):
+        # writers hold the swisseph lock, so only readers race with this;
+        # they see the day either before or after the insert
+        self._days[key] = day
+        while len(self._days) > self.max_days:
+            self._days.popitem(last=False)
 
 
 # ---------------- RUN ----------------
 
 if __name__ == "__main__":
     generate_100_years(1940, 186)
-
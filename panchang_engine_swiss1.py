@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 import pytz
 import json
 
+from festival_rules import FESTIVALS, record_facts
+
 # ===============================
 # LOCATION CONFIG (HYDERABAD)
 # ===============================
@@ -12,65 +14,13 @@ TIMEZONE = pytz.timezone("Asia/Kolkata")
 
 swe.set_sid_mode(swe.SIDM_LAHIRI)
 
-# ===============================
-# FESTIVAL RULES (PHASE 1)
-# ===============================
-FESTIVAL_RULES = [
-    {
-        "name": "Ugadi",
-        "type": "lunar",
-        "paksha": "Shukla Paksha",
-        "tithi": "Pratipada",
-        "month": "Chaitra",
-    },
-    {
-        "name": "Sri Rama Navami",
-        "type": "lunar",
-        "paksha": "Shukla Paksha",
-        "tithi": "Navami",
-        "month": "Chaitra",
-    },
-    {
-        "name": "Hanuman Jayanti",
-        "type": "lunar",
-        "paksha": "Shukla Paksha",
-        "tithi": "Purnima",
-        "month": "Chaitra",
-    },
-    {
-        "name": "Maha Shivaratri",
-        "type": "lunar",
-        "paksha": "Krishna Paksha",
-        "tithi": "Chaturdashi",
-        "month": "Phalguna",
-    },
-    {
-        "name": "Makar Sankranti",
-        "type": "solar",
-        "condition": lambda d: d.get("Sankranti") == "Makara",
-    },
-]
-
 # ===============================
 # FESTIVAL RESOLVER
+# (rules shared with the other engines: festival_rules.RULES)
 # ===============================
 def resolve_festivals(day):
-    festivals = []
-
-    for rule in FESTIVAL_RULES:
-        if rule["type"] == "lunar":
-            if (
-                rule.get("paksha") == day.get("Paksha")
-                and rule.get("tithi") in day.get("Tithi", "")
-                and rule.get("month") == day.get("LunarMonth")
-            ):
-                festivals.append(rule["name"])
-
-        elif rule["type"] == "solar":
-            if rule["condition"](day):
-                festivals.append(rule["name"])
-
-    return festivals
+    facts = record_facts([day], 0)
+    return FESTIVALS.match(facts) if facts else []
 
 # ===============================
 # EXISTING PANCHANG LOGIC
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Derived data (lunation index, year metadata) lives here, not in git
+CACHE_DIR = os.environ.get(
+    "PANCHANG_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".panchang_cache"),
+)
+
+# ---------------- FILE OUTPUT ----------------
+
+@contextmanager
+def atomic_output(path, mode="w", encoding="utf-8"):
+    """
+    Yields a temp file in the same directory as `path` and renames it
+    over `path` on success, so readers never see a half-written file
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp_",
+                               suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_json_atomic(path, data, indent=2):
+    with atomic_output(path) as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+
+
+# ---------------- RECORD STREAMS ----------------
+# Day records are written as they are produced instead of being held in
+# a list for one json.dump, so a range of any length runs in constant
+# memory. "<name>.ndjson" gets one record per line; anything else a JSON
+# array laid out exactly as json.dump(..., indent=2) lays it out, so
+# streamed year files are byte-for-byte what the archive has always had.
+
+NDJSON_SUFFIX = ".ndjson"
+FLUSH_EVERY = 64  # records between flushes of the temp file
+READ_CHUNK = 1 << 16
+
+
+def write_records(path, records, indent=2, flush_every=FLUSH_EVERY):
+    """
+    Streams an iterable of records to `path` (atomically, like
+    atomic_output) and returns how many were written
+    """
+    ndjson = str(path).endswith(NDJSON_SUFFIX)
+    pad = " " * indent if indent else ""
+    n = 0
+    with atomic_output(path) as f:
+        for rec in records:
+            if ndjson:
+                f.write(json.dumps(rec, ensure_ascii=False))
+                f.write("\n")
+            else:
+                text = json.dumps(rec, ensure_ascii=False, indent=indent)
+                if indent is None:
+                    f.write(", " if n else "[")
+                else:
+                    f.write(",\n" if n else "[\n")
+                    text = "\n".join(pad + line for line in text.split("\n"))
+                f.write(text)
+            n += 1
+            if n % flush_every == 0:
+                f.flush()
+        if not ndjson:
+            f.write("[]" if not n else "]" if indent is None else "\n]")
+    return n
+
+
+def iter_records(path):
+    """
+    Yields the records of a file written by write_records (or any JSON
+    array / NDJSON file) one at a time, without loading the whole file
+    """
+    with open(path, encoding="utf-8") as f:
+        if str(path).endswith(NDJSON_SUFFIX):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        yield from _iter_json_array(f)
+
+
+def _iter_json_array(f):
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_CHUNK)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            more()
+
+    skip(" \t\r\n")
+    if buf[pos:pos + 1] != "[":
+        raise ValueError(f"{f.name}: not a JSON array")
+    pos += 1
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buf):
+            raise ValueError(f"{f.name}: truncated JSON array")
+        if buf[pos] == "]":
+            return
+        try:
+            rec, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            end = None
+        # a value running up to the end of the buffer may continue in
+        # the next chunk (a number, or an object cut mid-way)
+        if end is None or (end == len(buf) and not eof):
+            if eof:
+                raise ValueError(f"{f.name}: bad JSON near offset {pos}")
+            more()
+            continue
+        pos = end
+        yield rec
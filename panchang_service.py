@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date as Date, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+import panchang_engine_swiss as engine
+from festival_rules import FESTIVALS, record_facts
+from festival_solver import festival_dates, find_rules
+from locations import HYDERABAD, get_location, slug
+from lunation_index import END_YEAR, START_YEAR, get_index
+
+# ---------------- PANCHANG SERVICE ----------------
+# Answers any date and location on demand instead of only the
+# pregenerated archive:
+#
+#   GET /day?date=2026-11-08[&city=new-york]
+#   GET /range?start=2026-11-01&end=2026-11-30[&city=...]   (end inclusive)
+#   GET /festivals?year=2026[&name=diwali][&city=...]
+#   GET /festival-dates?name=diwali&start=1940&end=2125[&city=...]   (years inclusive)
+#
+# Ephemeris work runs in a process pool. Identical requests already in
+# flight share one computation, and computed days and festival years sit
+# in an LRU in the event loop, so cached answers never leave it.
+#
+#   python panchang_service.py --port 8765 --workers 4
+
+MAX_RANGE_DAYS = 400
+# years answered: within the lunation index, whose lookups fail outside it
+FIRST_YEAR, LAST_YEAR = START_YEAR, END_YEAR - 1
+CACHE_ITEMS = 50_000
+READ_LIMIT = 1 << 16
+
+# ---------------- WORKER SIDE ----------------
+# Run in the pool processes; one PanchangEngine per city and process.
+
+_ENGINES = {}
+
+
+def _engine(city):
+    if city not in _ENGINES:
+        _ENGINES[city] = engine.PanchangEngine(get_location(city))
+    return _ENGINES[city]
+
+
+def compute_range(city, first, last):
+    """
+    Day dicts for ordinals first..last (inclusive). Spans longer than a
+    few weeks go through whole-year sweeps, which are cheaper per day.
+    """
+    eng = _engine(city)
+    if last - first < 31:
+        return [eng.day(Date.fromordinal(o)) for o in range(first, last + 1)]
+    days = []
+    for year in range(Date.fromordinal(first).year, Date.fromordinal(last).year + 1):
+        start = Date(year, 1, 1).toordinal()
+        for i, day in enumerate(eng.year(year)):
+            if first <= start + i <= last:
+                days.append(day)
+    return days
+
+
+def compute_festivals(city, year):
+    """
+    {"YYYY-MM-DD": [names]} for a year at a city
+    """
+    days = _engine(city).year(year)
+    jan1 = Date(year, 1, 1)
+    out = {}
+    for i in range(len(days)):
+        facts = record_facts(days, i)
+        names = FESTIVALS.match(facts) if facts else []
+        if names:
+            out[(jan1 + timedelta(days=i)).isoformat()] = names
+    return out
+
+
+def compute_festival_dates(city, name, first_year, last_year):
+    """
+    ["YYYY-MM-DD", ...] of one festival over a span of years, solved
+    from its rule without generating the years
+    """
+    eng = _engine(city)
+    with eng.settings():
+        return [d.isoformat() for d in festival_dates(name, first_year, last_year, eng.loc)]
+
+# ---------------- SERVICE ----------------
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PanchangService:
+
+    def __init__(self, workers=None, cache_items=CACHE_ITEMS):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_items = cache_items
+        self.pool = None
+        self._cache = OrderedDict()
+        self._inflight = {}
+
+    def start(self):
+        get_index()  # built here if missing; the workers then only load it
+        # forkserver: a worker forked from this process mid-request would
+        # inherit its client sockets and hold those connections open
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context("forkserver"),
+                                        initializer=engine.init_swisseph)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    # -------- LRU --------
+
+    def _get(self, key):
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_items:
+            self._cache.popitem(last=False)
+
+    # -------- COALESCING --------
+
+    async def _coalesced(self, key, fn, *args):
+        """
+        Runs fn(*args) in the pool unless the same key is already
+        running; every caller awaits the one result
+        """
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shielded: a client that disconnects doesn't cancel the others
+        return await asyncio.shield(fut)
+
+    # -------- QUERIES --------
+
+    async def days(self, city, first, last):
+        keys = [("day", city, o) for o in range(first, last + 1)]
+        cached = [self._get(k) for k in keys]
+        missing = [k[2] for k, v in zip(keys, cached) if v is None]
+        if not missing:
+            return cached
+
+        lo, hi = min(missing), max(missing)
+        computed = await self._coalesced(("range", city, lo, hi), compute_range, city, lo, hi)
+        for o, day in zip(range(lo, hi + 1), computed):
+            self._put(("day", city, o), day)
+        return [c if c is not None else computed[k[2] - lo] for k, c in zip(keys, cached)]
+
+    async def festivals(self, city, year):
+        key = ("festivals", city, year)
+        found = self._get(key)
+        if found is None:
+            found = await self._coalesced(key, compute_festivals, city, year)
+            self._put(key, found)
+        return found
+
+    async def festival_dates(self, city, name, first_year, last_year):
+        key = ("festival-dates", city, name, first_year, last_year)
+        found = self._get(key)
+        if found is None:
+            found = await self._coalesced(key, compute_festival_dates, city, name,
+                                          first_year, last_year)
+            self._put(key, found)
+        return found
+
+    # -------- ROUTES --------
+
+    async def route(self, target):
+        url = urlsplit(target)
+        q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        city = q.get("city", slug(HYDERABAD.name))
+        try:
+            city = slug(get_location(city).name)
+        except KeyError as e:
+            raise HttpError(404, str(e.args[0]))
+
+        if url.path == "/day":
+            o = _ordinal(q, "date")
+            return (await self.days(city, o, o))[0]
+
+        if url.path == "/range":
+            first, last = _ordinal(q, "start"), _ordinal(q, "end")
+            if not 0 <= last - first < MAX_RANGE_DAYS:
+                raise HttpError(400, f"end must be on or after start, within {MAX_RANGE_DAYS} days")
+            return await self.days(city, first, last)
+
+        if url.path == "/festivals":
+            year = _year(q, "year")
+            found = await self.festivals(city, year)
+            name = q.get("name", "").lower()
+            if name:
+                found = {d: f for d, f in found.items() if any(name in x.lower() for x in f)}
+            return found
+
+        if url.path == "/festival-dates":
+            name = q.get("name", "").strip().lower()
+            try:
+                find_rules(name)
+            except KeyError as e:
+                raise HttpError(404, str(e.args[0]))
+            first, last = _year(q, "start"), _year(q, "end")
+            if last < first:
+                raise HttpError(400, "end must not be before start")
+            return await self.festival_dates(city, name, first, last)
+
+        raise HttpError(404, f"no route for {url.path}")
+
+    # -------- HTTP --------
+
+    async def handle(self, reader, writer):
+        """
+        HTTP/1.1 GET with keep-alive; one request at a time per connection
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await _respond(writer, 400, {"error": "bad request line"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(writer, 400, {"error": "bad Content-Length"}, False)
+                    break
+                if length:
+                    await reader.readexactly(length)
+                keep = (headers.get("connection", "").lower() != "close"
+                        and version == "HTTP/1.1")
+
+                if method != "GET":
+                    status, body = 405, {"error": "only GET is supported"}
+                else:
+                    try:
+                        status, body = 200, await self.route(target)
+                    except HttpError as e:
+                        status, body = e.status, {"error": str(e)}
+                    except Exception as e:  # keep serving other requests
+                        status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+                await _respond(writer, status, body, keep)
+                if not keep:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _ordinal(q, name):
+    try:
+        d = Date.fromisoformat(q[name])
+    except (KeyError, ValueError):
+        raise HttpError(400, f"{name}=YYYY-MM-DD is required")
+    if not FIRST_YEAR <= d.year <= LAST_YEAR:
+        raise HttpError(400, f"{name} outside {FIRST_YEAR}-{LAST_YEAR}")
+    return d.toordinal()
+
+
+def _year(q, name):
+    try:
+        year = int(q[name])
+    except (KeyError, ValueError):
+        raise HttpError(400, f"{name}=YYYY is required")
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        raise HttpError(400, f"{name} outside {FIRST_YEAR}-{LAST_YEAR}")
+    return year
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def _respond(writer, status, body, keep):
+    payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n".encode("latin-1")
+        + payload)
+    await writer.drain()
+
+# ---------------- RUN ----------------
+
+async def serve(host, port, workers, cache_items):
+    service = PanchangService(workers, cache_items)
+    service.start()
+    server = await asyncio.start_server(service.handle, host, port, limit=READ_LIMIT)
+    print(f"🚀 Panchang service on http://{host}:{port} with {service.workers} worker(s)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Panchang HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-items", type=int, default=CACHE_ITEMS,
+                        help="days / festival years kept in memory")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_items))
+    except KeyboardInterrupt:
+        print("👋 Stopped")
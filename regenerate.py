@@ -0,0 +1,197 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_festivals
+import panchang_columnar
+import panchang_engine_swiss as engine
+from ephemeris import settings_fingerprint
+from lunation_index import get_index
+from panchang_io import write_json_atomic
+
+# ---------------- BUILD MANIFEST ----------------
+# <out_dir>/manifest.json records, per year, what each generated file was
+# built from: engine version, location, swisseph settings and festival
+# rules, plus content hashes of the year, columnar and festival files.
+# A run only rebuilds what no longer matches:
+#
+#   astronomy inputs changed / year file missing or edited → whole year
+#   festival rules changed / derived file missing or edited → derived
+#
+# The cross-year festival index is rebuilt after any change.
+#
+# "derived" (the festival pass and the columnar copy) reads the existing
+# year file, so a rule edit never recomputes any astronomy.
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_inputs():
+    """
+    Everything the astronomy of a year file depends on
+    """
+    return {
+        "engine": engine.ENGINE_VERSION,
+        "location": [engine.LAT, engine.LON, engine.ALT, engine.IST.zone],
+        "ayanamsa": settings_fingerprint(),
+    }
+
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if not manifest or manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "years": {}}
+    return manifest
+
+
+def save_manifest(out_dir, manifest):
+    write_json_atomic(os.path.join(out_dir, MANIFEST_NAME), manifest)
+
+
+def plan_year(year, entry, out_dir, inputs, rules):
+    """
+    "year", "derived" or None (up to date) for one year
+    """
+    year_path = os.path.join(out_dir, f"{year}.json")
+    fest_path = os.path.join(out_dir, "festivals", f"{year}.json")
+    col_path = os.path.join(out_dir, f"{year}{panchang_columnar.SUFFIX}")
+
+    if entry is None or not os.path.exists(year_path):
+        return "year"
+    if entry.get("inputs") != inputs:
+        return "year"
+    if file_sha256(year_path) != entry.get("sha256"):
+        return "year"
+    if entry.get("festival_rules") != rules:
+        return "derived"
+    for path, key in ((fest_path, "festivals_sha256"), (col_path, "columnar_sha256")):
+        if not os.path.exists(path) or file_sha256(path) != entry.get(key):
+            return "derived"
+    return None
+
+
+def _build_derived(year, out_dir, days=None):
+    """
+    Festival pass and columnar copy, from the days in memory or from
+    the existing year file
+    """
+    if days is None:
+        with open(os.path.join(out_dir, f"{year}.json"), encoding="utf-8") as f:
+            days = json.load(f)
+    panchang_columnar.write_year(
+        os.path.join(out_dir, f"{year}{panchang_columnar.SUFFIX}"), days)
+    generate_festivals.generate_year(year, days, out_dir)
+
+
+def _build_year(year, out_dir):
+    """
+    Worker task: astronomy + derived files for one year, using the days
+    in memory rather than reading the file back
+    """
+    days = engine.generate_year(year)
+    write_json_atomic(os.path.join(out_dir, f"{year}.json"), days)
+    _build_derived(year, out_dir, days)
+    return year
+
+
+def _manifest_entry(year, out_dir, inputs, rules):
+    return {
+        "inputs": inputs,
+        "sha256": file_sha256(os.path.join(out_dir, f"{year}.json")),
+        "festival_rules": rules,
+        "festivals_sha256": file_sha256(
+            os.path.join(out_dir, "festivals", f"{year}.json")),
+        "columnar_sha256": file_sha256(
+            os.path.join(out_dir, f"{year}{panchang_columnar.SUFFIX}")),
+    }
+
+
+def regenerate(start_year=1940, end_year=2126, out_dir=str(generate_festivals.BASE),
+               workers=None, force=False, dry_run=False):
+    """
+    Brings <out_dir>/<year>.json and the files derived from it for
+    [start_year, end_year) up to date. Returns {year: action taken}.
+    """
+    manifest = load_manifest(out_dir)
+    inputs = build_inputs()
+    rules = generate_festivals.rules_hash()
+
+    plan = {}
+    for year in range(start_year, end_year):
+        entry = manifest["years"].get(str(year))
+        action = "year" if force else plan_year(year, entry, out_dir, inputs, rules)
+        if action:
+            plan[year] = action
+
+    astro = [y for y, a in plan.items() if a == "year"]
+    derived = [y for y, a in plan.items() if a == "derived"]
+    print(f"📋 {end_year - start_year - len(plan)} up to date, "
+          f"{len(astro)} to rebuild, {len(derived)} derived-only")
+    if dry_run:
+        return plan
+    index_path = os.path.join(out_dir, "festivals", generate_festivals.INDEX_NAME)
+    if not plan:
+        if not os.path.exists(index_path):
+            generate_festivals.write_index(out_dir)
+        return plan
+
+    # derived-only years: cheap, and no swisseph involved
+    for year in derived:
+        _build_derived(year, out_dir)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(astro), 1))
+    if workers == 1:
+        done = map(_build_year, astro, [out_dir] * len(astro))
+        for year in done:
+            print(f"✅ Rebuilt {year}.json")
+    elif astro:
+        get_index()  # build or load it once here, not in every worker
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=engine.init_swisseph) as pool:
+            for year in pool.map(_build_year, astro, [out_dir] * len(astro)):
+                print(f"✅ Rebuilt {year}.json")
+
+    # recorded only after the files are in place, so an interrupted run
+    # leaves those years stale rather than wrongly marked up to date
+    for year in plan:
+        manifest["years"][str(year)] = _manifest_entry(year, out_dir, inputs, rules)
+    save_manifest(out_dir, manifest)
+    generate_festivals.write_index(out_dir)  # spans every year, stale or not
+
+    print(f"🎉 Regenerated {len(plan)} year(s) in {out_dir}")
+    return plan
+
+# ---------------- RUN ----------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild only the stale panchang year files")
+    parser.add_argument("start_year", type=int, nargs="?", default=1940)
+    parser.add_argument("end_year", type=int, nargs="?", default=2126,
+                        help="exclusive")
+    parser.add_argument("--out", default=str(generate_festivals.BASE))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every year in the range")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report what is stale")
+    args = parser.parse_args()
+
+    regenerate(args.start_year, args.end_year, args.out, args.workers,
+               args.force, args.dry_run)
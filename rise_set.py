@@ -0,0 +1,240 @@
+import numpy as np
+import swisseph as swe
+
+from ephemeris import SWE_LOCK, calc_ut
+from ephemeris_table import ChebyshevSeries
+
+# ---------------- RISE / SET ----------------
+# Sunrise, sunset, moonrise and moonset for every day of a range at
+# once, instead of two cold rise_trans searches per body per day.
+#
+# The Sun's and Moon's apparent right ascension, declination and
+# distance are fitted with Chebyshev series (geocentric, so one fit
+# serves every location), as is sidereal time. Each day's event is then
+# seeded from the hour angle it needs and refined by Newton steps on the
+# topocentric altitude, for all days together. The event definition is
+# rise_trans's with BIT_DISC_CENTER: the disc centre at apparent
+# altitude 0, refraction for the standard pressure at the site's height
+# and 0 °C. Days the solver can't place with certainty (circumpolar
+# bodies, an event right at midnight) fall back to rise_trans.
+
+EQUATORIAL = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
+
+WGS84_A = 6378137.0  # m
+WGS84_F = 1 / 298.257223563
+AU = 149597870700.0  # m
+
+J2000 = 2451545.0
+SIDEREAL_RATE = 360.98564736629  # deg of sidereal time per UT day
+
+# body -> (segment length in days, series degree); RA and declination
+# are smoother than the longitudes ChebyshevTable fits to 0.5"
+SEGMENTS = {
+    swe.SUN: (32.0, 8),
+    swe.MOON: (8.0, 13),
+}
+
+# body -> (mean hour angle rate, deg/day; a gap between two rises, in
+# days, shorter than any real one: solutions later than that after the
+# start are checked for an earlier crossing)
+MOTION = {
+    swe.SUN: (360.0, 0.9),
+    swe.MOON: (347.8, 0.9),
+}
+
+NEWTON_STEPS = 4
+TOLERANCE = 0.01 / 86400  # days
+MAX_FIT_ERROR_ARCSEC = 0.5
+
+
+class Horizon:
+    """
+    What a location's rise/set times depend on, precomputed
+    """
+
+    def __init__(self, lon, lat, alt=0):
+        self.lon, self.lat, self.alt = lon, lat, alt
+        self.geopos = (lon, lat, alt)
+        phi = np.radians(lat)
+        u = np.arctan((1 - WGS84_F) * np.tan(phi))
+        # observer in Earth radii: distance from the axis, height above the equator
+        self.rho_cos = np.cos(u) + alt / WGS84_A * np.cos(phi)
+        self.rho_sin = (1 - WGS84_F) * np.sin(u) + alt / WGS84_A * np.sin(phi)
+        self.sin_lat, self.cos_lat = np.sin(phi), np.cos(phi)
+        # true altitude of a centre seen on the horizon, as rise_trans takes it
+        pressure = 1013.25 * (1 - 0.0065 * alt / 288) ** 5.255
+        with SWE_LOCK:
+            self.h0 = swe.refrac_extended(0.0, alt, pressure, 0.0, 0.0065, swe.APP_TO_TRUE)[0]
+
+
+class EquatorialTable:
+    """
+    Sun/Moon apparent RA, declination and distance and sidereal time
+    for [jd_start, jd_end], as Chebyshev series
+    """
+
+    def __init__(self, jd_start, jd_end, max_error_arcsec=MAX_FIT_ERROR_ARCSEC):
+        self.jd_start, self.jd_end = jd_start, jd_end
+        self.series = {}
+        with SWE_LOCK:
+            for body, (seg_days, deg) in SEGMENTS.items():
+                fit = lambda k, unwrap, b=body: ChebyshevSeries(
+                    lambda jd: calc_ut(jd, b, EQUATORIAL)[0][k],
+                    jd_start, jd_end, seg_days, deg, unwrap)
+                self.series[body] = (fit(0, True), fit(1, False), fit(2, False))
+            # sidereal time less its steady rate: a slow, smooth remainder
+            self.sidereal = ChebyshevSeries(
+                lambda jd: (swe.sidtime(jd) * 15 - SIDEREAL_RATE * (jd - J2000)) % 360,
+                jd_start, jd_end, SEGMENTS[swe.SUN][0], SEGMENTS[swe.SUN][1], True)
+
+        self.max_error = self._check()
+        worst = max(self.max_error.values())
+        if worst > max_error_arcsec:
+            raise ValueError(f"RA/Dec fit error {worst:.3f}\" exceeds {max_error_arcsec}\"")
+
+    def _check(self):
+        errors = {}
+        for body, (ra, dec, _) in self.series.items():
+            jds = np.concatenate([
+                self.jd_start + (np.arange(ra.n_seg) + f) * ra.seg_days for f in (1 / 3, 2 / 3)])
+            jds = jds[jds <= self.jd_end]
+            exact = np.array([calc_ut(jd, body, EQUATORIAL)[0][:2] for jd in jds])
+            d_ra = (ra.value(jds) - exact[:, 0] + 180) % 360 - 180
+            errors[body] = float(max(np.abs(d_ra * np.cos(np.radians(exact[:, 1]))).max(),
+                                     np.abs(dec.value(jds) - exact[:, 1]).max()) * 3600)
+        return errors
+
+    def local_sidereal(self, jds, lon):
+        return self.sidereal.value(jds) + SIDEREAL_RATE * (jds - J2000) + lon
+
+    def hour_angle_dec(self, body, jds, horizon):
+        """
+        (geocentric hour angle, declination, distance in Earth radii), in degrees
+        """
+        ra, dec, dist = self.series[body]
+        h = self.local_sidereal(jds, horizon.lon) - ra.value(jds)
+        return h, dec.value(jds), dist.value(jds) * AU / WGS84_A
+
+    def altitude(self, body, jds, horizon):
+        """
+        Topocentric true altitude (deg), parallax included
+        """
+        h, dec, r = self.hour_angle_dec(body, jds, horizon)
+        h, dec = np.radians(h), np.radians(dec)
+        x = r * np.cos(dec) * np.cos(h) - horizon.rho_cos
+        y = r * np.cos(dec) * np.sin(h)
+        z = r * np.sin(dec) - horizon.rho_sin
+        up = x * horizon.cos_lat + z * horizon.sin_lat
+        return np.degrees(np.arcsin(up / np.sqrt(x * x + y * y + z * z)))
+
+# ---------------- SOLVER ----------------
+
+def _hour_angle_guess(table, body, jds, horizon, rising):
+    """
+    First rise/set after each of jds from the hour angle it needs,
+    ignoring the body's motion in between; NaN when it never crosses
+    """
+    rate, _ = MOTION[body]
+    h, dec, r = table.hour_angle_dec(body, jds, horizon)
+    h0 = horizon.h0 - np.degrees(np.arcsin(1 / r))  # parallax lowers the body
+    dec = np.radians(dec)
+    cos_h0 = ((np.sin(np.radians(h0)) - horizon.sin_lat * np.sin(dec))
+              / (horizon.cos_lat * np.cos(dec)))
+    with np.errstate(invalid="ignore"):
+        target = np.degrees(np.arccos(cos_h0)) * (-1 if rising else 1)
+    return jds + ((target - h) % 360) / rate
+
+
+def _newton(table, body, jds, horizon, rising):
+    """
+    Roots of altitude = h0 near jds; NaN where the step doesn't settle
+    or the crossing goes the wrong way
+    """
+    eps = 1e-5
+    t = jds.copy()
+    for _ in range(NEWTON_STEPS):
+        f = table.altitude(body, t, horizon) - horizon.h0
+        slope = (table.altitude(body, t + eps, horizon)
+                 - table.altitude(body, t - eps, horizon)) / (2 * eps)
+        t = t - f / slope
+    done = np.abs(f / slope) < TOLERANCE
+    right_way = slope > 0 if rising else slope < 0
+    return np.where(done & right_way, t, np.nan)
+
+
+def _rise_trans(body, jd, horizon, rising):
+    flag = (swe.CALC_RISE if rising else swe.CALC_SET) | swe.BIT_DISC_CENTER
+    with SWE_LOCK:
+        return swe.rise_trans(jd, body, flag, horizon.geopos)[1][0]
+
+
+def next_events(table, body, starts, horizon, rising):
+    """
+    JD of the first rise (or set) of body after each of `starts`, as
+    rise_trans would return it. starts: array of JDs inside the table.
+    """
+    rate, min_gap = MOTION[body]
+    period = 360 / rate
+    t = _newton(table, body, _hour_angle_guess(table, body, starts, horizon, rising),
+                horizon, rising)
+
+    # the guess can land one crossing off when the event is near a start
+    early = t < starts
+    if early.any():
+        t[early] = _newton(table, body, t[early] + period, horizon, rising)
+    late = t >= starts + min_gap
+    if late.any():
+        prev = _newton(table, body, t[late] - period, horizon, rising)
+        t[late] = np.where(prev >= starts[late], prev, t[late])
+
+    unsure = ~(t >= starts)  # NaN or still before the start
+    for i in np.flatnonzero(unsure):
+        t[i] = _rise_trans(body, starts[i], horizon, rising)
+    return t
+
+
+def rise_set_days(table, horizon, midnights):
+    """
+    {"sunrise", "sunset", "moonrise", "moonset"} -> arrays of JDs, the
+    first of each after every midnight (JD of the local midnights
+    starting consecutive civil days), like day-by-day rise_trans calls
+    """
+    midnights = np.asarray(midnights, dtype=float)
+    return {
+        name: next_events(table, body, midnights, horizon, rising)
+        for name, body, rising in (
+            ("sunrise", swe.SUN, True), ("sunset", swe.SUN, False),
+            ("moonrise", swe.MOON, True), ("moonset", swe.MOON, False),
+        )
+    }
+
+# ---------------- RUN ----------------
+
+if __name__ == "__main__":
+    # Every day of a few years at a few locations against rise_trans
+    import time
+    from datetime import date, timedelta
+
+    from locations import get_location
+    from panchang_engine_swiss import day_start_jd
+
+    for city in ("hyderabad", "london", "new-york", "sydney"):
+        loc = get_location(city)
+        horizon = Horizon(loc.lon, loc.lat, loc.alt)
+        for year in (1940, 2026, 2125):
+            days = [date(year, 1, 1) + timedelta(days=i) for i in range(365)]
+            midnights = np.array([day_start_jd(d, loc) for d in days])
+            t = time.perf_counter()
+            table = EquatorialTable(midnights[0] - 1, midnights[-1] + 3)
+            events = rise_set_days(table, horizon, midnights)
+            fast = time.perf_counter() - t
+
+            worst = 0
+            t = time.perf_counter()
+            for name, body, rising in (("sunrise", swe.SUN, True), ("sunset", swe.SUN, False),
+                                       ("moonrise", swe.MOON, True), ("moonset", swe.MOON, False)):
+                exact = np.array([_rise_trans(body, m, horizon, rising) for m in midnights])
+                worst = max(worst, float(np.abs(events[name] - exact).max() * 86400))
+            slow = time.perf_counter() - t
+            print(f"{'✅' if worst < 1 else '❌'} {loc.name} {year}: worst {worst:.3f} s, "
+                  f"{fast * 1000:.0f} ms vs rise_trans {slow * 1000:.0f} ms")
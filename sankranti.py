@@ -0,0 +1,143 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+import pytz
+import swisseph as swe
+
+from ephemeris import solve_angle, sun_sidereal
+
+# ---------------- SANKRANTI ----------------
+# Solar ingresses: the instants the Sun's sidereal longitude crosses a
+# multiple of 30°. The Sun moves at an almost constant ~1°/day, so the
+# rate-based first step of solve_angle lands within minutes of each
+# crossing and a couple of Newton steps finish it.
+
+RASHI_NAMES = [
+    "Mesha", "Vrishabha", "Mithuna", "Karka", "Simha", "Kanya",
+    "Tula", "Vrishchika", "Dhanu", "Makara", "Kumbha", "Meena"
+]
+
+GHATI = 24 / 1440  # days
+
+# rashi entered -> punya kala as (ghatis before, ghatis after) the ingress
+PUNYA_KALA_GHATIS = {
+    0: (15, 15), 6: (15, 15),                      # Vishuva (equinoxes)
+    3: (30, 0),                                    # Karka (Dakshinayana)
+    9: (0, 40),                                    # Makara (Uttarayana)
+    1: (16, 0), 4: (16, 0), 7: (16, 0), 10: (16, 0),   # Vishnupadi
+    2: (0, 16), 5: (0, 16), 8: (0, 16), 11: (0, 16),   # Shadashiti
+}
+
+
+def sankranti_instants(jd_start, jd_end):
+    """
+    [(rashi entered, jd)] for every ingress in [jd_start, jd_end)
+    """
+    out = []
+    jd = jd_start
+    while True:
+        s, _ = sun_sidereal(jd)
+        rashi = (int(s // 30) + 1) % 12
+        jd = solve_angle(sun_sidereal, rashi * 30, jd)
+        if jd >= jd_end:
+            return out
+        out.append((rashi, jd))
+        jd += 1  # step off the boundary just solved
+
+
+def year_sankrantis(year):
+    """
+    Ingresses in one Gregorian (UT) year
+    """
+    return sankranti_instants(swe.julday(year, 1, 1, 0), swe.julday(year + 1, 1, 1, 0))
+
+
+def local_date(jd, tz):
+    y, m, d, ut = swe.revjul(jd)
+    utc = datetime(y, m, d, tzinfo=pytz.utc) + timedelta(hours=ut)
+    return utc.astimezone(tz).date()
+
+
+def punya_kala(rashi, jd, daylight, tz):
+    """
+    (observance date, start jd, end jd) of the punya kala around an
+    ingress, kept to daylight. daylight(date) -> (sunrise jd, sunset jd).
+
+    The window is the traditional ghatis before/after the ingress; when
+    all of it falls at night it moves to the nearest daylight on the
+    side the rule points to (next morning for "after" rules, previous
+    evening for "before" rules).
+    """
+    before, after = PUNYA_KALA_GHATIS[rashi]
+    lo, hi = jd - before * GHATI, jd + after * GHATI
+
+    d = local_date(jd, tz)
+    for day in (d - timedelta(days=1), d, d + timedelta(days=1)):
+        sr, ss = daylight(day)
+        start, end = max(lo, sr), min(hi, ss)
+        if start < end:
+            return day, start, end
+
+    if after:
+        day = d if daylight(d)[0] > jd else d + timedelta(days=1)
+        sr, ss = daylight(day)
+        return day, sr, min(sr + after * GHATI, ss)
+    day = d if daylight(d)[1] < jd else d - timedelta(days=1)
+    sr, ss = daylight(day)
+    return day, max(ss - before * GHATI, sr), ss
+
+
+def year_table(year, daylight, tz, rows=None):
+    """
+    (SankrantiIndex, {observance date: [(rashi, ingress jd, punya start,
+    punya end)]}) for the days of one Gregorian year. rows: the year's
+    ingresses if already known (e.g. from year metadata); the few days
+    either side are solved here so windows crossing Jan 1 are included.
+    """
+    jd0, jd1 = swe.julday(year, 1, 1, 0), swe.julday(year + 1, 1, 1, 0)
+    if rows is None:
+        rows = year_sankrantis(year)
+    index = SankrantiIndex(
+        sankranti_instants(jd0 - 3, jd0) + list(rows) + sankranti_instants(jd1, jd1 + 3))
+
+    punya = {}
+    for jd, rashi in index.rows:
+        day, start, end = punya_kala(rashi, jd, daylight, tz)
+        punya.setdefault(day, []).append((rashi, jd, start, end))
+    return index, punya
+
+
+def day_events(table, date, tz):
+    """
+    ([(jd, rashi)] ingresses on the civil date, [(rashi, jd, start, end)]
+    punya kala windows observed on it) from a year_table
+    """
+    index, punya = table
+    day = datetime(date.year, date.month, date.day)
+    # each midnight localized on its own: across a DST change the day
+    # is 23 or 25 hours long
+    jd_a, jd_b = (_jd_utc(tz.localize(day + timedelta(days=k))) for k in (0, 1))
+    return index.between(jd_a, jd_b), punya.get(day.date(), [])
+
+
+def _jd_utc(dt):
+    u = dt.astimezone(pytz.utc)
+    return swe.julday(u.year, u.month, u.day, u.hour + u.minute / 60 + u.second / 3600)
+
+
+class SankrantiIndex:
+    """
+    Sorted ingresses over a span of years, queried by bisection
+    """
+
+    def __init__(self, rows):
+        self.rows = sorted((jd, int(rashi)) for rashi, jd in rows)
+        self._jds = [r[0] for r in self.rows]
+
+    def between(self, jd_start, jd_end):
+        """
+        [(jd, rashi)] of ingresses in [jd_start, jd_end)
+        """
+        i = bisect_left(self._jds, jd_start)
+        j = bisect_left(self._jds, jd_end)
+        return self.rows[i:j]
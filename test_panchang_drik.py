@@ -2,17 +2,36 @@
 # 🔥 COMPLETE HINDU FESTIVAL ENGINE - DRIKPANCHANG ACCURATE
 
 import swisseph as swe
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import os
 import pytz
-import json
+
+from ephemeris import (
+    SOLVER_TOL, apply_settings, clear_cache, elongation, solve_angle, sun_moon_lon,
+    sun_moon_lon_speed,
+)
+from festival_rules import FESTIVALS, NO_MONTH
+from lunation_index import get_index
+from panchang_io import write_records
+from sankranti import RASHI_NAMES, day_events, year_table
 
 IST = pytz.timezone("Asia/Kolkata")
 LAT = 17.3850
 LON = 78.4867
 ALT = 0
-swe.set_sid_mode(swe.SIDM_LAHIRI)
-swe.set_topo(LON, LAT, ALT)
-swe.set_ephe_path(".")
+EPHE_PATH = "."
+
+# year -> sankranti.year_table output
+SANKRANTI_TABLES = {}
+
+def init_swisseph():
+    apply_settings(swe.SIDM_LAHIRI, EPHE_PATH)
+    clear_cache()
+    SANKRANTI_TABLES.clear()
+
+init_swisseph()
 
 TITHI_NAMES = [
     "Pratipada", "Dvitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi",
@@ -67,68 +86,22 @@ def ist_from_jd(jd):
 def fmt(dt):
     return dt.strftime("%I:%M %p") if dt else None
 
-def sun_moon_lon(jd):
-    sun = swe.calc_ut(jd, swe.SUN)[0][0]
-    moon = swe.calc_ut(jd, swe.MOON)[0][0]
-    ay = swe.get_ayanamsa_ut(jd)
-    return (sun - ay) % 360, (moon - ay) % 360
+def fmt_upto(name, end_jd, next_sunrise_jd):
+    """
+    "<name> upto HH:MM AM"; ends past the next sunrise are marked, since
+    the time alone would read as belonging to this panchang day
+    """
+    text = f"{name} upto {fmt(ist_from_jd(end_jd))}"
+    return text + " (next day)" if end_jd >= next_sunrise_jd else text
 
 def lunar_month_amanta(jd):
     """
-    Amanta system: Month changes AFTER Amavasya
-    
-    Method:
-    1. If current tithi is in Shukla Paksha (0-14): Find the LAST Amavasya
-    2. If current tithi is in Krishna Paksha (15-29): Use sun's CURRENT position
-       (because the Amavasya naming this month hasn't happened yet, 
-        but it will happen in current sun's rashi)
-    
-    The month is named after the solar rashi where Amavasya occurs.
+    Amanta system: the month runs from one Amavasya to the next and is
+    named after the sidereal rashi of the Sun at the Amavasya that
+    opened it (Meena → Chaitra). Returns (month index, is_adhika); a
+    month with no Sankranti is the Adhika month of the same name.
     """
-    s, m = sun_moon_lon(jd)
-    tithi_deg = (m - s) % 360
-    tithi = int(tithi_deg // 12)
-    
-    if tithi < 15:  # Shukla Paksha - we're AFTER the Amavasya
-        # Search backward to find when Amavasya occurred
-        # Start from current JD and go back
-        jd_search = jd
-        
-        for day in range(1, 32):  # Search back up to 31 days
-            jd_search = jd - day
-            s_search, m_search = sun_moon_lon(jd_search)
-            tithi_search = int(((m_search - s_search) % 360) // 12)
-            
-            # Check if we crossed from Krishna Paksha to Shukla Paksha
-            jd_next = jd_search + 0.5  # Check half day later
-            s_next, m_next = sun_moon_lon(jd_next)
-            tithi_next = int(((m_next - s_next) % 360) // 12)
-            
-            # If tithi changed from 29 (Amavasya) to 0 (Pratipada), we found it!
-            if tithi_search == 29 or (tithi_search >= 28 and tithi_next < 2):
-                # Return the sun's rashi at the time of that Amavasya
-                return int(s_search // 30)
-        
-        # Fallback: use current sun position
-        return int(s // 30)
-    
-    else:  # Krishna Paksha (tithi 15-29) - we're BEFORE the next Amavasya
-        # The current month is named after where the UPCOMING Amavasya will occur
-        # This is typically the current sun's rashi
-        
-        # But to be precise, let's look ahead to where Amavasya will be
-        jd_search = jd
-        
-        for day in range(1, 17):  # Amavasya is within 15 days in Krishna Paksha
-            jd_search = jd + day
-            s_search, m_search = sun_moon_lon(jd_search)
-            tithi_search = int(((m_search - s_search) % 360) // 12)
-            
-            if tithi_search == 29:  # Found Amavasya
-                return int(s_search // 30)
-        
-        # Fallback
-        return int(s // 30)
+    return get_index().amanta_month(jd)
 
 
 def tithi_index(jd):
@@ -143,43 +116,67 @@ def yoga_index(jd):
     s, m = sun_moon_lon(jd)
     return int(((s + m) % 360) // (360 / 27))
 
-def solve_transition(jd0, fn, idx):
-    a, b = jd0, jd0 + 1
-    for _ in range(50):
-        mid = (a + b) / 2
-        if fn(mid) == idx:
-            a = mid
-        else:
-            b = mid
-    return (a + b) / 2
-
-def check_madhyana_vyapini(date, sr, ti_required):
-    madhyana_start = datetime.combine(date, datetime.min.time()) + timedelta(hours=9)
-    madhyana_end = datetime.combine(date, datetime.min.time()) + timedelta(hours=12)
-    
-    madhyana_start_ist = IST.localize(madhyana_start)
-    madhyana_end_ist = IST.localize(madhyana_end)
-    
-    jd_start = jd_from_utc(madhyana_start_ist.astimezone(pytz.utc))
-    jd_end = jd_from_utc(madhyana_end_ist.astimezone(pytz.utc))
-    
-    ti_start = tithi_index(jd_start)
-    ti_end = tithi_index(jd_end)
-    
-    return (ti_start == ti_required or ti_end == ti_required)
+def nakshatra_angle(jd):
+    _, m, _, dm = sun_moon_lon_speed(jd)
+    return m, dm
 
-def check_midnight_presence(date, ti_required):
-    midnight = datetime.combine(date + timedelta(days=1), datetime.min.time())
-    midnight_ist = IST.localize(midnight)
-    jd_midnight = jd_from_utc(midnight_ist.astimezone(pytz.utc))
-    
-    ti_midnight = tithi_index(jd_midnight)
-    return (ti_midnight == ti_required)
+def yoga_angle(jd):
+    s, m, ds, dm = sun_moon_lon_speed(jd)
+    return (s + m) % 360, ds + dm
 
-def check_tithi_at_sunrise(date, sr, ti_required):
-    jd_sr = jd_from_utc(sr.astimezone(pytz.utc))
-    ti_sr = tithi_index(jd_sr)
-    return (ti_sr == ti_required)
+NAK_SPAN = 360 / 27
+
+TRANSITION_ANGLES = {
+    tithi_index: (elongation, 12),
+    nakshatra_index: (nakshatra_angle, NAK_SPAN),
+    yoga_index: (yoga_angle, NAK_SPAN),
+}
+
+def solve_transition(jd0, fn, idx, tol=SOLVER_TOL):
+    """
+    Newton steps on the continuous angle using Sun/Moon speeds.
+    Not limited to jd0 + 1: long tithis/nakshatras are solved exactly.
+    """
+    angle_fn, span = TRANSITION_ANGLES[fn]
+    return solve_angle(angle_fn, ((idx + 1) * span) % 360, jd0, tol)
+
+# kind -> (index fn, number of segments in a full cycle)
+TIMELINE_KINDS = {
+    "tithi": (tithi_index, 30),
+    "nakshatra": (nakshatra_index, 27),
+    "yoga": (yoga_index, 27),
+}
+
+def build_timeline(jd_start, jd_end):
+    """
+    Per kind, sorted boundary instants and the index active from each.
+    One sweep covers a whole year; days then resolve by bisection.
+    """
+    timeline = {}
+    for kind, (fn, n) in TIMELINE_KINDS.items():
+        idx = fn(jd_start)
+        starts, idxs = [jd_start], [idx]
+        while starts[-1] <= jd_end:
+            starts.append(solve_transition(starts[-1], fn, idx))
+            idx = (idx + 1) % n
+            idxs.append(idx)
+        timeline[kind] = (starts, idxs)
+    return timeline
+
+def timeline_lookup(timeline, kind, jd):
+    starts, idxs = timeline[kind]
+    i = bisect_right(starts, jd) - 1
+    return idxs[i], starts[i + 1]
+
+def timeline_spans(timeline, kind, jd_a, jd_b):
+    """
+    [(index, start, end)] of every span overlapping [jd_a, jd_b). The
+    first span of a timeline starts at its jd_start, not its true start.
+    """
+    starts, idxs = timeline[kind]
+    i = max(bisect_right(starts, jd_a) - 1, 0)
+    j = min(bisect_left(starts, jd_b), len(starts) - 1)
+    return [(idxs[k], starts[k], starts[k + 1]) for k in range(i, j)]
 
 def sunrise_sunset(date):
     jd = swe.julday(date.year, date.month, date.day, 0)
@@ -187,6 +184,60 @@ def sunrise_sunset(date):
     ss = swe.rise_trans(jd, swe.SUN, swe.CALC_SET | swe.BIT_DISC_CENTER, (LON, LAT, ALT))[1][0]
     return ist_from_jd(sr), ist_from_jd(ss)
 
+def solar_day(date):
+    """
+    One civil day's sunrise/sunset and the sidereal state at sunrise
+    """
+    sr, ss = sunrise_sunset(date)
+    jd_sr = jd_from_utc(sr.astimezone(pytz.utc))
+    s, m = sun_moon_lon(jd_sr)
+    return {
+        "date": date,
+        "sr": sr,
+        "ss": ss,
+        "jd_sr": jd_sr,
+        "jd_ss": jd_from_utc(ss.astimezone(pytz.utc)),
+        "sun_lon": s,
+        "moon_lon": m,
+        "sun_sign": int(s // 30),
+        "tithi": int(((m - s) % 360) // 12),
+    }
+
+def day_window(date):
+    """
+    {"prev", "day", "next"} solar_day entries around one date
+    """
+    one = timedelta(days=1)
+    return {"prev": solar_day(date - one), "day": solar_day(date), "next": solar_day(date + one)}
+
+def day_contexts(start, end):
+    """
+    Yields day_window(d) for start <= d < end, walking forward so each
+    day's solar_day is computed once and reused as its neighbours' prev
+    and next instead of recomputing their sunrises
+    """
+    one = timedelta(days=1)
+    prev, day = solar_day(start - one), solar_day(start)
+    d = start
+    while d < end:
+        nxt = solar_day(d + one)
+        yield {"prev": prev, "day": day, "next": nxt}
+        prev, day = day, nxt
+        d += one
+
+def daylight_jd(date):
+    sr, ss = sunrise_sunset(date)
+    return jd_from_utc(sr.astimezone(pytz.utc)), jd_from_utc(ss.astimezone(pytz.utc))
+
+def get_sankranti_table(year):
+    """
+    All Sankranti instants of the year, solved once, and the day each
+    punya kala is observed on
+    """
+    if year not in SANKRANTI_TABLES:
+        SANKRANTI_TABLES[year] = year_table(year, daylight_jd, IST)
+    return SANKRANTI_TABLES[year]
+
 def moonrise_moonset(date):
     jd = swe.julday(date.year, date.month, date.day, 0)
     mr = swe.rise_trans(jd, swe.MOON, swe.CALC_RISE | swe.BIT_DISC_CENTER, (LON, LAT, ALT))[1][0]
@@ -215,225 +266,61 @@ def dur_muhurtam(sr, ss, wd):
     i = DUR_INDEX.get(wd)
     return f"{fmt(sr+seg*(i-1))} to {fmt(sr+seg*i)}" if i else None
 
-def get_festivals(date, sr, ss, ti, ni, month_idx, paksha):
-    festivals = []
-    jd_sr = jd_from_utc(sr.astimezone(pytz.utc))
-    jd_ss = jd_from_utc(ss.astimezone(pytz.utc))
-    
-    tithi_name = TITHI_NAMES[ti]
-    nakshatra_name = NAKSHATRA_NAMES[ni]
-    month_name = LUNAR_MONTH_NAMES_AMANTA[month_idx]
-    
-    # MONTHLY RECURRING
-    if tithi_name == "Amavasya":
-        festivals.append("Amavasya")
-    if tithi_name == "Purnima":
-        festivals.append("Purnima")
-    if tithi_name == "Ekadashi":
-        festivals.append("Ekadashi")
-    if tithi_name == "Chaturthi" and paksha == "Krishna Paksha":
-        festivals.append("Sankashti Chaturthi")
-    if tithi_name == "Chaturdashi" and paksha == "Krishna Paksha":
-        festivals.append("Masik Shivaratri")
-    if tithi_name == "Trayodashi":
-        festivals.append("Pradosh Vrat")
-    
-    # SOLAR FESTIVALS
-    sun_lon, _ = sun_moon_lon(jd_sr)
-    sun_sign = int(sun_lon // 30)
-    prev_date = date - timedelta(days=1)
-    try:
-        jd_prev = jd_from_utc(sunrise_sunset(prev_date)[0].astimezone(pytz.utc))
-        sun_lon_prev, _ = sun_moon_lon(jd_prev)
-        sun_sign_prev = int(sun_lon_prev // 30)
-    except:
-        sun_sign_prev = sun_sign
-    
-    if sun_sign == 9 and sun_sign != sun_sign_prev:
-        festivals.append("Makar Sankranti")
-        festivals.append("Pongal")
-    
-    if sun_sign == 0 and sun_sign != sun_sign_prev:
-        festivals.append("Baisakhi")
-        festivals.append("Vaisakhi")
-    
-    # VASANT PANCHAMI
-    if month_name == "Magha" and tithi_name == "Panchami" and paksha == "Shukla Paksha":
-        festivals.append("Vasant Panchami")
-        festivals.append("Saraswati Puja")
-    
-    # MAHA SHIVARATRI
-    if month_name in ["Magha", "Phalguna"]:
-        if tithi_name == "Chaturdashi" and paksha == "Krishna Paksha":
-            if check_midnight_presence(date, ti):
-                festivals.append("Maha Shivaratri")
-    
-    # HOLI
-    if month_name == "Phalguna":
-        if tithi_name == "Purnima":
-            festivals.append("Holika Dahan")
-            festivals.append("Chhoti Holi")
-            festivals.append("Phalguna Purnima")
-        if tithi_name == "Pratipada" and paksha == "Krishna Paksha":
-            festivals.append("Holi")
-            festivals.append("Dhulandi")
-            festivals.append("Rangwali Holi")
-    
-    # UGADI
-    if month_name == "Chaitra" and tithi_name == "Pratipada" and paksha == "Shukla Paksha":
-        festivals.append("Ugadi")
-        festivals.append("Gudi Padwa")
-        festivals.append("Chaitra Navratri Begins")
-    
-    # RAMA NAVAMI
-    if month_name == "Chaitra" and tithi_name == "Navami" and paksha == "Shukla Paksha":
-        festivals.append("Rama Navami")
-    
-    # HANUMAN JAYANTI
-    if month_name == "Chaitra" and tithi_name == "Purnima":
-        festivals.append("Hanuman Jayanti")
-    
-    # AKSHAYA TRITIYA
-    if month_name == "Vaishakha" and tithi_name == "Tritiya" and paksha == "Shukla Paksha":
-        festivals.append("Akshaya Tritiya")
-    
-    # BUDDHA PURNIMA
-    if month_name == "Vaishakha" and tithi_name == "Purnima":
-        festivals.append("Buddha Purnima")
-    
-    # NIRJALA EKADASHI
-    if month_name == "Jyeshtha" and tithi_name == "Ekadashi" and paksha == "Shukla Paksha":
-        festivals.append("Nirjala Ekadashi")
-    
-    # RATHA YATRA
-    if month_name == "Ashadha" and tithi_name == "Dvitiya" and paksha == "Shukla Paksha":
-        festivals.append("Ratha Yatra")
-    
-    # GURU PURNIMA
-    if month_name == "Ashadha" and tithi_name == "Purnima":
-        festivals.append("Guru Purnima")
-    
-    # HARIYALI TEEJ
-    if month_name == "Shravana" and tithi_name == "Tritiya" and paksha == "Shukla Paksha":
-        festivals.append("Hariyali Teej")
-    
-    # NAG PANCHAMI
-    if month_name == "Shravana" and tithi_name == "Panchami" and paksha == "Shukla Paksha":
-        festivals.append("Nag Panchami")
-    
-    # RAKSHA BANDHAN
-    if month_name == "Shravana" and tithi_name == "Purnima":
-        festivals.append("Raksha Bandhan")
-        festivals.append("Shravana Purnima")
-    
-    # JANMASHTAMI
-    if month_name in ["Shravana", "Bhadrapada"]:
-        if tithi_name == "Ashtami" and paksha == "Krishna Paksha":
-            if nakshatra_name == "Rohini":
-                festivals.append("Janmashtami")
-                festivals.append("Krishna Jayanti")
-    
-    # GANESH CHATURTHI
-    if month_name == "Bhadrapada" and tithi_name == "Chaturthi" and paksha == "Shukla Paksha":
-        festivals.append("Ganesh Chaturthi")
-        festivals.append("Vinayaka Chaturthi")
-    
-    # ANANT CHATURDASHI
-    if month_name == "Bhadrapada" and tithi_name == "Chaturdashi" and paksha == "Shukla Paksha":
-        festivals.append("Anant Chaturdashi")
-        festivals.append("Ganesh Visarjan")
-    
-    # PITRU PAKSHA
-    if month_name == "Bhadrapada" and tithi_name == "Pratipada" and paksha == "Krishna Paksha":
-        festivals.append("Pitru Paksha Begins")
-    if month_name == "Bhadrapada" and tithi_name == "Amavasya":
-        festivals.append("Mahalaya Amavasya")
-    
-    # NAVRATRI
-    if month_name == "Ashwin":
-        if tithi_name == "Pratipada" and paksha == "Shukla Paksha":
-            festivals.append("Sharad Navratri Begins")
-        if tithi_name == "Saptami" and paksha == "Shukla Paksha":
-            festivals.append("Maha Saptami")
-        if tithi_name == "Ashtami" and paksha == "Shukla Paksha":
-            festivals.append("Durga Ashtami")
-            festivals.append("Maha Ashtami")
-        if tithi_name == "Navami" and paksha == "Shukla Paksha":
-            festivals.append("Maha Navami")
-        if tithi_name == "Dashami" and paksha == "Shukla Paksha":
-            festivals.append("Vijayadashami")
-            festivals.append("Dussehra")
-    
-    # SHARAD PURNIMA
-    if month_name == "Ashwin" and tithi_name == "Purnima":
-        festivals.append("Sharad Purnima")
-    
-    # KARVA CHAUTH
-    if month_name == "Kartik" and tithi_name == "Chaturthi" and paksha == "Krishna Paksha":
-        festivals.append("Karwa Chauth")
-    
-    # DHANTERAS
-    if month_name == "Kartik" and tithi_name == "Trayodashi" and paksha == "Krishna Paksha":
-        festivals.append("Dhanteras")
-    
-    # NARAKA CHATURDASHI
-    if month_name == "Kartik" and tithi_name == "Chaturdashi" and paksha == "Krishna Paksha":
-        festivals.append("Naraka Chaturdashi")
-        festivals.append("Choti Diwali")
-    
-    # DIWALI
-    if month_name == "Kartik" and tithi_name == "Amavasya":
-        festivals.append("Diwali")
-        festivals.append("Lakshmi Puja")
-    
-    # GOVARDHAN PUJA
-    if month_name == "Kartik" and tithi_name == "Pratipada" and paksha == "Shukla Paksha":
-        festivals.append("Govardhan Puja")
-    
-    # BHAI DOOJ
-    if month_name == "Kartik" and tithi_name == "Dvitiya" and paksha == "Shukla Paksha":
-        festivals.append("Bhai Dooj")
-        festivals.append("Yama Dwitiya")
-    
-    # CHHATH PUJA
-    if month_name == "Kartik" and tithi_name == "Shashthi" and paksha == "Shukla Paksha":
-        festivals.append("Chhath Puja")
-    
-    # KARTIK PURNIMA
-    if month_name == "Kartik" and tithi_name == "Purnima":
-        festivals.append("Kartik Purnima")
-        festivals.append("Dev Deepawali")
-    
-    # GITA JAYANTI
-    if month_name == "Margashirsha" and tithi_name == "Ekadashi" and paksha == "Shukla Paksha":
-        festivals.append("Gita Jayanti")
-    
-    # RATHA SAPTAMI
-    if month_name == "Magha" and tithi_name == "Saptami" and paksha == "Shukla Paksha":
-        festivals.append("Ratha Saptami")
-    
-    # MAGHA PURNIMA
-    if month_name == "Magha" and tithi_name == "Purnima":
-        festivals.append("Magha Purnima")
-    
-    return festivals
+def get_festivals(ctx, timeline, ni, sankrantis):
+    # ctx: day_window of the date; timeline must cover the previous
+    # sunrise to the next; sankrantis: rashis whose punya kala is
+    # observed on this date. Tithi spans come from the timeline, so kala
+    # checks are interval overlaps with no ephemeris calls. The next
+    # day's night is taken as long as this one (a minute or two off).
+    prev, day, nxt = ctx["prev"], ctx["day"], ctx["next"]
+    frames = [
+        (prev["jd_sr"], prev["jd_ss"], day["jd_sr"]),
+        (day["jd_sr"], day["jd_ss"], nxt["jd_sr"]),
+        (nxt["jd_sr"], nxt["jd_ss"], 2 * nxt["jd_sr"] - day["jd_sr"]),
+    ]
+    spans = []
+    for ti, start, end in timeline_spans(timeline, "tithi", day["jd_sr"], nxt["jd_sr"]):
+        # month keys: Adhika months only match every-month rules
+        month, adhika = lunar_month_amanta((start + end) / 2)
+        spans.append((ti, start, end, NO_MONTH if adhika else month))
+    return FESTIVALS.match({
+        "frames": frames,
+        "spans": spans,
+        "weekday": day["date"].weekday(),
+        "nakshatra": ni,
+        "sankrantis": sankrantis,
+    })
 
-def generate_day(date):
-    sr, ss = sunrise_sunset(date)
+def generate_day(date, timeline=None, ctx=None):
+    """
+    ctx: this date's day_window; generate_year passes the ones
+    day_contexts yields, a single day computes its own
+    """
+    if ctx is None:
+        ctx = day_window(date)
+    sr, ss = ctx["day"]["sr"], ctx["day"]["ss"]
     mr, ms = moonrise_moonset(date)
-    jd0 = jd_from_utc(sr.astimezone(pytz.utc))
+    jd0 = ctx["day"]["jd_sr"]
+    
+    if timeline is None:
+        timeline = build_timeline(ctx["prev"]["jd_sr"] - 1 / 24, ctx["next"]["jd_sr"])
     
-    ti = tithi_index(jd0)
-    ni = nakshatra_index(jd0)
-    yi = yoga_index(jd0)
-    month_idx = lunar_month_amanta(jd0)
+    ti, t_end = timeline_lookup(timeline, "tithi", jd0)
+    ni, n_end = timeline_lookup(timeline, "nakshatra", jd0)
+    yi, y_end = timeline_lookup(timeline, "yoga", jd0)
+    month_idx, adhika = lunar_month_amanta(jd0)
+    month_name = ("Adhika " if adhika else "") + LUNAR_MONTH_NAMES_AMANTA[month_idx]
     paksha = "Krishna Paksha" if ti >= 15 else "Shukla Paksha"
     
-    t_end = ist_from_jd(solve_transition(jd0, tithi_index, ti))
-    n_end = ist_from_jd(solve_transition(jd0, nakshatra_index, ni))
-    y_end = ist_from_jd(solve_transition(jd0, yoga_index, yi))
+    next_sr = ctx["next"]["jd_sr"]
+    
+    ingresses, windows = day_events(get_sankranti_table(date.year), date, IST)
+    sankranti = ", ".join(f"{RASHI_NAMES[r]} Sankranti at {fmt(ist_from_jd(jd))}"
+                          for jd, r in ingresses) or None
+    punya_kala = ", ".join(f"{fmt(ist_from_jd(a))} to {fmt(ist_from_jd(b))}"
+                           for _, _, a, b in windows) or None
     
-    festivals = get_festivals(date, sr, ss, ti, ni, month_idx, paksha)
+    festivals = get_festivals(ctx, timeline, ni, [w[0] for w in windows])
     
     wd = date.weekday()
     
@@ -445,40 +332,55 @@ def generate_day(date):
         "Moonrise": fmt(mr),
         "Moonset": fmt(ms),
         "Paksha": paksha,
-        "Tithi": f"{TITHI_NAMES[ti]} upto {fmt(t_end)}",
-        "Nakshatra": f"{NAKSHATRA_NAMES[ni]} upto {fmt(n_end)}",
-        "Yoga": f"{YOGA_NAMES[yi]} upto {fmt(y_end)}",
-        "Lunar Month": LUNAR_MONTH_NAMES_AMANTA[month_idx],
+        "Tithi": fmt_upto(TITHI_NAMES[ti], t_end, next_sr),
+        "Nakshatra": fmt_upto(NAKSHATRA_NAMES[ni], n_end, next_sr),
+        "Yoga": fmt_upto(YOGA_NAMES[yi], y_end, next_sr),
+        "Lunar Month": month_name,
         "Rahu Kalam": " to ".join(kaalam(sr, ss, RAHU_INDEX[wd])),
         "Gulikai Kalam": " to ".join(kaalam(sr, ss, GULIKAI_INDEX[wd])),
         "Yamaganda": " to ".join(kaalam(sr, ss, YAMA_INDEX[wd])),
         "Abhijit": None if abhijit(sr, ss, wd) is None else " to ".join(abhijit(sr, ss, wd)),
         "Dur Muhurtam": dur_muhurtam(sr, ss, wd),
+        "Sankranti": sankranti,
+        "Sankranti Punya Kala": punya_kala,
         "Festivals": festivals
     }
 
-def generate_years(start_year=1940, end_year=2126):
+def iter_year(year):
+    """
+    Yields the days of a year as they are generated
+    """
+    current_date = datetime(year, 1, 1)
+    end_date = datetime(year + 1, 1, 1)
+    timeline = build_timeline(jd_from_utc(current_date) - 1, jd_from_utc(end_date) + 1)
+    
+    for ctx in day_contexts(current_date, end_date):
+        yield generate_day(ctx["day"]["date"], timeline, ctx)
+
+def generate_year(year):
+    return list(iter_year(year))
+
+def _generate_year_file(year, out_dir):
+    n = write_records(os.path.join(out_dir, f"{year}.json"), iter_year(year))
+    return year, n
+
+def generate_years(start_year=1940, end_year=2126, workers=None, out_dir="."):
     total_years = end_year - start_year
+    workers = min(workers or os.cpu_count() or 1, max(total_years, 1))
     print(f"🚀 Starting Panchang Generation: {start_year} to {end_year-1}")
-    print(f"📊 Total Years: {total_years}")
+    print(f"📊 Total Years: {total_years} | Workers: {workers}")
     print("="*60)
     
-    for year in range(start_year, end_year):
-        year_data = []
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1)
-        current_date = start_date
-        
-        print(f"📁 Processing: {year}.json", end=" ")
-        
-        while current_date < end_date:
-            year_data.append(generate_day(current_date))
-            current_date += timedelta(days=1)
-        
-        with open(f"{year}.json", "w", encoding="utf-8") as f:
-            json.dump(year_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ ({len(year_data)} days)")
+    years = list(range(start_year, end_year))
+    if workers == 1:
+        results = (_generate_year_file(y, out_dir) for y in years)
+        for year, n in results:
+            print(f"📁 {year}.json ✅ ({n} days)")
+    else:
+        get_index()  # build or load it once here, not in every worker
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_swisseph) as pool:
+            for year, n in pool.map(_generate_year_file, years, [out_dir] * len(years)):
+                print(f"📁 {year}.json ✅ ({n} days)")
     
     print("="*60)
     print(f"🎉 COMPLETE! Generated {total_years} years of Panchang data")
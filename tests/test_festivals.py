@@ -0,0 +1,35 @@
+from datetime import date, datetime
+
+import pytest
+
+import panchang_engine_swiss as engine
+from festival_rules import KALAS, kala_window
+from festival_solver import festival_dates
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Diwali", date(2026, 11, 8)),
+    ("Janmashtami", date(2026, 9, 4)),
+    ("Dussehra", date(2026, 10, 20)),
+    ("Maha Shivaratri", date(2026, 2, 15)),
+])
+def test_solver_dates_2026(name, expected):
+    assert festival_dates(name, 2026, 2026) == [expected]
+
+
+def test_engine_festivals_follow_the_rules():
+    assert "Diwali" in engine.generate_day(datetime(2026, 11, 8))["Festivals"]
+    assert "Janmashtami" in engine.generate_day(datetime(2026, 9, 4))["Festivals"]
+    december = engine.generate_day(datetime(2026, 12, 8))["Festivals"]
+    assert not any("Diwali" in name for name in december)
+
+
+def test_year_and_single_day_agree():
+    days = engine.generate_year(2026)
+    for d in (datetime(2026, 1, 1), datetime(2026, 10, 20), datetime(2026, 12, 31)):
+        assert engine.generate_day(d) == days[(d - datetime(2026, 1, 1)).days]
+
+
+def test_aparahna_is_the_fourth_fifth_of_the_day():
+    assert "aparahna" in KALAS
+    assert kala_window("aparahna", 600, 1100, 2040) == (900, 1000)
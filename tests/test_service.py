@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from panchang_service import HttpError, PanchangService
+
+
+@pytest.mark.parametrize("target", [
+    "/day?date=1800-01-01",
+    "/day?date=2026-13-01",
+    "/day",
+    "/range?start=2199-12-30&end=2200-01-02",
+    "/range?start=2026-02-01&end=2026-01-01",
+    "/festivals?year=abc",
+    "/festivals?year=1800",
+    "/festival-dates?name=diwali&start=2027&end=2026",
+])
+def test_bad_queries_are_400(target):
+    # rejected before any work reaches the pool, so none is started
+    with pytest.raises(HttpError) as e:
+        asyncio.run(PanchangService().route(target))
+    assert e.value.status == 400
+
+
+def test_unknown_festival_and_city_are_404():
+    for target in ("/festival-dates?name=nope&start=2026&end=2026",
+                   "/day?date=2026-01-01&city=atlantis"):
+        with pytest.raises(HttpError) as e:
+            asyncio.run(PanchangService().route(target))
+        assert e.value.status == 404
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_is_400(length):
+    async def request():
+        service = PanchangService()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /day?date=2026-01-01 HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    assert asyncio.run(request()).startswith(b"HTTP/1.1 400 ")
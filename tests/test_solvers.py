@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+import panchang_engine_swiss as engine
+from ephemeris_table import ChebyshevTable
+from festival_rules import FESTIVALS
+from festival_solver import solve_rule
+from locations import get_location
+from rise_set import EquatorialTable, Horizon, _rise_trans, rise_set_days
+
+SECOND = 1 / 86400
+
+
+def test_timeline_from_table_matches_plain_solves():
+    jd0 = engine.jd_from_utc(datetime(2026, 1, 1))
+    table = ChebyshevTable(jd0, jd0 + 40)
+    assert max(table.max_error.values()) <= 0.5
+    fast = engine.build_timeline(jd0, jd0 + 35, table)
+    slow = engine.build_timeline(jd0, jd0 + 35)
+    for kind in engine.TIMELINE_KINDS:
+        # the table's seeds may run past jd_end; both must cover it
+        n = len(slow[kind][0])
+        assert fast[kind][0][-1] > jd0 + 35
+        assert fast[kind][1][:n] == slow[kind][1]
+        assert np.allclose(fast[kind][0][:n], slow[kind][0], atol=SECOND, rtol=0)
+
+
+@pytest.mark.parametrize("city", ["hyderabad", "london", "sydney"])
+def test_rise_set_matches_rise_trans(city):
+    loc = get_location(city)
+    first = datetime(2026, 3, 1)
+    midnights = np.array([engine.day_start_jd(first + timedelta(days=i), loc) for i in range(40)])
+    table = EquatorialTable(midnights[0] - 1, midnights[-1] + 3)
+    horizon = Horizon(loc.lon, loc.lat, loc.alt)
+    events = rise_set_days(table, horizon, midnights)
+    for name, body, rising in (("sunrise", swe.SUN, True), ("sunset", swe.SUN, False),
+                               ("moonrise", swe.MOON, True), ("moonset", swe.MOON, False)):
+        exact = [_rise_trans(body, m, horizon, rising) for m in midnights]
+        assert np.abs(events[name] - exact).max() < SECOND, name
+
+
+@pytest.mark.parametrize("city, year", [("hyderabad", 2026), ("new-york", 2026), ("london", 2031)])
+def test_solver_matches_generated_year(city, year):
+    loc = get_location(city)
+    generated = {(datetime.strptime(r["date"], "%d/%m/%Y").date(), name)
+                 for r in engine.generate_year(year, loc) for name in r["Festivals"]}
+    rules = {r["pos"]: r for rs in list(FESTIVALS.lunar.values())
+             + list(FESTIVALS.solar.values()) for r in rs}
+    solved = {(d, name) for rule in rules.values()
+              for d, names in solve_rule(rule, year, loc) for name in names}
+    assert solved == generated
@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+
+import pytest
+
+import panchang_columnar
+import panchang_engine_swiss as engine
+from panchang_io import iter_records, write_records
+
+
+@pytest.fixture(scope="module")
+def days():
+    return [engine.generate_day(datetime(2026, 3, d)) for d in range(1, 11)]
+
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_json_array_matches_json_dump(tmp_path, days, indent):
+    path = tmp_path / "days.json"
+    assert write_records(path, iter(days), indent=indent) == len(days)
+    assert path.read_text(encoding="utf-8") == json.dumps(days, ensure_ascii=False, indent=indent)
+    assert list(iter_records(path)) == days
+
+
+def test_ndjson_round_trip(tmp_path, days):
+    path = tmp_path / "days.ndjson"
+    write_records(path, days)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == len(days)
+    assert list(iter_records(path)) == days
+
+
+def test_empty_array(tmp_path):
+    path = tmp_path / "empty.json"
+    assert write_records(path, []) == 0
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+    assert list(iter_records(path)) == []
+
+
+def test_columnar_round_trip(tmp_path, days):
+    path = tmp_path / f"2026{panchang_columnar.SUFFIX}"
+    panchang_columnar.write_year(path, days)
+    assert panchang_columnar.read_year(path) == days
+    with panchang_columnar.YearColumns(path) as cols:
+        assert cols.day(datetime(2026, 3, 5)) == days[4]
+        assert cols.day(datetime(2026, 4, 1)) is None
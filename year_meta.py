@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+
+from ephemeris import settings_fingerprint
+from lunation_index import INDEX_VERSION
+from panchang_io import CACHE_DIR
+
+# ---------------- YEAR METADATA STORE ----------------
+# Per-year, per-location facts that every day of the year needs (Ugadi,
+# Shaka year, samvatsara, Amavasya and Sankranti instants). Kept in
+# SQLite so separate processes and pool workers share one copy: WAL mode
+# lets readers run alongside a writer, and writes are idempotent upserts.
+#
+# Rows carry a version string made of META_VERSION, the lunation index
+# version and the swisseph settings fingerprint. Readers only see rows of
+# their own version, so changing the ayanamsa or ephemeris (or bumping a
+# version after a logic change) invalidates old rows without touching
+# the rows of another process running with other settings.
+
+META_VERSION = 1
+
+DB_PATH = os.path.join(CACHE_DIR, "year_meta.sqlite")
+
+
+def current_version():
+    return f"{META_VERSION}|{INDEX_VERSION}|{settings_fingerprint()}"
+
+
+class YearMetaStore:
+    """
+    location: (lat, lon, alt, tz name), everything sunrise depends on
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.version = current_version()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS year_meta ("
+            " version TEXT NOT NULL,"
+            " year INTEGER NOT NULL,"
+            " lat REAL NOT NULL,"
+            " lon REAL NOT NULL,"
+            " alt REAL NOT NULL,"
+            " tz TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " PRIMARY KEY (version, year, lat, lon, alt, tz))"
+        )
+
+    def _execute(self, sql, params=()):
+        """
+        One short-lived connection per statement: safe to call from
+        forked workers, and the transaction commits on exit
+        """
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                return db.execute(sql, params).fetchall()
+        finally:
+            db.close()
+
+    def get(self, year, location):
+        rows = self._execute(
+            "SELECT payload FROM year_meta WHERE version = ? AND year = ?"
+            " AND lat = ? AND lon = ? AND alt = ? AND tz = ?",
+            (self.version, year, *location),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def put(self, year, location, meta):
+        self._execute(
+            "INSERT OR REPLACE INTO year_meta VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.version, year, *location, json.dumps(meta)),
+        )
+
+    def get_or_compute(self, year, location, compute):
+        """
+        compute(year) -> JSON-serialisable dict, called only on a miss.
+        Two processes missing at once both compute the same value and
+        the second upsert is a no-op in effect.
+        """
+        meta = self.get(year, location)
+        if meta is None:
+            meta = compute(year)
+            self.put(year, location, meta)
+        return meta
+
+    def prune(self, keep=None):
+        """
+        Deletes rows of every version except `keep` (default: ours).
+        Explicit only: other processes may still be using other versions.
+        """
+        self._execute(
+            "DELETE FROM year_meta WHERE version != ?", (keep or self.version,))